@@ -0,0 +1,233 @@
+"""Throughput benchmark and regression gate for vacancy extraction.
+
+Run from the backend directory::
+
+    python -m devtools.extraction_benchmark                   # compare with baselines
+    python -m devtools.extraction_benchmark --update-baseline # record new baselines
+
+The corpus is generated from a fixed seed: Civil Service style adverts at three
+sizes with person specifications, behaviours, process copy and eligibility
+rules. For ``deterministic_extract``, ``_reconcile_items`` and
+``is_non_requirement_text`` it reports lines per second, p50/p99 call latency
+and peak traced allocation.
+
+Raw speed depends on the machine, so throughput is divided by a fixed
+pure-Python calibration workload before comparison. The command exits non-zero
+when a benchmark's calibrated throughput falls more than ``--threshold`` below
+its stored baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from lib.vacancy_extraction import deterministic_extract, is_non_requirement_text  # noqa: E402
+from routes.vacancy_intelligence import _reconcile_items  # noqa: E402
+
+BASELINE_PATH = Path(__file__).with_name("extraction_baselines.json")
+SIZES = {"small": 4_000, "medium": 12_000, "large": 29_000}
+DEFAULT_THRESHOLD = 0.25
+
+_VERBS = ["lead", "manage", "deliver", "coordinate", "analyse", "review", "develop", "support", "improve", "assure"]
+_OBJECTS = [
+    "operational performance", "stakeholder relationships", "policy advice", "budget forecasts", "casework quality",
+    "digital services", "risk registers", "procurement exercises", "data reporting", "change programmes",
+]
+_CONTEXTS = [
+    "across government", "with senior leaders", "in a fast-paced environment", "under tight deadlines",
+    "with external partners", "within a regional team", "using evidence and data", "to agreed standards",
+]
+_PROCESS = [
+    "Apply before 11:55 pm on Sunday 12 May 2026.",
+    "Your CV should set out your career history, with key responsibilities and achievements.",
+    "The personal statement should be no longer than 750 words.",
+    "Sift – from 20 May 2026.",
+    "Interview – from 10 June 2026.",
+    "Reserve lists will be held for 12 months.",
+    "For guidance on how to apply please see the candidate pack.",
+    "Please note travel expenses incurred by attending an interview will not be reimbursed.",
+]
+_ELIGIBILITY = [
+    "You must have the right to work in the UK.",
+    "Successful candidates must pass a disclosure and barring security check.",
+    "This role requires UK security vetting at SC level.",
+    "Open to UK nationals and nationals of the Republic of Ireland; nationality requirement applies.",
+]
+_PRACTICAL = [
+    "Hybrid working is available with a minimum of 60% working time in an office.",
+    "Travel is required across the region up to twice a month.",
+    "This role is only available on a full-time basis of 37 hours per week.",
+]
+
+
+def _sentence(rng: random.Random) -> str:
+    return f"{rng.choice(_VERBS).capitalize()} {rng.choice(_OBJECTS)} {rng.choice(_CONTEXTS)}."
+
+
+def generate_advert(rng: random.Random, target_chars: int) -> str:
+    """Build one advert of roughly ``target_chars`` characters."""
+    blocks: list[str] = []
+    while sum(len(block) for block in blocks) < target_chars:
+        blocks.append("Job summary\n" + " ".join(_sentence(rng) for _ in range(rng.randint(3, 8))))
+        blocks.append("Responsibilities\n" + "\n".join(f"- {_sentence(rng)}" for _ in range(rng.randint(4, 10))))
+        blocks.append("Essential criteria:\n" + "\n".join(f"- {_sentence(rng)}" for _ in range(rng.randint(3, 8))))
+        blocks.append("Desirable criteria:\n" + "\n".join(f"- {_sentence(rng)}" for _ in range(rng.randint(1, 4))))
+        blocks.append("Behaviours\nWe'll assess you against these behaviours during the selection process:\n- Seeing the Big Picture\n- Delivering at Pace")
+        blocks.append("Working pattern\n" + rng.choice(_PRACTICAL))
+        blocks.append("Things you need to know\n" + "\n".join(rng.sample(_ELIGIBILITY, 2)))
+        blocks.append("Selection process details\n" + "\n".join(rng.sample(_PROCESS, 4)))
+    return "\n\n".join(blocks)[:target_chars]
+
+
+def generate_corpus(seed: int = 40, adverts_per_size: int = 6) -> dict[str, list[str]]:
+    rng = random.Random(seed)
+    return {size: [generate_advert(rng, chars) for _ in range(adverts_per_size)] for size, chars in SIZES.items()}
+
+
+def _semantic_variant(items: list[dict[str, Any]], rng: random.Random) -> list[dict[str, Any]]:
+    """Imitate a model result: mostly the same criteria, some reworded or recategorised."""
+    variant = []
+    for item in items:
+        roll = rng.random()
+        if roll < 0.2:
+            continue
+        copied = dict(item)
+        if roll < 0.35:
+            copied["text"] = copied["text"].rstrip(".") + " where required"
+        elif roll < 0.45:
+            copied["category"] = "desirable" if copied["category"] == "essential" else "essential"
+        variant.append(copied)
+    return variant
+
+
+def calibrate(rounds: int = 5) -> float:
+    """Operations per second of a fixed string/dict workload on this machine."""
+    def workload() -> None:
+        counts: dict[str, int] = {}
+        for number in range(20_000):
+            key = f"token-{number % 97}".lower()
+            counts[key] = counts.get(key, 0) + len(key.split("-"))
+
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        workload()
+        timings.append(time.perf_counter() - started)
+    return 20_000 / min(timings)
+
+
+def _measure(calls: list[Callable[[], Any]], lines: int, repeats: int) -> dict[str, float]:
+    timings: list[float] = []
+    for _ in range(repeats):
+        for call in calls:
+            started = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    for call in calls:
+        call()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ordered = sorted(timings)
+    return {
+        "lines_per_sec": lines * repeats / sum(timings),
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000,
+        "peak_alloc_kib": peak / 1024,
+    }
+
+
+def run_benchmarks(corpus: dict[str, list[str]], repeats: int = 5) -> dict[str, dict[str, float]]:
+    rng = random.Random(41)
+    results: dict[str, dict[str, float]] = {}
+    for size, adverts in corpus.items():
+        lines = sum(len(advert.splitlines()) for advert in adverts)
+        results[f"deterministic_extract/{size}"] = _measure(
+            [lambda advert=advert: deterministic_extract(advert) for advert in adverts], lines, repeats
+        )
+
+        pairs = []
+        for advert in adverts:
+            deterministic_items = deterministic_extract(advert)
+            pairs.append((_semantic_variant(deterministic_items, rng), deterministic_items))
+        item_count = sum(len(semantic) + len(deterministic) for semantic, deterministic in pairs)
+        results[f"reconcile_items/{size}"] = _measure(
+            [lambda pair=pair: _reconcile_items(*pair) for pair in pairs], item_count, repeats
+        )
+
+        all_lines = [line for advert in adverts for line in advert.splitlines()]
+        results[f"is_non_requirement_text/{size}"] = _measure(
+            [lambda: [is_non_requirement_text(line) for line in all_lines]], len(all_lines), repeats
+        )
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    calibration: float,
+    baseline: dict[str, Any],
+    threshold: float,
+) -> list[str]:
+    """Return a message for each benchmark whose calibrated throughput regressed."""
+    regressions = []
+    reference = baseline.get("calibration_ops_per_sec") or calibration
+    for name, stored in baseline.get("results", {}).items():
+        current = results.get(name)
+        if current is None:
+            continue
+        expected = stored["lines_per_sec"] / reference
+        actual = current["lines_per_sec"] / calibration
+        if actual < expected * (1 - threshold):
+            regressions.append(f"{name}: {actual / expected:.0%} of baseline throughput")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark vacancy extraction throughput.")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results to the baseline file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed throughput drop (0.25 = 25%%)")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--adverts", type=int, default=6, help="Adverts per size")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    args = parser.parse_args(argv)
+
+    calibration = calibrate()
+    results = run_benchmarks(generate_corpus(adverts_per_size=args.adverts), repeats=args.repeats)
+    for name, metrics in results.items():
+        print(
+            f"{name:36} {metrics['lines_per_sec']:>12,.0f} lines/s  p50 {metrics['p50_ms']:7.3f} ms  "
+            f"p99 {metrics['p99_ms']:7.3f} ms  peak {metrics['peak_alloc_kib']:8.1f} KiB"
+        )
+
+    if args.update_baseline:
+        payload = {"calibration_ops_per_sec": calibration, "results": results}
+        args.baseline.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+        print(f"Baselines written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("No baseline file; run with --update-baseline first.", file=sys.stderr)
+        return 1
+    regressions = compare(results, calibration, json.loads(args.baseline.read_text()), args.threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+"""Local OpenAI-compatible stand-in for offline load, latency and failure testing.
+
+Run from the backend directory and point the app at it::
+
+    uvicorn devtools.openai_standin:app --port 8010
+    OPENAI_API_KEY=standin OPENAI_BASE_URL=http://localhost:8010/v1 uvicorn main:app
+
+It serves the two endpoints the semantic paths use (``/v1/chat/completions`` and
+``/v1/responses``) and answers with canned JSON built from the request payload,
+so every item, match and paragraph it returns passes the app's own grounding
+validation. Behaviour is controlled with environment variables or, while it is
+running, ``POST /_standin/config``:
+
+``STANDIN_LATENCY``
+    ``fixed:MS``, ``uniform:MIN_MS,MAX_MS`` or ``lognormal:MEDIAN_MS,SIGMA``.
+``STANDIN_ERROR_RATE`` / ``STANDIN_ERROR_STATUS``
+    Fraction of requests answered with an API error, and its HTTP status.
+``STANDIN_HANG_RATE`` / ``STANDIN_HANG_SECONDS``
+    Fraction of requests that stall long enough to trip client timeouts.
+``STANDIN_SEED``
+    Seed for reproducible latency and error sequences.
+
+Requests to ``/v1/responses`` with ``"stream": true`` are answered as server-sent
+events, with the simulated latency spread across the output deltas.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from lib.prompt_budget import estimate_tokens  # noqa: E402
+from lib.vacancy_extraction import deterministic_extract  # noqa: E402
+
+_DRAFT_FIELDS = ("task", "actions", "authority_context", "outcome")
+_STREAM_CHUNK_CHARS = 48
+
+
+@dataclass
+class StandinConfig:
+    latency: str = "fixed:0"
+    error_rate: float = 0.0
+    error_status: int = 500
+    hang_rate: float = 0.0
+    hang_seconds: float = 120.0
+    seed: int | None = None
+    rng: random.Random = field(default_factory=random.Random, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.rng.seed(self.seed)
+
+    @classmethod
+    def from_env(cls) -> StandinConfig:
+        seed = os.getenv("STANDIN_SEED")
+        return cls(
+            latency=os.getenv("STANDIN_LATENCY", "fixed:0"),
+            error_rate=float(os.getenv("STANDIN_ERROR_RATE", "0")),
+            error_status=int(os.getenv("STANDIN_ERROR_STATUS", "500")),
+            hang_rate=float(os.getenv("STANDIN_HANG_RATE", "0")),
+            hang_seconds=float(os.getenv("STANDIN_HANG_SECONDS", "120")),
+            seed=int(seed) if seed else None,
+        )
+
+    def sample_latency(self) -> float:
+        """Return the next simulated model latency in seconds."""
+        kind, _, raw = self.latency.partition(":")
+        values = [float(value) for value in raw.split(",") if value.strip()] or [0.0]
+        if kind == "uniform":
+            low, high = (values + values)[:2]
+            milliseconds = self.rng.uniform(low, high)
+        elif kind == "lognormal":
+            median, sigma = (values + [0.5])[:2]
+            milliseconds = self.rng.lognormvariate(0, sigma) * median
+        else:
+            milliseconds = values[0]
+        return max(0.0, milliseconds) / 1000
+
+    def public(self) -> dict[str, Any]:
+        values = asdict(self)
+        values.pop("rng", None)
+        return values
+
+
+def _sentence(value: str) -> str:
+    text = " ".join(value.split()).strip()
+    if text and text[-1] not in ".!?":
+        text += "."
+    return text
+
+
+def _vacancy_items(vacancy_text: str) -> dict[str, Any]:
+    return {"items": deterministic_extract(vacancy_text)}
+
+
+def _card_matches(cards: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    matches: list[dict[str, Any]] = []
+    for card in cards:
+        facts = [
+            {"field": name, "text": value}
+            for name in ("actions", "task", "outcome")
+            for value in (card.get(name) if isinstance(card.get(name), list) else [card.get(name)])
+            if isinstance(value, str) and value.strip()
+        ][:2]
+        matches.append(
+            {
+                "evidence_id": str(card.get("id", "")),
+                "strength": "partial" if facts else "weak",
+                "score": 62 if facts else 30,
+                "confidence": 0.7,
+                "why": "Stand-in assessment copied from recorded card fields.",
+                "gaps": [] if facts else ["No personal actions recorded."],
+                "supporting_facts": facts,
+            }
+        )
+    return matches
+
+
+def _evidence_assessment(payload: dict[str, Any]) -> dict[str, Any]:
+    if isinstance(payload.get("requirements"), list):
+        return {
+            "assessments": [
+                {"requirement_id": entry.get("requirement_id"), "matches": _card_matches(entry.get("evidence_cards", []))}
+                for entry in payload["requirements"]
+                if isinstance(entry, dict)
+            ]
+        }
+    return {"matches": _card_matches(payload.get("evidence_cards", []))}
+
+
+def _draft_paragraphs(payload: dict[str, Any]) -> dict[str, Any]:
+    """Compose one paragraph per cited card, mirroring the deterministic drafter."""
+    facts_by_card = {
+        str(card.get("id")): [fact for fact in card.get("facts", []) if fact.get("field") in _DRAFT_FIELDS]
+        for card in payload.get("evidence_cards", [])
+    }
+    grouped: dict[str, list[int]] = {}
+    for requirement in payload.get("requirements", []):
+        if not requirement.get("may_draft"):
+            continue
+        evidence_id = next((value for value in requirement.get("evidence_ids", []) if facts_by_card.get(value)), None)
+        if evidence_id:
+            grouped.setdefault(evidence_id, []).append(int(requirement.get("index", 0)))
+
+    budget = int(payload.get("word_limit", 500) or 500)
+    per_paragraph = max(30, budget // max(1, len(grouped)))
+    paragraphs: list[dict[str, Any]] = []
+    for evidence_id, indices in grouped.items():
+        sentences: list[str] = []
+        fact_ids: list[str] = []
+        used = 0
+        for fact in facts_by_card[evidence_id]:
+            sentence = _sentence(str(fact.get("text", "")))
+            words = len(sentence.split())
+            if sentences and used + words > per_paragraph:
+                continue
+            sentences.append(sentence)
+            fact_ids.append(str(fact.get("fact_id")))
+            used += words
+        paragraphs.append(
+            {
+                "text": " ".join(sentences),
+                "requirement_indices": indices,
+                "evidence_ids": [evidence_id],
+                "supporting_fact_ids": fact_ids,
+            }
+        )
+    return {"paragraphs": paragraphs}
+
+
+def _json_or_none(value: Any) -> dict[str, Any] | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = json.loads(value)
+    except json.JSONDecodeError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+def _usage(prompt: Any, completion: str, *, responses_api: bool) -> dict[str, int]:
+    prompt_tokens = estimate_tokens(prompt)
+    completion_tokens = estimate_tokens(completion)
+    if responses_api:
+        return {
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def chat_completion_body(body: dict[str, Any]) -> dict[str, Any]:
+    """Build a chat.completions response for vacancy extraction or evidence assessment."""
+    messages = body.get("messages") or []
+    user_content = next(
+        (str(message.get("content", "")) for message in reversed(messages) if message.get("role") == "user"),
+        "",
+    )
+    structured = _json_or_none(user_content)
+    if structured is not None and "evidence_cards" in json.dumps(structured):
+        content = json.dumps(_evidence_assessment(structured), ensure_ascii=False)
+    else:
+        content = json.dumps(_vacancy_items(user_content), ensure_ascii=False)
+    return {
+        "id": f"chatcmpl-standin-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": str(body.get("model", "standin")),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": _usage(messages, content, responses_api=False),
+    }
+
+
+def _response_content(body: dict[str, Any]) -> str:
+    payload = _json_or_none(body.get("input")) or {}
+    return json.dumps(_draft_paragraphs(payload), ensure_ascii=False)
+
+
+def response_body(body: dict[str, Any], content: str | None = None) -> dict[str, Any]:
+    """Build a completed Responses API result for grounded application drafting."""
+    if content is None:
+        content = _response_content(body)
+    return {
+        "id": f"resp_standin_{uuid.uuid4().hex[:12]}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "status": "completed",
+        "model": str(body.get("model", "standin")),
+        "output": [
+            {
+                "type": "message",
+                "id": f"msg_standin_{uuid.uuid4().hex[:12]}",
+                "status": "completed",
+                "role": "assistant",
+                "content": [{"type": "output_text", "text": content, "annotations": []}],
+            }
+        ],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": _usage(body.get("input", ""), content, responses_api=True),
+    }
+
+
+def response_stream_events(body: dict[str, Any]) -> list[dict[str, Any]]:
+    """Build the Responses API event sequence for a streamed drafting request."""
+    content = _response_content(body)
+    completed = response_body(body, content)
+    message_id = completed["output"][0]["id"]
+    created = {**completed, "status": "in_progress", "output": [], "usage": None}
+    events: list[dict[str, Any]] = [{"type": "response.created", "response": created}]
+    for start in range(0, len(content), _STREAM_CHUNK_CHARS):
+        events.append(
+            {
+                "type": "response.output_text.delta",
+                "item_id": message_id,
+                "output_index": 0,
+                "content_index": 0,
+                "delta": content[start : start + _STREAM_CHUNK_CHARS],
+                "logprobs": [],
+            }
+        )
+    events.append({"type": "response.completed", "response": completed})
+    for sequence_number, event in enumerate(events):
+        event["sequence_number"] = sequence_number
+    return events
+
+
+def create_app(config: StandinConfig | None = None) -> FastAPI:
+    standin = FastAPI(title="OpenAI stand-in")
+    standin.state.config = config or StandinConfig.from_env()
+    standin.state.requests = 0
+
+    async def _simulate(delay: bool = True) -> JSONResponse | None:
+        current: StandinConfig = standin.state.config
+        standin.state.requests += 1
+        if current.hang_rate and current.rng.random() < current.hang_rate:
+            await asyncio.sleep(current.hang_seconds)
+        if delay:
+            await asyncio.sleep(current.sample_latency())
+        if current.error_rate and current.rng.random() < current.error_rate:
+            return JSONResponse(
+                status_code=current.error_status,
+                content={"error": {"message": "Injected stand-in failure", "type": "standin_error", "code": None}},
+            )
+        return None
+
+    @standin.post("/v1/chat/completions")
+    async def chat_completions(request: Request) -> Any:
+        failure = await _simulate()
+        return failure or chat_completion_body(await request.json())
+
+    @standin.post("/v1/responses")
+    async def responses(request: Request) -> Any:
+        body = await request.json()
+        if not body.get("stream"):
+            failure = await _simulate()
+            return failure or response_body(body)
+
+        failure = await _simulate(delay=False)
+        if failure:
+            return failure
+        events = response_stream_events(body)
+        pause = standin.state.config.sample_latency() / len(events)
+
+        async def emit() -> Any:
+            for event in events:
+                await asyncio.sleep(pause)
+                yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+        return StreamingResponse(emit(), media_type="text/event-stream")
+
+    @standin.get("/_standin/config")
+    def read_config() -> dict[str, Any]:
+        return {**standin.state.config.public(), "requests": standin.state.requests}
+
+    @standin.post("/_standin/config")
+    def update_config(values: dict[str, Any]) -> dict[str, Any]:
+        current = standin.state.config.public()
+        merged = {**current, **{key: value for key, value in values.items() if key in current}}
+        standin.state.config = StandinConfig(**merged)
+        standin.state.requests = 0
+        return standin.state.config.public()
+
+    return standin
+
+
+app = create_app()
@@ -2,10 +2,18 @@
 
 from __future__ import annotations
 
+import re
 from typing import Any
 
 from lib.application_grounding import field_values
 
+DETERMINISTIC_PROVIDER = "deterministic-grounded-v2"
+
+_META_VERBS = r"demonstrates|shows|illustrates|supports|underpins|evidences|addresses|highlights"
+_META_COMMENTARY_RE = re.compile(
+    rf"(?i)\(?\s*(?:this paragraph|this evidence|this example|the above)\s+(?:{_META_VERBS})\b[^.!?)]*(?:[.!?]\s*\)?|\))?"
+)
+
 
 def supported_requirement(requirement: Any) -> bool:
     return (
@@ -14,14 +22,9 @@ def supported_requirement(requirement: Any) -> bool:
     )
 
 
-def _supporting_facts(card: Any, evidence_id: str) -> list[dict[str, str]]:
-    facts: list[dict[str, str]] = []
-    for field in ("task", "actions", "authority_context", "outcome", "reflection"):
-        for value in field_values(card, field):
-            facts.append({"evidence_id": evidence_id, "field": field, "text": value})
-            if len(facts) >= 8:
-                return facts
-    return facts
+# Relative value of a word drawn from each field when packing sentences: what the
+# candidate did and the authority they held count most, reflection least.
+_FIELD_VALUES = {"task": 5, "actions": 6, "authority_context": 6, "outcome": 5, "reflection": 3}
 
 
 def _clean_sentence(value: str) -> str:
@@ -31,53 +34,132 @@ def _clean_sentence(value: str) -> str:
     return text
 
 
-def _sentence_candidates(card: Any) -> list[str]:
-    candidates: list[str] = []
-    task = field_values(card, "task")
-    if task:
-        candidates.append(task[0])
-    candidates.extend(field_values(card, "actions")[:3])
-    authority = field_values(card, "authority_context")
-    if authority:
-        candidates.append(authority[0])
-    outcome = field_values(card, "outcome")
-    if outcome:
-        candidates.append(outcome[0])
-    reflection = field_values(card, "reflection")
-    if reflection:
-        candidates.append(reflection[0])
-    return [_clean_sentence(value) for value in candidates if value.strip()]
-
-
-def _fit_sentences(candidates: list[str], word_budget: int) -> str:
-    selected: list[str] = []
+def _sentence_candidates(card: Any) -> list[tuple[str, str, str]]:
+    """Return ``(field, fact text, sentence)`` in paragraph order, one per distinct sentence."""
+    sources: list[tuple[str, str]] = []
+    for field in ("task", "actions", "authority_context", "outcome", "reflection"):
+        values = field_values(card, field)
+        sources.extend((field, value) for value in (values if field == "actions" else values[:1]))
+    candidates: list[tuple[str, str, str]] = []
     seen: set[str] = set()
-    used = 0
-    for sentence in candidates:
-        key = sentence.lower().strip()
-        if not key or key in seen:
+    for field, value in sources:
+        sentence = _clean_sentence(value)
+        key = sentence.lower()
+        if sentence and key not in seen:
+            seen.add(key)
+            candidates.append((field, value, sentence))
+    return candidates
+
+
+_KNAPSACK_SLOTS = 128
+
+
+def _knapsack(items: list[tuple[int, int]], capacity: int) -> int:
+    """Return a bitmask of ``(words, value)`` items with the highest total value within ``capacity`` words.
+
+    A standard 0/1 knapsack over word counts. Above ``_KNAPSACK_SLOTS`` words the
+    counts are bucketed, rounding each item up so the packing can never
+    overrun; words lost to rounding are then refilled greedily by value.
+    """
+    if sum(words for words, _value in items) <= capacity:
+        return (1 << len(items)) - 1
+    scale = -(-capacity // _KNAPSACK_SLOTS)
+    slots = capacity // scale
+    best = [0] + [-1] * slots
+    masks = [0] * (slots + 1)
+    for position, (words, value) in enumerate(items):
+        size = -(-words // scale)
+        if size > slots:
             continue
-        seen.add(key)
-        words = len(sentence.split())
-        if selected and used + words > word_budget:
+        bit = 1 << position
+        for slot in range(slots, size - 1, -1):
+            base = best[slot - size]
+            if base >= 0 and base + value > best[slot]:
+                best[slot] = base + value
+                masks[slot] = masks[slot - size] | bit
+    mask = masks[max(range(slots + 1), key=best.__getitem__)]
+
+    used = sum(words for position, (words, _value) in enumerate(items) if mask >> position & 1)
+    for position in sorted(range(len(items)), key=lambda position: -items[position][1]):
+        words = items[position][0]
+        if not mask >> position & 1 and used + words <= capacity:
+            mask |= 1 << position
+            used += words
+    return mask
+
+
+def _pack_groups(
+    candidates_by_group: list[list[tuple[str, str, str]]],
+    weights: list[int],
+    word_limit: int,
+) -> list[list[tuple[str, str, str]]]:
+    """Choose sentences for every group at once so the draft makes best use of ``word_limit``.
+
+    Each group's first sentence is taken while it fits (the very first is cut
+    down if it alone exceeds the limit); the rest are packed as a 0/1 knapsack
+    where a sentence is worth its words times its field value times the
+    group's criteria weight. Returns each group's chosen candidates in card order.
+    """
+    remaining = max(1, int(word_limit))
+    chosen: list[list[int]] = [[] for _ in candidates_by_group]
+    truncated: dict[int, str] = {}
+    for group, candidates in enumerate(candidates_by_group):
+        if not candidates:
             continue
-        if not selected and words > word_budget:
-            selected.append(" ".join(sentence.split()[:word_budget]).rstrip(".,;:") + ".")
-            break
-        selected.append(sentence)
-        used += words
-        if used >= word_budget:
-            break
-    return " ".join(selected).strip()
+        words = len(candidates[0][2].split())
+        if words <= remaining:
+            chosen[group].append(0)
+            remaining -= words
+        elif not any(chosen):
+            truncated[group] = " ".join(candidates[0][2].split()[:remaining]).rstrip(".,;:") + "."
+            chosen[group].append(0)
+            remaining = 0
 
+    items: list[tuple[int, int]] = []
+    owners: list[tuple[int, int]] = []
+    for group, candidates in enumerate(candidates_by_group):
+        if not chosen[group] or group in truncated:
+            continue
+        for position, (field, _text, sentence) in enumerate(candidates[1:], start=1):
+            words = len(sentence.split())
+            items.append((words, words * _FIELD_VALUES[field] * weights[group]))
+            owners.append((group, position))
+    mask = _knapsack(items, remaining) if remaining and items else 0
+    for item, (group, position) in enumerate(owners):
+        if mask >> item & 1:
+            chosen[group].append(position)
 
-def deterministic_draft(
-    requirements: list[Any],
-    cards_by_id: dict[str, Any],
-    role_title: str,
-    word_limit: int = 500,
-) -> list[dict[str, Any]]:
-    """Compose one grounded paragraph per Evidence Card, not per criterion."""
+    packed: list[list[tuple[str, str, str]]] = []
+    for group, candidates in enumerate(candidates_by_group):
+        selected: list[tuple[str, str, str]] = []
+        for position in sorted(chosen[group]):
+            field, text, sentence = candidates[position]
+            selected.append((field, text, truncated.get(group, sentence) if position == 0 else sentence))
+        packed.append(selected)
+    return packed
+
+
+def _paragraph(evidence_id: str, indices: list[int], selected: list[tuple[str, str, str]]) -> dict[str, Any] | None:
+    if not selected:
+        return None
+    return {
+        "text": " ".join(sentence for _field, _text, sentence in selected),
+        "requirement_indices": indices,
+        "evidence_ids": [evidence_id],
+        "supporting_facts": [{"evidence_id": evidence_id, "field": field, "text": text} for field, text, _sentence in selected],
+        "grounding_status": "grounded",
+    }
+
+
+def _is_essential(requirement: Any) -> bool:
+    return str(getattr(requirement, "category", "essential")) == "essential"
+
+
+def requirement_groups(requirements: list[Any], cards_by_id: dict[str, Any]) -> list[tuple[str, list[int]]]:
+    """Group supported requirements by their first available Evidence Card, highest priority first.
+
+    Groups with more essential criteria come first, then groups answering more criteria.
+    """
     grouped: dict[str, list[int]] = {}
     for index, requirement in enumerate(requirements):
         if not supported_requirement(requirement):
@@ -87,43 +169,67 @@ def deterministic_draft(
         if evidence_id:
             grouped.setdefault(evidence_id, []).append(index)
 
-    if not grouped:
-        return []
-
     def priority(item: tuple[str, list[int]]) -> tuple[int, int]:
         _, indices = item
-        essential = sum(
-            1 for index in indices
-            if str(getattr(requirements[index], "category", "essential")) == "essential"
-        )
-        return (essential, len(indices))
+        return (sum(1 for index in indices if _is_essential(requirements[index])), len(indices))
 
-    ordered = sorted(grouped.items(), key=priority, reverse=True)
-    paragraphs: list[dict[str, Any]] = []
-    remaining = max(1, int(word_limit))
+    return sorted(grouped.items(), key=priority, reverse=True)
 
-    for position, (evidence_id, indices) in enumerate(ordered):
-        card = cards_by_id[evidence_id]
-        groups_left = max(1, len(ordered) - position)
-        paragraph_budget = max(35, remaining // groups_left)
-        text = _fit_sentences(_sentence_candidates(card), paragraph_budget)
-        if not text:
-            continue
-        text_words = len(text.split())
-        if text_words > remaining and paragraphs:
-            continue
 
-        paragraphs.append({
-            "text": text,
-            "requirement_indices": indices,
-            "evidence_ids": [evidence_id],
-            "supporting_facts": _supporting_facts(card, evidence_id),
-            "grounding_status": "grounded",
-        })
-        remaining -= min(remaining, text_words)
-        if remaining <= 0:
-            break
+def _group_weights(requirements: list[Any], groups: list[tuple[str, list[int]]]) -> list[int]:
+    """Criteria weight of each group: two per essential criterion, one per other."""
+    return [sum(2 if _is_essential(requirements[index]) else 1 for index in indices) for _, indices in groups]
+
+
+def allocate_word_budgets(requirements: list[Any], groups: list[tuple[str, list[int]]], word_limit: int) -> list[int]:
+    """Split ``word_limit`` across groups in proportion to their criteria, essentials counting double.
+
+    Largest remainders receive the leftover words, so budgets always sum to the limit.
+    """
+    if not groups:
+        return []
+    weights = _group_weights(requirements, groups)
+    total = sum(weights)
+    shares = [word_limit * weight / total for weight in weights]
+    budgets = [int(share) for share in shares]
+    by_remainder = sorted(range(len(groups)), key=lambda position: (budgets[position] - shares[position], position))
+    for position in by_remainder[: word_limit - sum(budgets)]:
+        budgets[position] += 1
+    return budgets
+
 
+def group_paragraph(card: Any, evidence_id: str, indices: list[int], word_budget: int) -> dict[str, Any] | None:
+    """The deterministic paragraph for one evidence group, or None when the card has no usable sentences."""
+    selected = _pack_groups([_sentence_candidates(card)], [1], word_budget)[0]
+    return _paragraph(evidence_id, indices, selected)
+
+
+def deterministic_draft(
+    requirements: list[Any],
+    cards_by_id: dict[str, Any],
+    role_title: str,
+    word_limit: int = 500,
+) -> list[dict[str, Any]]:
+    """Compose one grounded paragraph per Evidence Card, not per criterion.
+
+    Sentences are packed across all paragraphs together, so the draft fills
+    the word limit with the most valuable grounded sentences rather than an
+    even split per card.
+    """
+    ordered = requirement_groups(requirements, cards_by_id)
+    if not ordered:
+        return []
+
+    packed = _pack_groups(
+        [_sentence_candidates(cards_by_id[evidence_id]) for evidence_id, _ in ordered],
+        _group_weights(requirements, ordered),
+        word_limit,
+    )
+    paragraphs: list[dict[str, Any]] = []
+    for (evidence_id, indices), selected in zip(ordered, packed):
+        paragraph = _paragraph(evidence_id, indices, selected)
+        if paragraph is not None:
+            paragraphs.append(paragraph)
     return paragraphs
 
 
@@ -154,3 +260,53 @@ def coverage(requirements: list[Any], paragraphs: list[dict[str, Any]]) -> list[
 
 def word_count(paragraphs: list[dict[str, Any]]) -> int:
     return sum(len(str(paragraph.get("text", "")).split()) for paragraph in paragraphs)
+
+
+def clean_meta_commentary(text: str) -> str:
+    """Remove assessor-facing narration while preserving the candidate's evidence prose."""
+    cleaned = _META_COMMENTARY_RE.sub("", text)
+    cleaned = re.sub(r"\s+([,.;:!?])", r"\1", cleaned)
+    cleaned = re.sub(r"[ \t]{2,}", " ", cleaned)
+    return cleaned.strip(" \t\n;,-")
+
+
+def normalise_paragraphs(paragraphs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    normalised: list[dict[str, Any]] = []
+    for paragraph in paragraphs:
+        item = dict(paragraph)
+        text = clean_meta_commentary(str(item.get("text", "")))
+        if not text:
+            continue
+        item["text"] = text
+        normalised.append(item)
+    return normalised
+
+
+def compose_draft(paragraphs: list[dict[str, Any]]) -> str:
+    """Compose only evidence-bearing prose; avoid generic opening/closing filler."""
+    return "\n\n".join(paragraph["text"].strip() for paragraph in paragraphs if paragraph.get("text", "").strip())
+
+
+def draft_warnings(
+    requirement_coverage: list[dict[str, Any]],
+    paragraphs: list[dict[str, Any]],
+    word_limit: int,
+    total_words: int,
+) -> list[str]:
+    """Reviewer-facing warnings about evidence gaps and word use for a finished draft."""
+    warnings: list[str] = []
+    for item in requirement_coverage:
+        if item["category"] == "essential" and item["status"] == "evidence-gap":
+            warnings.append(f"Essential requirement not drafted because supporting evidence is insufficient: {item['requirement']}")
+        elif item["category"] == "essential" and item["status"] == "partially-covered":
+            warnings.append(f"Partial evidence is being used for this essential requirement and should be reviewed carefully: {item['requirement']}")
+    if total_words > word_limit:
+        warnings.append(f"Draft is {total_words} words, above the requested {word_limit}-word limit. Edit before submitting.")
+    elif paragraphs and word_limit >= 300 and total_words < int(word_limit * 0.65):
+        warnings.append(
+            f"Draft uses only {total_words} of {word_limit} available words. "
+            "If more verified evidence is available, strengthen the Evidence Bank rather than padding the statement with unsupported detail."
+        )
+    if not paragraphs:
+        warnings.append("No Strong or Partial matched evidence is available to build a supported draft.")
+    return warnings
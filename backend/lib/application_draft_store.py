@@ -0,0 +1,74 @@
+"""Per-user store of generated application drafts, so a redraft can reuse unaffected paragraphs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from typing import Any
+
+from lib.application_grounding import card_facts
+from lib.supabase import get_supabase_client
+
+logger = logging.getLogger(__name__)
+
+_TABLE = "application_drafts"
+
+
+def card_fingerprint(card: Any) -> str:
+    """Hash of everything a paragraph may cite from ``card``; any edit changes it."""
+    canonical = json.dumps(sorted(card_facts(card).items()), ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def load_draft(draft_id: str, owner: str) -> dict[str, Any] | None:
+    """Return the owner's stored ``{id, provider, snapshot, paragraphs}``, or None on a miss.
+
+    Storage problems are logged and treated as a miss; a redraft then simply
+    regenerates the whole statement.
+    """
+    try:
+        result = (
+            get_supabase_client()
+            .table(_TABLE)
+            .select("id, provider, snapshot, paragraphs")
+            .eq("id", draft_id)
+            .eq("user_id", owner)
+            .execute()
+        )
+    except Exception as exc:
+        logger.warning("Application draft lookup failed: %s", type(exc).__name__)
+        return None
+    rows = result.data or []
+    return rows[0] if rows else None
+
+
+def save_draft(
+    owner: str,
+    snapshot: dict[str, Any],
+    provider: str,
+    paragraphs: list[dict[str, Any]],
+    variants: list[dict[str, Any]] | None = None,
+) -> str | None:
+    """Persist a draft, any word-limit variants and the inputs it was built from.
+
+    Returns the draft id when the store reports one.
+    """
+    try:
+        result = (
+            get_supabase_client()
+            .table(_TABLE)
+            .insert({
+                "user_id": owner,
+                "provider": provider,
+                "snapshot": snapshot,
+                "paragraphs": paragraphs,
+                "variants": variants or [],
+            })
+            .execute()
+        )
+    except Exception as exc:
+        logger.warning("Application draft save failed: %s", type(exc).__name__)
+        return None
+    rows = result.data or []
+    return str(rows[0]["id"]) if rows and rows[0].get("id") else None
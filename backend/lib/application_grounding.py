@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import re
+import string
 from typing import Any
 
 _ALLOWED_FIELDS = {
@@ -42,10 +43,118 @@ def field_values(card: Any, field: str) -> list[str]:
 
 
 def card_facts(card: Any) -> dict[str, list[str]]:
-    return {field: field_values(card, field) for field in _ALLOWED_FIELDS if field_values(card, field)}
+    facts: dict[str, list[str]] = {}
+    for field in _ALLOWED_FIELDS:
+        values = field_values(card, field)
+        if values:
+            facts[field] = values
+    return facts
 
 
-def grounded_fact(card: Any, raw: Any) -> dict[str, str] | None:
+_NUMBER_RE = re.compile(r"(?<![A-Za-z])\d+(?:[.,]\d+)?%?")
+_MENTION_RE = re.compile(r"(?<![A-Za-z])(\d+(?:[.,]\d+)?%?)(?:\s*[-–]?\s*([A-Za-z]+))?")
+# A run of number characters directly followed by a unit word. Every number
+# ending that run is a mention of that unit, matching the per-number check
+# this replaces.
+_UNIT_AFTER_RE = re.compile(r"([\d.,%]+)\s*[-–]?\s*([A-Za-z]+)")
+_ASCII_LETTERS = frozenset(string.ascii_letters)
+
+
+def _numbers(value: str) -> set[str]:
+    return set(_NUMBER_RE.findall(value))
+
+
+def _mention_key(number: str, unit: str) -> tuple[str, str]:
+    return (number, "") if not unit or number.endswith("%") else (number, unit)
+
+
+def _numeric_mentions(value: str) -> tuple[tuple[str, str], ...]:
+    """Return number plus nearby unit, normalised enough to match 18-hour to 18 hours."""
+    return tuple(
+        _mention_key(match.group(1), (match.group(2) or "").lower().rstrip("s"))
+        for match in _MENTION_RE.finditer(value)
+    )
+
+
+def _numeric_keys(text: str) -> frozenset[tuple[str, str]]:
+    """Every (number, unit) mention ``text`` supports.
+
+    A bare number is keyed with an empty unit, which is also the key for
+    percentages and unit-less mentions.
+    """
+    numbers = _numbers(text)
+    keys = {(number, "") for number in numbers}
+    lowered = text.lower()
+    for match in _UNIT_AFTER_RE.finditer(lowered):
+        run, unit = match.group(1), match.group(2).rstrip("s")
+        run_start = match.start(1)
+        for offset in range(len(run)):
+            number = run[offset:]
+            if number not in numbers or number.endswith("%"):
+                continue
+            if offset == 0 and run_start and lowered[run_start - 1] in _ASCII_LETTERS:
+                continue
+            keys.add((number, unit))
+    return frozenset(keys)
+
+
+class CardGrounding:
+    """One Evidence Card's facts, pre-normalised for substring checks and keyed by numeric mention."""
+
+    __slots__ = ("facts", "_normalised", "_numeric")
+
+    def __init__(self, evidence_id: str, card: Any) -> None:
+        self.facts = card_facts(card)
+        # Normalised values never contain a newline, so joining on one keeps a
+        # single ``in`` check from matching across two values.
+        self._normalised = {
+            field: "\n".join(" ".join(value.lower().split()) for value in values)
+            for field, values in self.facts.items()
+        }
+        self._numeric: dict[tuple[str, str], list[dict[str, str]]] = {}
+        for field, values in self.facts.items():
+            for text in values:
+                fact = {"evidence_id": evidence_id, "field": field, "text": text[:700]}
+                for key in _numeric_keys(text):
+                    self._numeric.setdefault(key, []).append(fact)
+
+    def contains(self, field: str, text: str) -> bool:
+        wanted = " ".join(text.lower().split())
+        return bool(wanted) and wanted in self._normalised.get(field, "")
+
+    def numeric_facts(self, key: tuple[str, str]) -> list[dict[str, str]]:
+        return self._numeric.get(key, [])
+
+
+class GroundingIndex:
+    """Per-request grounding structures, built lazily once per cited Evidence Card.
+
+    Share one index across every paragraph validated in a request so each card
+    is normalised and scanned for numbers only once, however many paragraphs
+    cite it.
+    """
+
+    def __init__(self, cards_by_id: dict[str, Any]) -> None:
+        self._cards_by_id = cards_by_id
+        self._cards: dict[str, CardGrounding] = {}
+        self._fact_keys: dict[str, frozenset[tuple[str, str]]] = {}
+
+    def numeric_keys(self, text: str) -> frozenset[tuple[str, str]]:
+        """Numeric mentions supported by a cited fact's text, parsed once per request."""
+        keys = self._fact_keys.get(text)
+        if keys is None:
+            keys = self._fact_keys[text] = _numeric_keys(text)
+        return keys
+
+    def card(self, evidence_id: str) -> CardGrounding:
+        grounding = self._cards.get(evidence_id)
+        if grounding is None:
+            grounding = CardGrounding(evidence_id, self._cards_by_id[evidence_id])
+            self._cards[evidence_id] = grounding
+        return grounding
+
+
+def grounded_fact(card: Any, raw: Any, grounding: CardGrounding | None = None) -> dict[str, str] | None:
     if not isinstance(raw, dict):
         return None
     field = str(raw.get("field", "")).strip()
@@ -53,66 +162,35 @@ def grounded_fact(card: Any, raw: Any) -> dict[str, str] | None:
     if field not in _ALLOWED_FIELDS or not text:
         return None
 
-    wanted = " ".join(text.lower().split())
-    for source in field_values(card, field):
-        source_normalised = " ".join(source.lower().split())
-        if wanted and wanted in source_normalised:
-            return {"field": field, "text": text[:700]}
+    if grounding is None:
+        grounding = CardGrounding("", card)
+    if grounding.contains(field, text):
+        return {"field": field, "text": text[:700]}
     return None
 
 
-def _numbers(value: str) -> set[str]:
-    return set(re.findall(r"(?<![A-Za-z])\d+(?:[.,]\d+)?%?", value))
-
-
-def _numeric_mentions(value: str) -> list[tuple[str, str]]:
-    """Return number plus nearby unit, normalised enough to match 18-hour to 18 hours."""
-    mentions: list[tuple[str, str]] = []
-    for match in re.finditer(r"(?<![A-Za-z])(\d+(?:[.,]\d+)?%?)(?:\s*[-–]?\s*([A-Za-z]+))?", value):
-        number = match.group(1)
-        unit = (match.group(2) or "").lower().rstrip("s")
-        mentions.append((number, unit))
-    return mentions
-
-
-def _fact_supports_numeric_mention(text: str, number: str, unit: str) -> bool:
-    if number not in _numbers(text):
-        return False
-    if not unit or number.endswith("%"):
-        return True
-    lowered = text.lower()
-    pattern = re.compile(rf"(?<![A-Za-z]){re.escape(number)}\s*[-–]?\s*([A-Za-z]+)")
-    for match in pattern.finditer(lowered):
-        source_unit = match.group(1).lower().rstrip("s")
-        if source_unit == unit:
-            return True
-    return False
-
-
 def _repair_numeric_grounding(
     paragraph: str,
     facts: list[dict[str, str]],
     evidence_ids: list[str],
-    cards_by_id: dict[str, Any],
+    index: GroundingIndex,
 ) -> tuple[list[dict[str, str]], bool]:
     """Attach an omitted exact numeric fact from the same evidence card when unambiguous."""
     repaired = list(facts)
     seen = {(fact.get("evidence_id", ""), fact.get("field", ""), fact.get("text", "")) for fact in repaired}
+    supported: set[tuple[str, str]] = set()
+    for fact in repaired:
+        supported |= index.numeric_keys(fact["text"])
 
-    for number, unit in _numeric_mentions(paragraph):
-        if any(_fact_supports_numeric_mention(fact["text"], number, unit) for fact in repaired):
+    for key in dict.fromkeys(_numeric_mentions(paragraph)):
+        if key in supported:
             continue
 
         candidates: list[dict[str, str]] = []
         for evidence_id in evidence_ids:
-            card = cards_by_id[evidence_id]
-            for field, values in card_facts(card).items():
-                for text in values:
-                    if _fact_supports_numeric_mention(text, number, unit):
-                        candidate = {"evidence_id": evidence_id, "field": field, "text": text[:700]}
-                        key = (evidence_id, field, text[:700])
-                        if key not in seen:
-                            candidates.append(candidate)
+            for candidate in index.card(evidence_id).numeric_facts(key):
+                if (evidence_id, candidate["field"], candidate["text"]) not in seen:
+                    candidates.append(dict(candidate))
 
         # Automatic repair is deliberately conservative: ambiguous matches still fail.
         unique = {(item["evidence_id"], item["field"], item["text"]): item for item in candidates}
@@ -121,6 +199,7 @@ def _repair_numeric_grounding(
         chosen = next(iter(unique.values()))
         repaired.append(chosen)
         seen.add((chosen["evidence_id"], chosen["field"], chosen["text"]))
+        supported |= index.numeric_keys(chosen["text"])
 
     return repaired, True
 
@@ -138,8 +217,15 @@ def validate_ai_paragraph_detailed(
     raw: Any,
     cards_by_id: dict[str, Any],
     requirement_count: int,
+    grounding: GroundingIndex | None = None,
 ) -> tuple[dict[str, Any] | None, str]:
-    """Validate one generated paragraph and return a non-sensitive rejection reason."""
+    """Validate one generated paragraph and return a non-sensitive rejection reason.
+
+    Pass the request's ``GroundingIndex`` when validating several paragraphs
+    against the same cards.
+    """
+    if grounding is None:
+        grounding = GroundingIndex(cards_by_id)
 
     if not isinstance(raw, dict):
         return None, "invalid_shape"
@@ -172,7 +258,7 @@ def validate_ai_paragraph_detailed(
         card = cards_by_id.get(evidence_id)
         if card is None or evidence_id not in evidence_ids:
             continue
-        fact = grounded_fact(card, raw_fact)
+        fact = grounded_fact(card, raw_fact, grounding.card(evidence_id))
         if fact is None:
             continue
         fact["evidence_id"] = evidence_id
@@ -185,7 +271,7 @@ def validate_ai_paragraph_detailed(
     if not action_fact_found:
         return None, "missing_action_fact"
 
-    facts, numeric_ok = _repair_numeric_grounding(text, facts, evidence_ids, cards_by_id)
+    facts, numeric_ok = _repair_numeric_grounding(text, facts, evidence_ids, grounding)
     if not numeric_ok:
         return None, "unsupported_number"
     if not _authority_claims_supported(text, facts):
@@ -0,0 +1,87 @@
+"""Local repair for semantic drafts that overshoot the requested word limit."""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from lib.application_grounding import GroundingIndex, validate_ai_paragraph_detailed
+from lib.evidence_matching import _tokens
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[A-Z0-9])")
+
+
+def _sentences(text: str) -> list[str]:
+    return [sentence for sentence in _SENTENCE_SPLIT_RE.split(text.strip()) if sentence.strip()]
+
+
+def _words(paragraphs: list[dict[str, Any]]) -> int:
+    return sum(len(str(paragraph.get("text", "")).split()) for paragraph in paragraphs)
+
+
+def _is_essential(paragraph: dict[str, Any], requirements: list[Any]) -> bool:
+    return any(
+        str(getattr(requirements[index], "category", "essential")) == "essential"
+        for index in paragraph.get("requirement_indices", [])
+        if 0 <= index < len(requirements)
+    )
+
+
+def _grounding_overlap(sentence: str, fact_tokens: set[str]) -> float:
+    tokens = _tokens(sentence)
+    return len(tokens & fact_tokens) / len(tokens) if tokens else 0.0
+
+
+def trim_to_word_limit(
+    paragraphs: list[dict[str, Any]],
+    requirements: list[Any],
+    cards_by_id: dict[str, Any],
+    word_limit: int,
+) -> list[dict[str, Any]] | None:
+    """Drop whole low-priority sentences until the draft fits, or return None.
+
+    Desirable-only paragraphs are trimmed before essential ones, and within each
+    tier the sentences that share least vocabulary with the cited facts go first
+    (later sentences on ties). Every paragraph keeps at least one sentence and its
+    original citations, and is re-validated against the Evidence Cards after each
+    cut so a trim can never leave an ungrounded paragraph behind.
+    """
+    trimmed = [dict(paragraph) for paragraph in paragraphs]
+    sentences = [_sentences(str(paragraph.get("text", ""))) for paragraph in trimmed]
+    total = _words(trimmed)
+    if total <= word_limit:
+        return trimmed
+
+    candidates: list[tuple[bool, float, int, int, int]] = []
+    for paragraph_index, paragraph in enumerate(trimmed):
+        fact_tokens: set[str] = set()
+        for fact in paragraph.get("supporting_facts", []) or []:
+            fact_tokens |= _tokens(str(fact.get("text", "")))
+        essential = _is_essential(paragraph, requirements)
+        for sentence_index, sentence in enumerate(sentences[paragraph_index]):
+            candidates.append(
+                (essential, _grounding_overlap(sentence, fact_tokens), -sentence_index, paragraph_index, sentence_index)
+            )
+    candidates.sort()
+
+    grounding = GroundingIndex(cards_by_id)
+    removed: set[tuple[int, int]] = set()
+    for _essential, _overlap, _position, paragraph_index, sentence_index in candidates:
+        if total <= word_limit:
+            break
+        remaining = [
+            sentence
+            for index, sentence in enumerate(sentences[paragraph_index])
+            if index != sentence_index and (paragraph_index, index) not in removed
+        ]
+        if not remaining:
+            continue
+        candidate = {**trimmed[paragraph_index], "text": " ".join(remaining)}
+        validated, _reason = validate_ai_paragraph_detailed(candidate, cards_by_id, len(requirements), grounding)
+        if validated is None:
+            continue
+        removed.add((paragraph_index, sentence_index))
+        total -= len(sentences[paragraph_index][sentence_index].split())
+        trimmed[paragraph_index] = {**trimmed[paragraph_index], **validated}
+
+    return trimmed if total <= word_limit else None
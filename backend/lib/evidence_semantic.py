@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 from typing import Any
 
+from lib.openai_client import get_openai_client
 from lib.settings import settings
 
 _ALLOWED_STRENGTHS = {"strong", "partial", "weak", "missing"}
@@ -119,9 +120,7 @@ def semantic_assess(requirement: str, cards: list[Any]) -> dict[str, dict[str, A
         return None
 
     try:
-        from openai import OpenAI
-
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        client = get_openai_client()
         response = client.chat.completions.create(
             model="gpt-4o-mini",
             response_format={"type": "json_object"},
@@ -0,0 +1,251 @@
+"""Durable local job queue for long-running drafting and extraction work."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from lib.settings import settings
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[dict[str, Any]], dict[str, Any]]
+
+_MAX_ATTEMPTS = 3
+_SCHEMA = """
+create table if not exists jobs (
+  id text primary key,
+  kind text not null,
+  owner text not null,
+  payload_hash text not null,
+  payload text not null,
+  status text not null,
+  result text,
+  error text,
+  attempts integer not null default 0,
+  claimed_by text,
+  created_at text not null,
+  updated_at text not null
+);
+create index if not exists jobs_payload_hash_idx on jobs (payload_hash);
+create index if not exists jobs_status_idx on jobs (status);
+"""
+
+_handlers: dict[str, JobHandler] = {}
+_queue: JobQueue | None = None
+_queue_lock = threading.Lock()
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+# One token per process boot. A restarted container often reuses the hostname
+# and pid (pid 1 in most images), so the token is what tells a claim left by the
+# previous boot apart from one held by this process.
+_boot_tokens: dict[int, str] = {}
+
+
+def _claim_id() -> str:
+    pid = os.getpid()
+    token = _boot_tokens.get(pid)
+    if token is None:
+        token = _boot_tokens[pid] = uuid.uuid4().hex
+    return f"{socket.gethostname()}:{pid}:{token}"
+
+
+def _claimant_alive(claimed_by: str | None, updated_at: str) -> bool:
+    """Whether the process that claimed a running job may still be working on it.
+
+    Running jobs refresh ``updated_at`` as they work, so any claim silent for
+    ``JOB_LEASE_SECONDS`` has lapsed. Claims from this host are also checked
+    directly: this pid with another boot's token, or a pid that no longer
+    exists, belongs to a process that has stopped.
+    """
+    parts = (claimed_by or "").rsplit(":", 2)
+    if len(parts) != 3 or not parts[1].isdigit():
+        return False
+    host, pid, token = parts[0], int(parts[1]), parts[2]
+    age = datetime.now(UTC) - datetime.fromisoformat(updated_at)
+    if age >= timedelta(seconds=settings.JOB_LEASE_SECONDS):
+        return False
+    if host != socket.gethostname():
+        return True
+    if pid == os.getpid():
+        return claimed_by == _claim_id()
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def payload_hash(kind: str, owner: str, payload: dict[str, Any]) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{kind}\n{owner}\n{canonical}".encode()).hexdigest()
+
+
+def _row(row: sqlite3.Row | None) -> dict[str, Any] | None:
+    if row is None:
+        return None
+    job = dict(row)
+    job["payload"] = json.loads(job["payload"])
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+
+class JobQueue:
+    """SQLite-backed queue drained by a thread pool.
+
+    Jobs are written to disk before they are dispatched, so a restarted worker
+    picks up anything that was queued, or running in a process that has since
+    gone, when it stopped. Several processes may share one queue file. Work that
+    keeps crashing the handler is failed after a few attempts rather than retried
+    forever.
+    """
+
+    def __init__(self, path: str, max_workers: int = 4) -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+        columns = {row["name"] for row in self._conn.execute("pragma table_info(jobs)")}
+        if "claimed_by" not in columns:
+            self._conn.execute("alter table jobs add column claimed_by text")
+        self._worker = _claim_id()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="job-queue")
+        self._recover()
+
+    def _execute(self, sql: str, params: tuple[Any, ...] = ()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _recover(self) -> None:
+        """Requeue jobs whose claiming process has stopped and dispatch pending work.
+
+        Jobs another live process is still running are left alone, so starting a
+        second worker never runs them twice.
+        """
+        rows = self._execute("select id, claimed_by, updated_at from jobs where status = 'running'")
+        for row in rows:
+            if not _claimant_alive(row["claimed_by"], row["updated_at"]):
+                self._execute(
+                    "update jobs set status = 'queued', claimed_by = null, updated_at = ? "
+                    "where id = ? and status = 'running' and claimed_by is ?",
+                    (_now(), row["id"], row["claimed_by"]),
+                )
+        self.dispatch_pending()
+
+    def dispatch_pending(self, kind: str | None = None) -> None:
+        rows = self._execute(
+            "select id, kind from jobs where status = 'queued'" + (" and kind = ?" if kind else "") + " order by created_at",
+            (kind,) if kind else (),
+        )
+        for row in rows:
+            if row["kind"] in _handlers:
+                self._executor.submit(self._run, row["id"])
+
+    def submit(self, kind: str, owner: str, payload: dict[str, Any]) -> tuple[dict[str, Any], bool]:
+        """Queue a job, or attach to a live or finished job with the same payload hash."""
+        digest = payload_hash(kind, owner, payload)
+        now = _now()
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            existing = self._conn.execute(
+                "select * from jobs where payload_hash = ? and status != 'failed' order by created_at desc limit 1",
+                (digest,),
+            ).fetchone()
+            if existing is not None:
+                return _row(existing), False
+            self._conn.execute(
+                "insert into jobs (id, kind, owner, payload_hash, payload, status, created_at, updated_at) "
+                "values (?, ?, ?, ?, ?, 'queued', ?, ?)",
+                (job_id, kind, owner, digest, json.dumps(payload, default=str), now, now),
+            )
+        if kind in _handlers:
+            self._executor.submit(self._run, job_id)
+        return self.get(job_id), True
+
+    def get(self, job_id: str, owner: str | None = None) -> dict[str, Any] | None:
+        rows = self._execute("select * from jobs where id = ?", (job_id,))
+        job = _row(rows[0]) if rows else None
+        if job is None or (owner is not None and job["owner"] != owner):
+            return None
+        return job
+
+    def _run(self, job_id: str) -> None:
+        with self._lock:
+            claimed = self._conn.execute(
+                "update jobs set status = 'running', claimed_by = ?, attempts = attempts + 1, updated_at = ? "
+                "where id = ? and status = 'queued'",
+                (self._worker, _now(), job_id),
+            ).rowcount
+        if not claimed:
+            return
+        job = self.get(job_id)
+        if job is None:
+            return
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job_id, stop), name="job-heartbeat", daemon=True)
+        heartbeat.start()
+        try:
+            result = _handlers[job["kind"]](job["payload"])
+        except Exception as exc:
+            error = type(exc).__name__
+            logger.warning("Background job %s (%s) failed: %s", job_id, job["kind"], error)
+            status = "failed" if job["attempts"] >= _MAX_ATTEMPTS else "queued"
+            self._execute(
+                "update jobs set status = ?, error = ?, updated_at = ? where id = ?",
+                (status, error, _now(), job_id),
+            )
+            if status == "queued":
+                self._executor.submit(self._run, job_id)
+            return
+        finally:
+            stop.set()
+            heartbeat.join()
+        self._execute(
+            "update jobs set status = 'succeeded', result = ?, error = null, updated_at = ? where id = ?",
+            (json.dumps(result, default=str), _now(), job_id),
+        )
+
+    def _heartbeat(self, job_id: str, stop: threading.Event) -> None:
+        """Renew this process's claim on a running job so other workers leave it alone."""
+        interval = max(0.05, settings.JOB_LEASE_SECONDS / 3)
+        while not stop.wait(interval):
+            self._execute(
+                "update jobs set updated_at = ? where id = ? and status = 'running' and claimed_by = ?",
+                (_now(), job_id, self._worker),
+            )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
+
+
+def register_job_handler(kind: str, handler: JobHandler) -> None:
+    """Register the function that runs jobs of ``kind`` and dispatch any waiting ones."""
+    _handlers[kind] = handler
+    if _queue is not None:
+        _queue.dispatch_pending(kind)
+
+
+def get_job_queue() -> JobQueue:
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue(settings.JOB_QUEUE_PATH, settings.JOB_QUEUE_WORKERS)
+        return _queue
@@ -0,0 +1,31 @@
+"""Shared OpenAI client construction for the optional semantic paths."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any
+
+from lib.settings import settings
+
+
+@lru_cache(maxsize=4)
+def _cached_client(api_key: str, base_url: str | None, timeout: float, max_retries: int) -> Any:
+    from openai import OpenAI
+
+    return OpenAI(api_key=api_key, base_url=base_url or None, timeout=timeout, max_retries=max_retries)
+
+
+def get_openai_client() -> Any:
+    """Return a process-wide client so connections are reused between requests.
+
+    ``OPENAI_BASE_URL`` points the app at any OpenAI-compatible server, including
+    the local stand-in in ``devtools/openai_standin.py`` used for offline load tests
+    and failure drills. Raises ImportError when the SDK is not installed; callers
+    already treat any exception as "semantic path unavailable".
+    """
+    return _cached_client(
+        settings.OPENAI_API_KEY or "",
+        settings.OPENAI_BASE_URL,
+        settings.OPENAI_TIMEOUT_SECONDS,
+        settings.OPENAI_MAX_RETRIES,
+    )
@@ -0,0 +1,43 @@
+"""Process pools shared by the bulk extraction and drafting paths.
+
+Starting a pool costs tens of milliseconds, more than a small batch of
+deterministic work, so pools are created once per size and reused across
+requests rather than per call.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+_pools: dict[int | None, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def shared_pool(workers: int | None) -> ProcessPoolExecutor:
+    """The process pool with ``workers`` processes, one per core when None."""
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+
+def pool_map(
+    function: Callable[[Any], Any],
+    items: Iterable[Any],
+    workers: int | None,
+    chunksize: int = 1,
+) -> Iterator[Any]:
+    """``map`` over the shared pool, in input order; a broken pool is replaced on next use."""
+    pool = shared_pool(workers)
+    try:
+        yield from pool.map(function, items, chunksize=chunksize)
+    except BrokenProcessPool:
+        with _pools_lock:
+            if _pools.get(workers) is pool:
+                del _pools[workers]
+        raise
@@ -0,0 +1,205 @@
+"""Local token estimates and relevance-ranked compaction for grounded LLM prompts."""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from lib.application_grounding import _numbers
+from lib.evidence_matching import _tokens
+from lib.vacancy_extraction import deterministic_extract, vacancy_sections
+
+logger = logging.getLogger(__name__)
+
+# Roughly four characters per token for English prose and compact JSON. This is a
+# budgeting estimate only; it must never be used to validate model output.
+_CHARS_PER_TOKEN = 4
+
+# Facts in these fields can satisfy the drafting validator's action requirement or
+# carry the outcomes the model is told to cite, so they are never trimmed.
+_PROTECTED_FACT_FIELDS = {"task", "actions", "authority_context", "outcome"}
+_FIELD_WEIGHTS = {
+    "situation": 2.0,
+    "reflection": 1.5,
+    "title": 1.0,
+    "skills": 1.0,
+    "behaviours": 1.0,
+    "tags": 0.5,
+}
+_PROTECTED_CARD_KEYS = {"id", "title", "task", "actions", "outcome", "authority_context"}
+_SECTION_PRIORITY = {
+    "eligibility": 4,
+    "essential": 4,
+    "desirable": 3,
+    "trainable": 3,
+    "practical": 3,
+    None: 2,
+    "ignore": 0,
+}
+
+
+def estimate_tokens(value: Any) -> int:
+    """Estimate prompt tokens for text or a JSON-serialisable payload."""
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+def _report(before: int, after: int, dropped: int) -> dict[str, int]:
+    return {"tokens_before": before, "tokens_after": after, "tokens_saved": max(0, before - after), "dropped": dropped}
+
+
+def combine_reports(reports: Iterable[dict[str, int]]) -> dict[str, int]:
+    """Add up the compaction reports for every prompt sent by one request."""
+    total = _report(0, 0, 0)
+    for report in reports:
+        for key in total:
+            total[key] += report[key]
+    return total
+
+
+def log_prompt_usage(label: str, input_tokens: int, report: dict[str, int], started: float) -> None:
+    """Log one line per request: estimated input tokens, compaction savings and latency.
+
+    ``started`` is a ``time.perf_counter()`` reading taken before the model call.
+    """
+    logger.info(
+        "%s: ~%d input tokens, compaction saved %d of %d (%d items dropped), %.0f ms",
+        label,
+        input_tokens,
+        report["tokens_saved"],
+        report["tokens_before"],
+        report["dropped"],
+        (time.perf_counter() - started) * 1000,
+    )
+
+
+def _relevance(text: str, wanted: set[str]) -> int:
+    return len(_tokens(text) & wanted) if wanted else 0
+
+
+def compact_fact_cards(
+    cards: list[dict[str, Any]],
+    requirement_text_by_card: dict[str, str],
+    token_budget: int,
+) -> tuple[list[dict[str, Any]], dict[str, int]]:
+    """Drop the least relevant optional facts from a fact catalog until it fits the budget.
+
+    Fact ids are left untouched so the model's citations still resolve against the
+    full lookup. Action, task, authority, outcome and numeric facts are always kept
+    because grounding validation may need them to accept or repair a paragraph.
+    """
+
+    before = estimate_tokens(cards)
+    if before <= token_budget:
+        return cards, _report(before, before, 0)
+
+    facts_by_id = {fact["fact_id"]: fact for card in cards for fact in card["facts"]}
+    optional: list[tuple[float, int, str]] = []
+    for card in cards:
+        wanted = _tokens(requirement_text_by_card.get(card["id"], ""))
+        for position, fact in enumerate(card["facts"]):
+            if fact["field"] in _PROTECTED_FACT_FIELDS or _numbers(fact["text"]):
+                continue
+            score = _relevance(fact["text"], wanted) * 3 + _FIELD_WEIGHTS.get(fact["field"], 1.0)
+            # Later list entries (extra tags, skills) go first when scores tie.
+            optional.append((score, -position, fact["fact_id"]))
+
+    dropped: set[str] = set()
+    remaining = before
+    for _score, _position, fact_id in sorted(optional):
+        if remaining <= token_budget:
+            break
+        dropped.add(fact_id)
+        remaining -= estimate_tokens(facts_by_id[fact_id]) + 1
+
+    compacted = [
+        {**card, "facts": [fact for fact in card["facts"] if fact["fact_id"] not in dropped]}
+        for card in cards
+    ]
+    return compacted, _report(before, estimate_tokens(compacted), len(dropped))
+
+
+def compact_evidence_cards(
+    cards: list[dict[str, Any]],
+    requirement: str,
+    token_budget: int,
+) -> tuple[list[dict[str, Any]], dict[str, int]]:
+    """Remove low-relevance optional fields from compact Evidence Cards.
+
+    Only whole fields are removed. Text is never shortened, so any supporting fact
+    the model copies from what remains is still an exact substring of the stored card.
+    """
+
+    before = estimate_tokens(cards)
+    if before <= token_budget:
+        return cards, _report(before, before, 0)
+
+    wanted = _tokens(requirement)
+    optional: list[tuple[float, int, str]] = []
+    for position, card in enumerate(cards):
+        for key, value in card.items():
+            if key in _PROTECTED_CARD_KEYS or not value:
+                continue
+            text = " ".join(value) if isinstance(value, list) else str(value)
+            optional.append((_relevance(text, wanted) * 3 + _FIELD_WEIGHTS.get(key, 1.0), position, key))
+
+    compacted = [dict(card) for card in cards]
+    remaining = before
+    dropped = 0
+    for _score, position, key in sorted(optional):
+        if remaining <= token_budget:
+            break
+        remaining -= estimate_tokens({key: compacted[position].pop(key)})
+        dropped += 1
+    return compacted, _report(before, estimate_tokens(compacted), dropped)
+
+
+def compact_vacancy_text(vacancy_text: str, token_budget: int) -> tuple[str, dict[str, int]]:
+    """Rank advert sections and drop process/admin copy before truncating.
+
+    A section is never dropped while it contains a line the deterministic extractor
+    would return, so every criterion the advert states explicitly stays visible.
+    Remaining sections keep their original order.
+    """
+
+    before = estimate_tokens(vacancy_text)
+    if before <= token_budget:
+        return vacancy_text, _report(before, before, 0)
+
+    sections = vacancy_sections(vacancy_text)
+    extracted = {" ".join(item["source_text"].lower().split()) for item in deterministic_extract(vacancy_text)}
+
+    def protected(section: dict[str, Any]) -> bool:
+        for raw in section["lines"]:
+            normalised = " ".join(raw.lower().split())
+            if any(source in normalised for source in extracted):
+                return True
+        return False
+
+    ranked = sorted(
+        (
+            (_SECTION_PRIORITY.get(section["section"], 2), -len("\n".join(section["lines"])), position)
+            for position, section in enumerate(sections)
+            if not protected(section)
+        ),
+    )
+    dropped: set[int] = set()
+    remaining = before
+    for _priority, _size, position in ranked:
+        if remaining <= token_budget:
+            break
+        dropped.add(position)
+        remaining -= estimate_tokens("\n".join(sections[position]["lines"]))
+
+    kept = "\n".join(
+        line
+        for position, section in enumerate(sections)
+        if position not in dropped
+        for line in section["lines"]
+    )
+    compacted = kept[: token_budget * _CHARS_PER_TOKEN]
+    return compacted, _report(before, estimate_tokens(compacted), len(dropped))
@@ -19,6 +19,15 @@ class Settings(BaseSettings):
     NEXT_PUBLIC_STRIPE_PRICE_INVESTOR: str = "price_investor_xxx"
 
     OPENAI_API_KEY: str | None = None
+    OPENAI_BASE_URL: str | None = None
+    OPENAI_TIMEOUT_SECONDS: float = 60.0
+    OPENAI_MAX_RETRIES: int = 2
+    PROMPT_TOKEN_BUDGET_VACANCY: int = 6000
+    PROMPT_TOKEN_BUDGET_EVIDENCE: int = 4000
+    PROMPT_TOKEN_BUDGET_DRAFT: int = 6000
+    VACANCY_CHUNK_TOKENS: int = 3000
+    VACANCY_CHUNK_WORKERS: int = 4
+    APPLICATION_DRAFT_WORKERS: int = 4
 
     EMAIL_SERVER: str | None = None
     EMAIL_USER: str | None = None
@@ -37,5 +46,13 @@ class Settings(BaseSettings):
     ALLOWED_ORIGINS: str = ""
     ENABLE_DEBUG_ROUTES: bool = False
 
+    JOB_QUEUE_PATH: str = "jobsleuth_jobs.sqlite3"
+    JOB_QUEUE_WORKERS: int = 4
+    JOB_LEASE_SECONDS: float = 900
+    BULK_EXTRACTION_WORKERS: int | None = None
+    BULK_SEMANTIC_LIMIT: int = 100
+    BULK_DRAFT_WORKERS: int = 1
+    EVIDENCE_IMPORT_BATCH_SIZE: int = 200
+
 
 settings = Settings()
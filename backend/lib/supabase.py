@@ -37,6 +37,9 @@ def get_supabase_client() -> Client:
                 def eq(self, *args, **kwargs):
                     return self
 
+                def in_(self, *args, **kwargs):
+                    return self
+
                 def execute(self):
                     class Result:
                         data = []
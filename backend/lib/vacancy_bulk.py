@@ -0,0 +1,144 @@
+"""Bulk deterministic vacancy extraction across a process pool.
+
+Used by ``POST /vacancy-intelligence/bulk`` and by the overnight ingestion CLI::
+
+    python -m lib.vacancy_bulk --job-id 12 --job-id 13 > extractions.ndjson
+    python -m lib.vacancy_bulk --input adverts.ndjson --workers 8
+
+Input NDJSON lines are ``{"id": ..., "vacancy_text": ...}``. Results are written
+as NDJSON in input order; an advert that fails is reported on its own line and
+never aborts the batch. Semantic extraction is only queued over HTTP, where the
+owner can poll the jobs; the CLI is deterministic only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from lib.process_pool import pool_map
+from lib.vacancy_extraction import deterministic_extract
+from lib.vacancy_html import as_vacancy_text
+
+SEMANTIC_JOB_KIND = "vacancy_semantic"
+MAX_VACANCY_CHARS = 30000
+_JOB_FETCH_BATCH = 200
+# Below this many adverts, pool dispatch and pickling cost more than they save.
+_POOL_MIN_BATCH = 64
+
+
+def _extract_one(entry: tuple[str, str]) -> dict[str, Any]:
+    key, text = entry
+    if not text.strip():
+        return {"id": key, "ok": False, "error": "empty_vacancy_text"}
+    if len(text) > MAX_VACANCY_CHARS:
+        return {"id": key, "ok": False, "error": "vacancy_text_too_long"}
+    try:
+        items = deterministic_extract(text)
+    except Exception as exc:
+        return {"id": key, "ok": False, "error": type(exc).__name__}
+    return {"id": key, "ok": True, "provider": "deterministic-v2", "items": items}
+
+
+def bulk_extract(
+    entries: Iterable[tuple[str, str]],
+    workers: int | None = None,
+    chunksize: int = 16,
+) -> Iterator[dict[str, Any]]:
+    """Yield one result per ``(id, text)`` entry, in input order.
+
+    ``workers=1`` and batches under ``_POOL_MIN_BATCH`` run in-process; larger
+    batches use a shared process pool, one worker per core by default.
+    """
+    entries = list(entries)
+    if workers == 1 or len(entries) < _POOL_MIN_BATCH:
+        yield from map(_extract_one, entries)
+        return
+    yield from pool_map(_extract_one, entries, workers, chunksize=chunksize)
+
+
+def load_job_texts(job_ids: list[str]) -> dict[str, str]:
+    """Fetch stored advert descriptions for ``job_ids`` in batches, converting HTML to lines."""
+    from lib.supabase import get_supabase_client
+
+    texts: dict[str, str] = {}
+    for start in range(0, len(job_ids), _JOB_FETCH_BATCH):
+        batch = job_ids[start : start + _JOB_FETCH_BATCH]
+        result = get_supabase_client().table("jobs").select("id, description").in_("id", batch).execute()
+        for row in result.data or []:
+            texts[str(row.get("id"))] = as_vacancy_text(str(row.get("description") or ""))
+    return texts
+
+
+def job_entries(job_ids: list[str]) -> list[tuple[str, str]]:
+    texts = load_job_texts(job_ids)
+    return [(job_id, texts.get(job_id, "")) for job_id in job_ids]
+
+
+def enqueue_semantic(owner: str, key: str, vacancy_text: str) -> str:
+    """Queue a semantic extraction for one advert and return its job id."""
+    from lib.job_queue import get_job_queue
+
+    job, _created = get_job_queue().submit(SEMANTIC_JOB_KIND, owner, {"id": key, "vacancy_text": vacancy_text})
+    return str(job["id"])
+
+
+def run_bulk(
+    entries: list[tuple[str, str]],
+    owner: str,
+    semantic_limit: int = 0,
+    workers: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Extract every entry and queue semantic extraction for the first successes."""
+    texts = dict(entries)
+    queued = 0
+    for result in bulk_extract(entries, workers=workers):
+        if result["ok"] and queued < semantic_limit:
+            result["semantic_job_id"] = enqueue_semantic(owner, result["id"], texts[result["id"]])
+            queued += 1
+        yield result
+
+
+def _read_input(stream: Iterable[str]) -> Iterator[tuple[str, str]]:
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            yield f"line-{number}", ""
+            continue
+        yield str(record.get("id", f"line-{number}")), str(record.get("vacancy_text", ""))
+
+
+def main(argv: list[str] | None = None) -> int:
+    from lib.settings import settings
+
+    parser = argparse.ArgumentParser(description="Extract vacancy requirements in bulk as NDJSON.")
+    parser.add_argument("--input", help="NDJSON file of {id, vacancy_text} records; '-' for stdin")
+    parser.add_argument("--job-id", action="append", default=[], help="Stored job id to extract (repeatable)")
+    parser.add_argument("--workers", type=int, default=settings.BULK_EXTRACTION_WORKERS)
+    args = parser.parse_args(argv)
+
+    entries = job_entries(args.job_id) if args.job_id else []
+    if args.input == "-":
+        entries.extend(_read_input(sys.stdin))
+    elif args.input:
+        with open(args.input, encoding="utf-8") as handle:
+            entries.extend(_read_input(handle))
+    if not entries:
+        parser.error("provide --input or at least one --job-id")
+
+    failures = 0
+    for result in bulk_extract(entries, workers=args.workers):
+        failures += not result["ok"]
+        sys.stdout.write(json.dumps(result, ensure_ascii=False) + "\n")
+    print(f"Extracted {len(entries) - failures}/{len(entries)} adverts", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
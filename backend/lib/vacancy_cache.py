@@ -0,0 +1,96 @@
+"""Shared store of reconciled vacancy extractions keyed by normalised advert text."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import Any
+
+from lib.supabase import get_supabase_client
+
+logger = logging.getLogger(__name__)
+
+_TABLE = "vacancy_extractions"
+
+
+def normalised_lines(vacancy_text: str) -> list[str]:
+    """Drop differences that cannot change extraction: line endings, edge spaces, blank lines."""
+    return [line.strip() for line in vacancy_text.splitlines() if line.strip()]
+
+
+def normalise_vacancy_text(vacancy_text: str) -> str:
+    return "\n".join(normalised_lines(vacancy_text))
+
+
+def text_hash(vacancy_text: str) -> str:
+    return hashlib.sha256(normalise_vacancy_text(vacancy_text).encode()).hexdigest()
+
+
+def load_extraction(vacancy_text: str, extractor_version: str) -> dict[str, Any] | None:
+    """Return the stored ``{id, provider, items}`` for this advert, or None on a miss.
+
+    Storage problems are logged and treated as a miss; the cache must never stop
+    an extraction from running.
+    """
+    try:
+        result = (
+            get_supabase_client()
+            .table(_TABLE)
+            .select("id, provider, items")
+            .eq("text_hash", text_hash(vacancy_text))
+            .eq("extractor_version", extractor_version)
+            .execute()
+        )
+    except Exception as exc:
+        logger.warning("Vacancy extraction lookup failed: %s", type(exc).__name__)
+        return None
+    rows = result.data or []
+    return rows[0] if rows else None
+
+
+def load_extraction_by_id(extraction_id: str, extractor_version: str) -> dict[str, Any] | None:
+    """Return a stored ``{id, provider, items, source_lines}`` made by the current extractors."""
+    try:
+        result = (
+            get_supabase_client()
+            .table(_TABLE)
+            .select("id, provider, items, source_lines")
+            .eq("id", extraction_id)
+            .eq("extractor_version", extractor_version)
+            .execute()
+        )
+    except Exception as exc:
+        logger.warning("Vacancy extraction lookup failed: %s", type(exc).__name__)
+        return None
+    rows = result.data or []
+    return rows[0] if rows else None
+
+
+def save_extraction(
+    vacancy_text: str,
+    extractor_version: str,
+    provider: str,
+    items: list[dict[str, Any]],
+) -> str | None:
+    """Persist a reconciled extraction and return its id when the store reports one."""
+    try:
+        result = (
+            get_supabase_client()
+            .table(_TABLE)
+            .upsert(
+                {
+                    "text_hash": text_hash(vacancy_text),
+                    "extractor_version": extractor_version,
+                    "provider": provider,
+                    "items": items,
+                    "source_lines": normalised_lines(vacancy_text),
+                },
+                on_conflict="text_hash,extractor_version",
+            )
+            .execute()
+        )
+    except Exception as exc:
+        logger.warning("Vacancy extraction save failed: %s", type(exc).__name__)
+        return None
+    rows = result.data or []
+    return str(rows[0]["id"]) if rows and rows[0].get("id") else None
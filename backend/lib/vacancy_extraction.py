@@ -3,13 +3,20 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Iterable, Iterator
 from typing import Any, Literal
 
 Category = Literal["eligibility", "essential", "desirable", "trainable", "practical"]
 
+# Bump when extraction rules change so persisted extractions are redone.
+EXTRACTOR_VERSION = "deterministic-v2"
+
+_BULLET_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])")
+_CLEAN_LINE_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
 
 def _clean_line(value: str) -> str:
-    return re.sub(r"^\s*(?:[-*•]|\d+[.)])\s*", "", value).strip()
+    return _CLEAN_LINE_RE.sub("", value).strip()
 
 
 def _confidence(value: float) -> float:
@@ -109,6 +116,120 @@ _NON_REQUIREMENT_PREFIXES = (
 )
 
 
+_ELIGIBILITY_CUES = (
+    "right to work",
+    "eligible to apply",
+    "nationality requirement",
+    "security clearance",
+    "security check",
+    "security vetting",
+    "uk security vetting",
+    "mandatory qualification",
+    "required driving licence",
+    "required driving license",
+)
+_PRACTICAL_CUES = (
+    "hours per week",
+    "days per week",
+    "working pattern",
+    "working arrangements",
+    "office attendance",
+    "working time in an office",
+    "hybrid working",
+    "only available on a full-time basis",
+    "only available on a full time basis",
+    "minimum hours",
+    "required to travel",
+    "travel is required",
+    "travel will be required",
+    "shift pattern",
+    "weekend working",
+    "full-time training",
+    "full time training",
+)
+_TRAINABLE_CUES = (
+    "training will be provided",
+    "training is provided",
+    "full training provided",
+    "training provided",
+    "will receive training",
+    "will be trained",
+    "will be taught",
+    "taught during training",
+    "taught as part of training",
+)
+_HARD_BLOCKER_CUES = (
+    "cannot apply",
+    "only open to",
+    "must have the right to work",
+    "mandatory qualification",
+    "security clearance",
+    "security check",
+    "security vetting",
+    "uk security vetting",
+)
+
+_CUES_BY_KIND = {
+    "trainable": _TRAINABLE_CUES,
+    "eligibility": _ELIGIBILITY_CUES,
+    "practical": _PRACTICAL_CUES,
+    "blocker": _HARD_BLOCKER_CUES,
+}
+
+
+def _cue_kinds_by_cue() -> dict[str, frozenset[str]]:
+    # A cue also carries the kinds of every shorter cue it contains, so the
+    # longest match at each position is enough to report all overlapping cues.
+    kinds: dict[str, set[str]] = {}
+    for kind, cues in _CUES_BY_KIND.items():
+        for cue in cues:
+            kinds.setdefault(cue, set()).add(kind)
+    return {
+        cue: frozenset(kind for other, other_kinds in kinds.items() if other in cue for kind in other_kinds)
+        for cue in kinds
+    }
+
+
+def _trie_pattern(words: list[str]) -> str:
+    """Build a regex that matches any of ``words``, factored on shared prefixes.
+
+    A prefix-factored alternation lets the regex engine reject most positions on
+    the first character instead of trying every cue in turn. Quantifiers are
+    greedy, so the longest cue wins at each position.
+    """
+
+    trie: dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return ("(?:" + body + ")" if len(branches) == 1 else body) + "?"
+        return body
+
+    return build(trie)
+
+
+_CUE_KINDS = _cue_kinds_by_cue()
+# Zero-width lookahead so matches may overlap and every cue start is reported.
+_CUE_RE = re.compile("(?=(" + _trie_pattern(list(_CUE_KINDS)) + "))")
+
+
+def _cue_kinds(lowered: str) -> set[str]:
+    """Return every cue kind present in a lowered line in a single regex pass."""
+    found: set[str] = set()
+    for match in _CUE_RE.finditer(lowered):
+        found |= _CUE_KINDS[match.group(1)]
+    return found
+
+
 def is_non_requirement_text(value: str) -> bool:
     """Return True for advert/process copy that must never become candidate criteria."""
 
@@ -118,7 +239,7 @@ def is_non_requirement_text(value: str) -> bool:
     lowered = text.lower().rstrip(":")
     if lowered in _IGNORED_SECTION_HEADINGS or lowered in _SECTION_HEADINGS or lowered in _LEAD_INS:
         return True
-    if any(lowered.startswith(prefix) for prefix in _NON_REQUIREMENT_PREFIXES):
+    if lowered.startswith(_NON_REQUIREMENT_PREFIXES):
         return True
     if "@" in lowered and ("contact" in lowered or "email" in lowered or "problems" in lowered):
         return True
@@ -139,106 +260,117 @@ def _heading_section(line: str, raw: str, is_bullet: bool) -> Category | Literal
     return None
 
 
-def deterministic_extract(vacancy_text: str) -> list[dict[str, Any]]:
-    """Extract grounded criteria from vacancy text without external services.
+def vacancy_sections(vacancy_text: str) -> list[dict[str, Any]]:
+    """Split an advert into heading-delimited sections using the extractor's heading rules.
 
-    The fallback deliberately prefers omission over invention. Every returned item
-    is tied to a source line from the supplied advert. Explicit Essential/Desirable
-    sections and person-specification bullet lists are treated as authoritative;
-    process/admin sections terminate that scope so they cannot leak into matching.
+    Each section keeps its raw lines (heading included) so callers can rebuild a
+    faithful subset of the advert. ``section`` is the criteria category the
+    heading opens, ``"ignore"`` for process/admin headings, or None for text
+    before the first recognised heading.
     """
 
-    items: list[dict[str, Any]] = []
-    section: Category | None = None
-
-    eligibility_cues = (
-        "right to work",
-        "eligible to apply",
-        "nationality requirement",
-        "security clearance",
-        "security check",
-        "security vetting",
-        "uk security vetting",
-        "mandatory qualification",
-        "required driving licence",
-        "required driving license",
-    )
-    practical_cues = (
-        "hours per week",
-        "days per week",
-        "working pattern",
-        "working arrangements",
-        "office attendance",
-        "working time in an office",
-        "hybrid working",
-        "only available on a full-time basis",
-        "only available on a full time basis",
-        "minimum hours",
-        "required to travel",
-        "travel is required",
-        "travel will be required",
-        "shift pattern",
-        "weekend working",
-        "full-time training",
-        "full time training",
-    )
-    trainable_cues = (
-        "training will be provided",
-        "training is provided",
-        "full training provided",
-        "training provided",
-        "will receive training",
-        "will be trained",
-        "will be taught",
-        "taught during training",
-        "taught as part of training",
-    )
-    hard_blocker_cues = (
-        "cannot apply",
-        "only open to",
-        "must have the right to work",
-        "mandatory qualification",
-        "security clearance",
-        "security check",
-        "security vetting",
-        "uk security vetting",
-    )
-
+    sections: list[dict[str, Any]] = [{"heading": None, "section": None, "lines": []}]
     for raw in vacancy_text.splitlines():
+        line = _clean_line(raw)
+        if line:
+            is_bullet = bool(_BULLET_RE.match(raw))
+            heading = _heading_section(line, raw, is_bullet)
+            if heading is not None:
+                sections.append({"heading": line, "section": heading, "lines": [raw]})
+                continue
+        sections[-1]["lines"].append(raw)
+    return [section for section in sections if section["lines"]]
+
+
+_MAX_ITEMS = 40
+
+
+class IncrementalExtractor:
+    """Push-style deterministic extractor that accepts an advert in arbitrary chunks.
+
+    Chunks are raw text fragments: a line is only classified once its line break
+    has arrived, so the section state machine carries across chunk boundaries and
+    every item returned is final. Lines supplied one at a time must keep their
+    line endings, as file iteration does.
+    """
+
+    def __init__(self) -> None:
+        self._pending = ""
+        self._section: Category | None = None
+        self._seen: set[tuple[str, str]] = set()
+        self.done = False
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        if not chunk or self.done:
+            return []
+        lines = (self._pending + chunk).splitlines(keepends=True)
+        tail = lines.pop()
+        # A trailing "\r" may be the first half of "\r\n", so wait for the next chunk.
+        if tail.endswith("\r") or tail.splitlines()[0] == tail:
+            self._pending = tail
+        else:
+            self._pending = ""
+            lines.append(tail)
+        return self._extract(line.splitlines()[0] for line in lines)
+
+    def close(self) -> list[dict[str, Any]]:
+        """Flush the final unterminated line."""
+        pending, self._pending = self._pending, ""
+        items = self._extract(pending.splitlines())
+        self.done = True
+        return items
+
+    def _extract(self, raw_lines: Iterable[str]) -> list[dict[str, Any]]:
+        items: list[dict[str, Any]] = []
+        for raw in raw_lines:
+            if self.done:
+                break
+            item = self._line_item(raw)
+            if item is None:
+                continue
+            key = (item["category"], item["text"].lower())
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            items.append(item)
+            if len(self._seen) >= _MAX_ITEMS:
+                self.done = True
+        return items
+
+    def _line_item(self, raw: str) -> dict[str, Any] | None:
         line = _clean_line(raw)
         if not line:
-            continue
+            return None
         lowered = line.lower().rstrip(":")
-        is_bullet = bool(re.match(r"^\s*(?:[-*•]|\d+[.)])", raw))
+        is_bullet = bool(_BULLET_RE.match(raw))
 
         heading = _heading_section(line, raw, is_bullet)
         if heading is not None:
-            section = None if heading == "ignore" else heading
-            continue
+            self._section = None if heading == "ignore" else heading
+            return None
 
         if is_non_requirement_text(line):
-            continue
+            return None
 
-        explicit_blocker = any(token in lowered for token in hard_blocker_cues)
+        cue_kinds = _cue_kinds(lowered)
+        explicit_blocker = "blocker" in cue_kinds
 
-        if any(cue in lowered for cue in trainable_cues):
-            items.append(_item(line, "trainable", 0.96))
-            continue
-        if any(cue in lowered for cue in eligibility_cues):
-            items.append(_item(line, "eligibility", 0.9, explicit_blocker=explicit_blocker))
-            continue
-        if any(cue in lowered for cue in practical_cues):
-            items.append(_item(line, "practical", 0.9, explicit_blocker=explicit_blocker))
-            continue
+        if "trainable" in cue_kinds:
+            return _item(line, "trainable", 0.96)
+        if "eligibility" in cue_kinds:
+            return _item(line, "eligibility", 0.9, explicit_blocker=explicit_blocker)
+        if "practical" in cue_kinds:
+            return _item(line, "practical", 0.9, explicit_blocker=explicit_blocker)
 
         # Inside explicit criteria/person-specification sections, the section
         # heading itself is the evidence that each following short line is a
         # criterion. This recovers criteria that do not contain generic words like
         # "experience" or "ability".
+        section = self._section
         if section in {"essential", "desirable"}:
             if len(line) <= 420 and lowered not in _LEAD_INS:
-                items.append(_item(line.rstrip(";"), section, 0.9 if is_bullet else 0.86, explicit_blocker=False))
-            continue
+                return _item(line.rstrip(";"), section, 0.9 if is_bullet else 0.86, explicit_blocker=False)
+            return None
 
         # Outside a labelled criteria section, accept only self-identifying criteria.
         if len(line) <= 420 and (
@@ -249,15 +381,43 @@ def deterministic_extract(vacancy_text: str) -> list[dict[str, Any]]:
             or lowered.startswith("you must be able to ")
         ):
             category: Category = "desirable" if "desirable" in lowered else "essential"
-            items.append(_item(line, category, 0.78, explicit_blocker=False))
-
-    unique: list[dict[str, Any]] = []
-    seen: set[tuple[str, str]] = set()
-    for item in items:
-        key = (item["category"], item["text"].lower())
-        if key in seen:
-            continue
-        seen.add(key)
-        unique.append(item)
-
-    return unique[:40]
+            return _item(line, category, 0.78, explicit_blocker=False)
+        return None
+
+
+def iter_extract(chunks: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """Yield grounded criteria as soon as each source line has been classified."""
+    extractor = IncrementalExtractor()
+    for chunk in chunks:
+        yield from extractor.feed(chunk)
+        if extractor.done:
+            return
+    yield from extractor.close()
+
+
+def deterministic_extract(vacancy_text: str) -> list[dict[str, Any]]:
+    """Extract grounded criteria from vacancy text without external services.
+
+    The fallback deliberately prefers omission over invention. Every returned item
+    is tied to a source line from the supplied advert. Explicit Essential/Desirable
+    sections and person-specification bullet lists are treated as authoritative;
+    process/admin sections terminate that scope so they cannot leak into matching.
+    """
+
+    return list(iter_extract((vacancy_text,)))
+
+
+def grouped_extraction(vacancy_text: str) -> dict[str, Any]:
+    """Deterministic extraction grouped the way job records and the API present it.
+
+    Scraped descriptions are often HTML, so they are converted to lines first.
+    """
+    from lib.vacancy_html import as_vacancy_text
+
+    items = deterministic_extract(as_vacancy_text(vacancy_text))
+    return {
+        "version": EXTRACTOR_VERSION,
+        "eligibility": [item for item in items if item["category"] == "eligibility"],
+        "requirements": [item for item in items if item["category"] in {"essential", "desirable", "trainable"}],
+        "practical": [item for item in items if item["category"] == "practical"],
+    }
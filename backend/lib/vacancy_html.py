@@ -0,0 +1,108 @@
+"""Incremental HTML-to-lines conversion for scraped vacancy descriptions.
+
+The deterministic extractor relies on line structure: headings open sections and
+bullets mark criteria. This converter rebuilds that structure from HTML as it
+streams through ``html.parser`` without building a DOM: ``<h1>``-``<h6>`` become
+``Heading:`` lines, ``<li>`` becomes ``- item`` and other block elements end the
+current line. Script, style and similar content is dropped.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator
+from html.parser import HTMLParser
+
+_HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "fieldset",
+    "figcaption", "figure", "footer", "form", "header", "hr", "li", "main", "nav", "ol",
+    "p", "section", "table", "tbody", "td", "th", "thead", "tr", "ul",
+} | _HEADING_TAGS
+_SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg", "head"}
+# Longer runs cannot be criteria (the extractor ignores lines over 420 chars), so
+# splitting them keeps the pending line bounded on pathological pages.
+_MAX_LINE_CHARS = 2000
+_HTML_RE = re.compile(r"<(?:p|div|li|ul|ol|br|h[1-6]|section|table|span|strong)\b[^>]*>", re.IGNORECASE)
+
+
+class HtmlLineConverter(HTMLParser):
+    """Push-style converter: ``feed`` returns the lines completed by each chunk."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._parts: list[str] = []
+        self._length = 0
+        self._prefix = ""
+        self._heading = False
+        self._skip_depth = 0
+        self._lines: list[str] = []
+
+    def feed(self, data: str) -> list[str]:  # type: ignore[override]
+        super().feed(data)
+        return self._drain()
+
+    def close(self) -> list[str]:  # type: ignore[override]
+        super().close()
+        self._flush()
+        return self._drain()
+
+    def _drain(self) -> list[str]:
+        lines, self._lines = self._lines, []
+        return lines
+
+    def _flush(self) -> None:
+        text = " ".join("".join(self._parts).split())
+        self._parts, self._length = [], 0
+        if text:
+            if self._heading and not text.endswith(":"):
+                text += ":"
+            self._lines.append(f"{self._prefix}{text}\n")
+            self._prefix = ""
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+            return
+        if tag in _BLOCK_TAGS:
+            self._flush()
+            self._heading = tag in _HEADING_TAGS
+            if tag == "li":
+                self._prefix = "- "
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if tag in _BLOCK_TAGS:
+            self._flush()
+            self._heading = False
+            if tag == "li":
+                self._prefix = ""
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth:
+            return
+        self._parts.append(data)
+        self._length += len(data)
+        if self._length > _MAX_LINE_CHARS:
+            prefix = self._prefix
+            self._flush()
+            self._prefix = prefix
+
+
+def html_to_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Yield newline-terminated text lines from HTML supplied in arbitrary chunks."""
+    converter = HtmlLineConverter()
+    for chunk in chunks:
+        yield from converter.feed(chunk)
+    yield from converter.close()
+
+
+def looks_like_html(text: str) -> bool:
+    return bool(_HTML_RE.search(text[:5000]))
+
+
+def as_vacancy_text(text: str) -> str:
+    """Return ``text`` as extractor-ready lines, converting it first if it is HTML."""
+    return "".join(html_to_lines((text,))) if looks_like_html(text) else text
@@ -0,0 +1,55 @@
+"""Locate the part of an edited advert that needs re-extracting.
+
+Every section after the first opens with a heading, and the heading alone sets
+the extractor's state. So a section whose lines are unchanged extracts exactly
+as before. Only the sections spanning the edited lines are re-run, and items
+grounded in the untouched sections are carried over from the previous result.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from lib.vacancy_extraction import vacancy_sections
+
+
+def _section_starts(lines: list[str]) -> list[int]:
+    starts: list[int] = []
+    offset = 0
+    for section in vacancy_sections("\n".join(lines)):
+        starts.append(offset)
+        offset += len(section["lines"])
+    return starts or [0]
+
+
+def changed_region(old_lines: list[str], new_lines: list[str]) -> tuple[int, int] | None:
+    """Return the ``[start, end)`` span of ``new_lines`` to re-extract, or None if unchanged.
+
+    The span covers the edited lines widened to whole sections of the new text.
+    """
+    if old_lines == new_lines:
+        return None
+    limit = min(len(old_lines), len(new_lines))
+    prefix = 0
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+    changed_end = len(new_lines) - suffix
+
+    starts = _section_starts(new_lines)
+    start = max(offset for offset in starts if offset <= prefix)
+    end = next((offset for offset in starts if offset > start and offset >= max(changed_end, prefix + 1)), len(new_lines))
+    return start, end
+
+
+def _grounded_in(item: dict[str, Any], text: str) -> bool:
+    source = " ".join(str(item.get("source_text", "")).lower().split())
+    return bool(source) and source in text
+
+
+def carried_items(items: list[dict[str, Any]], unchanged_lines: list[str]) -> list[dict[str, Any]]:
+    """Previous items whose source text lies wholly inside the unchanged lines."""
+    text = " ".join(" ".join(unchanged_lines).lower().split())
+    return [item for item in items if _grounded_in(item, text)]
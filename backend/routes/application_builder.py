@@ -2,23 +2,38 @@
 
 from __future__ import annotations
 
-import re
-from typing import Any, Literal
+from collections.abc import Iterator
+import json
+from typing import Annotated, Any, Literal
 
-from fastapi import APIRouter, Header
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, field_validator
 
-from lib.application_ai import semantic_application_draft
-from lib.application_draft import coverage, deterministic_draft
+from lib.application_ai import (
+    grouped_semantic_application_draft,
+    semantic_application_draft,
+    stream_semantic_application_draft,
+)
+from lib.application_bulk import bulk_draft, load_evidence_cards
+from lib.application_draft import (
+    DETERMINISTIC_PROVIDER,
+    compose_draft,
+    coverage,
+    deterministic_draft,
+    draft_warnings,
+    normalise_paragraphs,
+    supported_requirement,
+)
+from lib.application_draft_store import card_fingerprint, load_draft, save_draft
+from lib.application_grounding import GroundingIndex, validate_ai_paragraph_detailed
+from lib.application_trim import trim_to_word_limit
+from lib.job_queue import get_job_queue, register_job_handler
+from lib.settings import settings
 from routes.saved_jobs import verify_supabase_user
 
 router = APIRouter(prefix="/application-builder", tags=["application_builder"])
 
-_META_VERBS = r"demonstrates|shows|illustrates|supports|underpins|evidences|addresses|highlights"
-_META_COMMENTARY_RE = re.compile(
-    rf"(?i)\(?\s*(?:this paragraph|this evidence|this example|the above)\s+(?:{_META_VERBS})\b[^.!?)]*(?:[.!?]\s*\)?|\))?"
-)
-
 
 class ApplicationRequirement(BaseModel):
     text: str
@@ -46,93 +61,54 @@ class ApplicationBuilderRequest(BaseModel):
     job: dict[str, Any] = Field(default_factory=dict)
     application_type: Literal["statement_of_suitability", "criteria_response"] = "statement_of_suitability"
     word_limit: int = Field(default=500, ge=150, le=1500)
+    # Several limits produce one generation at the largest, trimmed to each smaller one.
+    word_limits: list[Annotated[int, Field(ge=150, le=1500)]] = Field(default_factory=list, max_length=5)
     requirements: list[ApplicationRequirement] = Field(default_factory=list)
     evidence_cards: list[ApplicationEvidence] = Field(default_factory=list)
+    previous_draft_id: str | None = Field(default=None, max_length=100)
+    # "per_group" drafts each evidence group in its own concurrent model call.
+    drafting_mode: Literal["single", "per_group"] = "single"
 
 
-def _clean_meta_commentary(text: str) -> str:
-    """Remove assessor-facing narration while preserving the candidate's evidence prose."""
-    cleaned = _META_COMMENTARY_RE.sub("", text)
-    cleaned = re.sub(r"\s+([,.;:!?])", r"\1", cleaned)
-    cleaned = re.sub(r"[ \t]{2,}", " ", cleaned)
-    return cleaned.strip(" \t\n;,-")
-
-
-def _normalise_paragraphs(paragraphs: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    normalised: list[dict[str, Any]] = []
-    for paragraph in paragraphs:
-        item = dict(paragraph)
-        text = _clean_meta_commentary(str(item.get("text", "")))
-        if not text:
-            continue
-        item["text"] = text
-        normalised.append(item)
-    return normalised
+_SEMANTIC_PROVIDER = "openai-grounded-v1"
 
 
-def _compose_draft(paragraphs: list[dict[str, Any]]) -> str:
-    """Compose only evidence-bearing prose; avoid generic opening/closing filler."""
-    return "\n\n".join(paragraph["text"].strip() for paragraph in paragraphs if paragraph.get("text", "").strip())
+def _role_title(job: dict[str, Any]) -> str:
+    return str(job.get("title", "the role") or "the role").strip()[:300]
 
 
-@router.post("")
-async def build_application(
-    request: ApplicationBuilderRequest,
-    authorization: str | None = Header(None),
-) -> dict[str, Any]:
-    await verify_supabase_user(authorization)
-
-    role_title = str(request.job.get("title", "the role") or "the role").strip()[:300]
+def _draft_inputs(request: ApplicationBuilderRequest) -> tuple[str, str, dict[str, ApplicationEvidence]]:
+    role_title = _role_title(request.job)
     organisation = str(request.job.get("organisation", request.job.get("company", "")) or "").strip()[:300]
     cards_by_id = {card.id: card for card in request.evidence_cards if card.id}
+    return role_title, organisation, cards_by_id
+
 
-    paragraphs, semantic_status = semantic_application_draft(
+def _deterministic_paragraphs(
+    request: ApplicationBuilderRequest,
+    cards_by_id: dict[str, ApplicationEvidence],
+    role_title: str,
+) -> list[dict[str, Any]]:
+    paragraphs = deterministic_draft(
         request.requirements,
         cards_by_id,
         role_title,
-        organisation,
-        request.application_type,
-        request.word_limit,
+        word_limit=request.word_limit,
     )
-    if paragraphs:
-        paragraphs = _normalise_paragraphs(paragraphs)
-    provider = "openai-grounded-v1" if paragraphs else "deterministic-grounded-v2"
-    fallback_reason: str | None = None if paragraphs else semantic_status
+    return normalise_paragraphs(paragraphs)
 
-    semantic_draft = _compose_draft(paragraphs or [])
-    if paragraphs and len(semantic_draft.split()) > request.word_limit:
-        fallback_reason = "semantic_over_word_limit"
-        paragraphs = None
-
-    if not paragraphs:
-        paragraphs = deterministic_draft(
-            request.requirements,
-            cards_by_id,
-            role_title,
-            word_limit=request.word_limit,
-        )
-        paragraphs = _normalise_paragraphs(paragraphs)
-        provider = "deterministic-grounded-v2"
 
+def _draft_result(
+    request: ApplicationBuilderRequest,
+    paragraphs: list[dict[str, Any]],
+    provider: str,
+    fallback_reason: str | None,
+) -> dict[str, Any]:
     requirement_coverage = coverage(request.requirements, paragraphs)
-    draft = _compose_draft(paragraphs)
+    draft = compose_draft(paragraphs)
     total_words = len(draft.split()) if draft else 0
 
-    warnings: list[str] = []
-    for item in requirement_coverage:
-        if item["category"] == "essential" and item["status"] == "evidence-gap":
-            warnings.append(f"Essential requirement not drafted because supporting evidence is insufficient: {item['requirement']}")
-        elif item["category"] == "essential" and item["status"] == "partially-covered":
-            warnings.append(f"Partial evidence is being used for this essential requirement and should be reviewed carefully: {item['requirement']}")
-    if total_words > request.word_limit:
-        warnings.append(f"Draft is {total_words} words, above the requested {request.word_limit}-word limit. Edit before submitting.")
-    elif paragraphs and request.word_limit >= 300 and total_words < int(request.word_limit * 0.65):
-        warnings.append(
-            f"Draft uses only {total_words} of {request.word_limit} available words. "
-            "If more verified evidence is available, strengthen the Evidence Bank rather than padding the statement with unsupported detail."
-        )
-    if not paragraphs:
-        warnings.append("No Strong or Partial matched evidence is available to build a supported draft.")
+    warnings = draft_warnings(requirement_coverage, paragraphs, request.word_limit, total_words)
 
     return {
         "ok": True,
@@ -147,3 +123,409 @@ async def build_application(
         "coverage": requirement_coverage,
         "warnings": warnings,
     }
+
+
+def _draft_snapshot(
+    request: ApplicationBuilderRequest,
+    role_title: str,
+    organisation: str,
+    cards_by_id: dict[str, ApplicationEvidence],
+) -> dict[str, Any]:
+    """The inputs a stored draft depends on, compared field by field on a redraft."""
+    return {
+        "role_title": role_title,
+        "organisation": organisation,
+        "application_type": request.application_type,
+        "requirements": [requirement.model_dump() for requirement in request.requirements],
+        "cards": {evidence_id: card_fingerprint(card) for evidence_id, card in cards_by_id.items()},
+    }
+
+
+def _reusable_paragraphs(
+    previous: dict[str, Any],
+    snapshot: dict[str, Any],
+    cards_by_id: dict[str, ApplicationEvidence],
+) -> list[dict[str, Any]] | None:
+    """Previous semantic paragraphs untouched by the edit, or None when nothing can be reused.
+
+    A paragraph survives only if every requirement it answers is unchanged
+    (text, category, strength and evidence mapping), every card it cites is
+    unchanged, and it still validates against the current cards.
+    """
+    before = previous.get("snapshot") or {}
+    if previous.get("provider") != _SEMANTIC_PROVIDER:
+        return None
+    if any(before.get(key) != snapshot[key] for key in ("role_title", "organisation", "application_type")):
+        return None
+
+    old_requirements = before.get("requirements") or []
+    current = snapshot["requirements"]
+    unchanged = {
+        index for index, requirement in enumerate(current)
+        if index < len(old_requirements) and old_requirements[index] == requirement
+    }
+    old_cards = before.get("cards") or {}
+    grounding = GroundingIndex(cards_by_id)
+    kept: list[dict[str, Any]] = []
+    for paragraph in previous.get("paragraphs") or []:
+        indices = paragraph.get("requirement_indices") or []
+        evidence_ids = paragraph.get("evidence_ids") or []
+        if not indices or any(index not in unchanged for index in indices):
+            continue
+        if any(evidence_id not in old_cards or old_cards[evidence_id] != snapshot["cards"].get(evidence_id) for evidence_id in evidence_ids):
+            continue
+        validated, _reason = validate_ai_paragraph_detailed(paragraph, cards_by_id, len(current), grounding)
+        if validated is not None:
+            kept.append({**paragraph, **validated})
+    return kept or None
+
+
+def _semantic_paragraphs(
+    request: ApplicationBuilderRequest,
+    cards_by_id: dict[str, ApplicationEvidence],
+    role_title: str,
+    organisation: str,
+    word_limit: int,
+    only_indices: set[int] | None = None,
+) -> tuple[list[dict[str, Any]] | None, str]:
+    paragraphs, status = semantic_application_draft(
+        request.requirements,
+        cards_by_id,
+        role_title,
+        organisation,
+        request.application_type,
+        word_limit,
+        only_indices=only_indices,
+    )
+    return (normalise_paragraphs(paragraphs) if paragraphs else paragraphs), status
+
+
+# Fewer words than this left after the kept paragraphs is too little for a useful
+# new paragraph, so the whole statement is redrafted instead.
+_MIN_REDRAFT_WORDS = 60
+
+
+def _partial_redraft_fits(request: ApplicationBuilderRequest, kept: list[dict[str, Any]]) -> bool:
+    remaining_words = request.word_limit - len(compose_draft(kept).split())
+    covered = {index for paragraph in kept for index in paragraph["requirement_indices"]}
+    pending = any(
+        supported_requirement(requirement)
+        for index, requirement in enumerate(request.requirements)
+        if index not in covered
+    )
+    return remaining_words >= (_MIN_REDRAFT_WORDS if pending else 0)
+
+
+def _redraft_changed(
+    request: ApplicationBuilderRequest,
+    cards_by_id: dict[str, ApplicationEvidence],
+    role_title: str,
+    organisation: str,
+    kept: list[dict[str, Any]],
+) -> tuple[list[dict[str, Any]] | None, str, dict[str, int]]:
+    """Ask the model only for requirements the kept paragraphs no longer cover."""
+    covered = {index for paragraph in kept for index in paragraph["requirement_indices"]}
+    remaining_words = request.word_limit - len(compose_draft(kept).split())
+    pending = set(range(len(request.requirements))) - covered
+    fresh: list[dict[str, Any]] = []
+    status = "ok"
+    if pending and remaining_words > 0:
+        drafted, status = _semantic_paragraphs(request, cards_by_id, role_title, organisation, remaining_words, pending)
+        if drafted is None and status != "no_supported_requirements":
+            return None, status, {}
+        fresh = drafted or []
+    paragraphs = sorted(kept + fresh, key=lambda paragraph: min(paragraph["requirement_indices"]))
+    return paragraphs, "ok", {"reused": len(kept), "redrafted": len(fresh)}
+
+
+def _variants(
+    request: ApplicationBuilderRequest,
+    longest: dict[str, Any],
+    cards_by_id: dict[str, ApplicationEvidence],
+    role_title: str,
+) -> list[dict[str, Any]]:
+    """Derive a draft for every requested limit from the longest one, smallest first.
+
+    A semantic draft is trimmed sentence by sentence with the usual grounding
+    checks; a limit it cannot be trimmed to gets the deterministic draft instead.
+    """
+    variants: list[dict[str, Any]] = []
+    for word_limit in sorted(set(request.word_limits)):
+        variant_request = request.model_copy(update={"word_limit": word_limit})
+        provider, fallback_reason = longest["provider"], longest["fallback_reason"]
+        if word_limit == request.word_limit:
+            paragraphs = longest["paragraphs"]
+        elif provider == _SEMANTIC_PROVIDER:
+            paragraphs = trim_to_word_limit(longest["paragraphs"], request.requirements, cards_by_id, word_limit)
+            if not paragraphs:
+                provider, fallback_reason = DETERMINISTIC_PROVIDER, "semantic_over_word_limit"
+                paragraphs = _deterministic_paragraphs(variant_request, cards_by_id, role_title)
+        else:
+            paragraphs = _deterministic_paragraphs(variant_request, cards_by_id, role_title)
+        variants.append(_draft_result(variant_request, paragraphs, provider, fallback_reason))
+    return variants
+
+
+def _build_application(request: ApplicationBuilderRequest, owner: str | None = None) -> dict[str, Any]:
+    """Draft the statement; with an owner it is stored, and ``previous_draft_id`` enables a partial redraft.
+
+    With ``word_limits`` the draft is generated once at the largest limit and
+    returned with a ``variants`` list holding one result per limit.
+    """
+    if request.word_limits:
+        request = request.model_copy(update={"word_limit": max(request.word_limits)})
+    role_title, organisation, cards_by_id = _draft_inputs(request)
+    snapshot = _draft_snapshot(request, role_title, organisation, cards_by_id)
+
+    kept: list[dict[str, Any]] | None = None
+    if owner and request.previous_draft_id:
+        previous = load_draft(request.previous_draft_id, owner)
+        if previous is not None:
+            kept = _reusable_paragraphs(previous, snapshot, cards_by_id)
+        if kept and not _partial_redraft_fits(request, kept):
+            kept = None
+
+    incremental: dict[str, int] | None = None
+    fallback_groups: int | None = None
+    if kept:
+        paragraphs, semantic_status, incremental = _redraft_changed(request, cards_by_id, role_title, organisation, kept)
+    elif request.drafting_mode == "per_group":
+        paragraphs, semantic_status, fallback_groups = grouped_semantic_application_draft(
+            request.requirements,
+            cards_by_id,
+            role_title,
+            organisation,
+            request.application_type,
+            request.word_limit,
+        )
+        paragraphs = normalise_paragraphs(paragraphs) if paragraphs else paragraphs
+    else:
+        paragraphs, semantic_status = _semantic_paragraphs(request, cards_by_id, role_title, organisation, request.word_limit)
+    provider = _SEMANTIC_PROVIDER if paragraphs else DETERMINISTIC_PROVIDER
+    fallback_reason: str | None = None if paragraphs else semantic_status
+
+    semantic_draft = compose_draft(paragraphs or [])
+    if paragraphs and len(semantic_draft.split()) > request.word_limit:
+        paragraphs = trim_to_word_limit(paragraphs, request.requirements, cards_by_id, request.word_limit)
+        if not paragraphs:
+            fallback_reason = "semantic_over_word_limit"
+
+    if not paragraphs:
+        paragraphs = _deterministic_paragraphs(request, cards_by_id, role_title)
+        provider = DETERMINISTIC_PROVIDER
+        incremental = None
+        fallback_groups = None
+
+    result = _draft_result(request, paragraphs, provider, fallback_reason)
+    result["incremental"] = incremental
+    result["fallback_groups"] = fallback_groups
+    if request.word_limits:
+        result["variants"] = _variants(request, result, cards_by_id, role_title)
+    result["draft_id"] = save_draft(owner, snapshot, provider, paragraphs, result.get("variants")) if owner else None
+    return result
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _stream_application(request: ApplicationBuilderRequest) -> Iterator[str]:
+    """Emit each grounded paragraph as soon as it validates, then a closing summary.
+
+    Paragraphs already sent cannot be withdrawn, so one that would push the draft
+    over the word limit is trimmed to the remaining budget, or skipped when no
+    grounded trim fits, rather than triggering a whole-draft fallback.
+    The deterministic drafter is only used when no semantic paragraph survives.
+    """
+    role_title, organisation, cards_by_id = _draft_inputs(request)
+    paragraphs: list[dict[str, Any]] = []
+    used_words = 0
+    skipped_over_limit = False
+    semantic_status = "empty_model_output"
+
+    for kind, value in stream_semantic_application_draft(
+        request.requirements,
+        cards_by_id,
+        role_title,
+        organisation,
+        request.application_type,
+        request.word_limit,
+    ):
+        if kind == "status":
+            semantic_status = value
+            continue
+        for paragraph in normalise_paragraphs([value]):
+            words = len(paragraph["text"].split())
+            if used_words + words > request.word_limit:
+                fitted = trim_to_word_limit([paragraph], request.requirements, cards_by_id, request.word_limit - used_words)
+                if not fitted:
+                    skipped_over_limit = True
+                    continue
+                paragraph = fitted[0]
+                words = len(paragraph["text"].split())
+            used_words += words
+            paragraphs.append(paragraph)
+            yield _sse("paragraph", {"index": len(paragraphs) - 1, **paragraph})
+
+    provider = _SEMANTIC_PROVIDER
+    fallback_reason: str | None = None
+    if not paragraphs:
+        provider = DETERMINISTIC_PROVIDER
+        fallback_reason = "semantic_over_word_limit" if skipped_over_limit else semantic_status
+        for paragraph in _deterministic_paragraphs(request, cards_by_id, role_title):
+            paragraphs.append(paragraph)
+            yield _sse("paragraph", {"index": len(paragraphs) - 1, **paragraph})
+
+    result = _draft_result(request, paragraphs, provider, fallback_reason)
+    result.pop("paragraphs")
+    result.pop("draft")
+    yield _sse("done", result)
+
+
+@router.post("")
+async def build_application(
+    request: ApplicationBuilderRequest,
+    authorization: str | None = Header(None),
+) -> dict[str, Any]:
+    user = await verify_supabase_user(authorization)
+    return _build_application(request, owner=user["id"])
+
+
+@router.post("/stream")
+async def stream_application(
+    request: ApplicationBuilderRequest,
+    authorization: str | None = Header(None),
+) -> StreamingResponse:
+    """Stream the draft as server-sent events: one ``paragraph`` per section, then ``done``."""
+    await verify_supabase_user(authorization)
+    return StreamingResponse(
+        _stream_application(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+_JOB_KIND = "application_draft"
+
+
+class BulkDraft(BaseModel):
+    id: str = Field(min_length=1, max_length=200)
+    job: dict[str, Any] = Field(default_factory=dict)
+    application_type: Literal["statement_of_suitability", "criteria_response"] = "statement_of_suitability"
+    word_limit: int = Field(default=500, ge=150, le=1500)
+    requirements: list[ApplicationRequirement] = Field(default_factory=list)
+    # Cards this draft may use; empty means every card its requirements reference.
+    evidence_ids: list[str] = Field(default_factory=list)
+
+    def allowed_evidence_ids(self) -> set[str]:
+        if self.evidence_ids:
+            return set(self.evidence_ids)
+        return {evidence_id for requirement in self.requirements for evidence_id in requirement.evidence_ids}
+
+
+class BulkDraftRequest(BaseModel):
+    drafts: list[BulkDraft] = Field(min_length=1, max_length=200)
+    semantic_limit: int = Field(default=0, ge=0)
+
+    @field_validator("drafts")
+    @classmethod
+    def _unique_ids(cls, drafts: list[BulkDraft]) -> list[BulkDraft]:
+        # Results, cards and semantic payloads are matched back to drafts by id.
+        seen: set[str] = set()
+        for draft in drafts:
+            if draft.id in seen:
+                raise ValueError(f"duplicate draft id: {draft.id}")
+            seen.add(draft.id)
+        return drafts
+
+
+def _ndjson(data: dict[str, Any]) -> bytes:
+    return (json.dumps(data, ensure_ascii=False) + "\n").encode()
+
+
+def _bulk_draft_lines(request: BulkDraftRequest, owner: str) -> Iterator[bytes]:
+    cards = load_evidence_cards(owner, {evidence_id for draft in request.drafts for evidence_id in draft.allowed_evidence_ids()})
+    cards_by_draft = {
+        draft.id: {evidence_id: cards[evidence_id] for evidence_id in sorted(draft.allowed_evidence_ids()) if evidence_id in cards}
+        for draft in request.drafts
+    }
+    entries = [
+        (draft.id, _role_title(draft.job), draft.word_limit, [requirement.model_dump() for requirement in draft.requirements], cards_by_draft[draft.id])
+        for draft in request.drafts
+    ]
+    drafts = {draft.id: draft for draft in request.drafts}
+    semantic_limit = min(request.semantic_limit, settings.BULK_SEMANTIC_LIMIT)
+    total = failures = queued = 0
+    for result in bulk_draft(entries, workers=settings.BULK_DRAFT_WORKERS):
+        total += 1
+        failures += not result["ok"]
+        if result["ok"] and result["can_generate"] and queued < semantic_limit:
+            draft = drafts[result["id"]]
+            payload = ApplicationBuilderRequest(
+                job=draft.job,
+                application_type=draft.application_type,
+                word_limit=draft.word_limit,
+                requirements=draft.requirements,
+                evidence_cards=[
+                    ApplicationEvidence(**{key: value for key, value in row.items() if value is not None})
+                    for row in cards_by_draft[draft.id].values()
+                ],
+            )
+            job, _created = get_job_queue().submit(_JOB_KIND, owner, payload.model_dump())
+            result["semantic_job_id"] = job["id"]
+            queued += 1
+        yield _ndjson({"type": "result", **result})
+    yield _ndjson({"type": "done", "total": total, "failed": failures})
+
+
+@router.post("/bulk")
+async def bulk_build_applications(
+    request: BulkDraftRequest,
+    authorization: str | None = Header(None),
+) -> StreamingResponse:
+    """Draft many applications deterministically from the user's stored Evidence Cards, streaming NDJSON.
+
+    Cards are loaded once for the whole batch and each draft produces one
+    ``result`` line in input order. Up to ``semantic_limit`` drafts are also
+    queued for a semantic upgrade, polled via ``GET /application-builder/jobs/{job_id}``.
+    """
+    user = await verify_supabase_user(authorization)
+    return StreamingResponse(_bulk_draft_lines(request, user["id"]), media_type="application/x-ndjson")
+
+
+def _run_application_job(payload: dict[str, Any]) -> dict[str, Any]:
+    return _build_application(ApplicationBuilderRequest(**payload))
+
+
+register_job_handler(_JOB_KIND, _run_application_job)
+
+
+@router.post("/jobs", status_code=202)
+async def submit_application_job(
+    request: ApplicationBuilderRequest,
+    authorization: str | None = Header(None),
+) -> dict[str, Any]:
+    """Queue a draft for background generation; identical payloads share one job."""
+    user = await verify_supabase_user(authorization)
+    job, created = get_job_queue().submit(_JOB_KIND, user["id"], request.model_dump())
+    return {"ok": True, "job_id": job["id"], "status": job["status"], "deduplicated": not created}
+
+
+@router.get("/jobs/{job_id}")
+async def application_job_status(
+    job_id: str,
+    authorization: str | None = Header(None),
+) -> dict[str, Any]:
+    user = await verify_supabase_user(authorization)
+    job = get_job_queue().get(job_id, owner=user["id"])
+    if job is None or job["kind"] != _JOB_KIND:
+        raise HTTPException(status_code=404, detail="Application job not found")
+    return {
+        "ok": True,
+        "job_id": job["id"],
+        "status": job["status"],
+        "result": job["result"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
@@ -2,15 +2,25 @@
 
 from __future__ import annotations
 
+import codecs
+import csv
+import json
+import logging
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
 from datetime import datetime, timezone
 from typing import Any
 
-from fastapi import APIRouter, Header, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Header, HTTPException, Request
+from pydantic import BaseModel, Field, ValidationError
+from starlette.concurrency import run_in_threadpool
 
+from lib.settings import settings
 from lib.supabase import get_supabase_client
 from routes.saved_jobs import verify_supabase_user
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/evidence", tags=["evidence_bank"])
 
 
@@ -55,7 +65,7 @@ class EvidenceResponse(EvidenceBase):
     updated_at: datetime | str | None = None
 
 
-_VACANCY_MARKERS = (
+_SECTION_MARKERS = frozenset({
     "role summary",
     "job summary",
     "essential criteria",
@@ -64,14 +74,18 @@ _VACANCY_MARKERS = (
     "trainable requirements",
     "practical requirements",
     "eligibility",
+})
+_CANDIDATE_MARKERS = frozenset({
     "successful candidate",
     "successful applicant",
     "applicants must",
     "we are looking for",
+})
+_VACANCY_MARKERS = _SECTION_MARKERS | _CANDIDATE_MARKERS | {
     "application closing date",
     "salary minimum",
     "salary maximum",
-)
+}
 
 
 def _combined_evidence_text(payload: dict[str, Any]) -> str:
@@ -84,35 +98,36 @@ def _combined_evidence_text(payload: dict[str, Any]) -> str:
     return "\n".join(values).lower()
 
 
+def _is_vacancy_match(matches: set[str]) -> bool:
+    return len(matches) >= 3 or (
+        len(matches & _SECTION_MARKERS) >= 2 and bool(matches & _CANDIDATE_MARKERS)
+    )
+
+
+def _vacancy_flags(payloads: list[dict[str, Any]]) -> list[bool]:
+    """Flag each payload that looks like a pasted vacancy advert.
+
+    Markers are first searched for once across the whole batch; only those that
+    occur anywhere are then checked card by card. Genuine evidence rarely
+    contains any marker, so a clean import costs one substring scan per marker.
+    """
+    texts = [_combined_evidence_text(payload) for payload in payloads]
+    # Joined on a character no marker contains, so no match spans two cards.
+    joined = "\x00".join(texts)
+    present = [marker for marker in _VACANCY_MARKERS if marker in joined]
+    return [_is_vacancy_match({marker for marker in present if marker in text}) for text in texts]
+
+
 def _looks_like_vacancy_text(payload: dict[str, Any]) -> bool:
     """Detect obvious job adverts accidentally pasted into the Evidence Bank.
 
     This is intentionally conservative: one phrase such as "successful candidate"
     is not enough. Multiple advert-section/candidate markers must be present before
-    the save is rejected.
+    the save is rejected. Bulk imports use ``_vacancy_flags``, which applies the
+    same markers and rule to many cards at once.
     """
-
     text = _combined_evidence_text(payload)
-    matches = {marker for marker in _VACANCY_MARKERS if marker in text}
-    section_markers = {
-        "role summary",
-        "job summary",
-        "essential criteria",
-        "essential requirements",
-        "desirable criteria",
-        "trainable requirements",
-        "practical requirements",
-        "eligibility",
-    }
-    candidate_markers = {
-        "successful candidate",
-        "successful applicant",
-        "applicants must",
-        "we are looking for",
-    }
-    return len(matches) >= 3 or (
-        len(matches & section_markers) >= 2 and bool(matches & candidate_markers)
-    )
+    return _is_vacancy_match({marker for marker in _VACANCY_MARKERS if marker in text})
 
 
 def _reject_vacancy_contamination(payload: dict[str, Any]) -> None:
@@ -163,6 +178,242 @@ async def create_evidence(
     return EvidenceResponse(**row)
 
 
+_MAX_IMPORT_BYTES = 5_000_000
+_MAX_IMPORT_ROWS = 1000
+_LIST_FIELDS = ("actions", "tags", "behaviours", "skills")
+_IMPORT_FORMAT_ERROR = "Import must be a JSON array or CSV with a header row"
+
+
+class _ImportStopped(Exception):
+    """The upload cannot be read past this point; rows already read still count."""
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+async def _decoded_chunks(request: Request) -> AsyncIterator[str]:
+    """Decode the upload as it arrives, stopping once it is known to exceed ``_MAX_IMPORT_BYTES``."""
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > _MAX_IMPORT_BYTES:
+        raise _ImportStopped(413, "Import file is too large")
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > _MAX_IMPORT_BYTES:
+            raise _ImportStopped(413, "Import file is too large")
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _csv_record(header: list[str], values: list[str]) -> dict[str, Any]:
+    """One spreadsheet row; list cells hold one entry per line or ``|``-separated."""
+    record: dict[str, Any] = {}
+    for key, value in zip(header, values):
+        if not key or not value.strip():
+            continue
+        if key in _LIST_FIELDS:
+            record[key] = [item.strip() for item in value.replace("|", "\n").splitlines() if item.strip()]
+        else:
+            record[key] = value.strip()
+    return record
+
+
+async def _csv_rows(chunks: AsyncIterator[str]) -> AsyncIterator[dict[str, Any]]:
+    """Parse CSV records as soon as their last line arrives.
+
+    Quotes are doubled inside quoted cells, so a run of lines with an even
+    number of quote characters always ends on a record boundary; only such runs
+    are handed to the reader, which therefore never waits on a partial record.
+    """
+    complete: deque[str] = deque()
+    reader = csv.reader(iter(complete.popleft, None))
+    header: list[str] | None = None
+    partial = ""
+    pending: list[str] = []
+    quotes = 0
+
+    def records() -> Iterator[list[str]]:
+        while complete:
+            yield next(reader)
+
+    async for text in chunks:
+        *lines, partial = (partial + text).split("\n")
+        for line in lines:
+            line += "\n"
+            pending.append(line)
+            quotes += line.count('"')
+            if quotes % 2 == 0:
+                complete.append("".join(pending))
+                pending, quotes = [], 0
+        for values in records():
+            if header is None:
+                header = [key.strip().lower() for key in values]
+            elif values:
+                yield _csv_record(header, values)
+    if partial or pending:
+        complete.append("".join(pending) + partial)
+        for values in records():
+            if header is None:
+                header = [key.strip().lower() for key in values]
+            elif values:
+                yield _csv_record(header, values)
+
+
+async def _json_rows(chunks: AsyncIterator[str]) -> AsyncIterator[Any]:
+    """Yield the elements of a JSON array one at a time as the upload arrives."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+    finished = False
+    stream = chunks.__aiter__()
+    final = False
+    while not finished:
+        if not final:
+            try:
+                buffer = buffer[position:] + await stream.__anext__()
+                position = 0
+            except StopAsyncIteration:
+                final = True
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                if buffer[position] == "," and not started:
+                    raise _ImportStopped(400, _IMPORT_FORMAT_ERROR)
+                position += 1
+            if position >= len(buffer):
+                break
+            if not started:
+                if buffer[position] != "[":
+                    raise _ImportStopped(400, _IMPORT_FORMAT_ERROR)
+                started = True
+                position += 1
+                continue
+            if buffer[position] == "]":
+                finished = True
+                break
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if final:
+                    raise _ImportStopped(400, _IMPORT_FORMAT_ERROR)
+                break
+            if end == len(buffer) and not final:
+                # A number or literal may continue in the next chunk.
+                break
+            position = end
+            yield element
+        if final and not finished:
+            raise _ImportStopped(400, _IMPORT_FORMAT_ERROR)
+
+
+def _validation_error(exc: ValidationError) -> str:
+    first = exc.errors()[0]
+    field = ".".join(str(part) for part in first.get("loc", ())) or "row"
+    return f"invalid {field}: {first.get('msg', 'invalid value')}"
+
+
+def _insert_cards(payloads: list[tuple[int, dict[str, Any]]]) -> dict[int, dict[str, Any]]:
+    """Insert cards in one round trip, halving a failed batch until the rejected rows are isolated."""
+    try:
+        result = _db().table("evidence_cards").insert([payload for _, payload in payloads]).execute()
+    except Exception:
+        logger.warning("Evidence import insert of %d cards failed", len(payloads), exc_info=True)
+        if len(payloads) == 1:
+            number = payloads[0][0]
+            return {number: {"row": number, "ok": False, "error": "insert_failed"}}
+        middle = len(payloads) // 2
+        return {**_insert_cards(payloads[:middle]), **_insert_cards(payloads[middle:])}
+    inserted = getattr(result, "data", None) or []
+    if len(inserted) != len(payloads):
+        # Rows may or may not have been written, so they are not retried.
+        return {number: {"row": number, "ok": False, "error": "persistence_unavailable"} for number, _ in payloads}
+    return {
+        number: {"row": number, "ok": True, "id": str(row.get("id"))}
+        for (number, _payload), row in zip(payloads, inserted)
+    }
+
+
+def _import_batch(rows: list[tuple[int, Any]], owner: str) -> list[dict[str, Any]]:
+    """Validate, screen and insert one batch, returning a result per row in order."""
+    results: dict[int, dict[str, Any]] = {}
+    valid: list[tuple[int, dict[str, Any]]] = []
+    for number, row in rows:
+        if not isinstance(row, dict):
+            results[number] = {"row": number, "ok": False, "error": "invalid row: expected an object"}
+            continue
+        try:
+            valid.append((number, EvidenceCreate(**row).model_dump()))
+        except ValidationError as exc:
+            results[number] = {"row": number, "ok": False, "error": _validation_error(exc)}
+
+    payloads: list[tuple[int, dict[str, Any]]] = []
+    for (number, payload), contaminated in zip(valid, _vacancy_flags([payload for _, payload in valid])):
+        if contaminated:
+            results[number] = {"row": number, "ok": False, "error": "looks_like_vacancy_advert"}
+        else:
+            payloads.append((number, {**payload, "user_id": owner}))
+    if payloads:
+        results.update(_insert_cards(payloads))
+    return [results[number] for number, _ in rows]
+
+
+@router.post("/import")
+async def import_evidence(
+    request: Request,
+    authorization: str | None = Header(None),
+) -> dict[str, Any]:
+    """Import many Evidence Cards from a JSON array or a CSV upload (``text/csv``).
+
+    The upload is parsed as it arrives and every ``EVIDENCE_IMPORT_BATCH_SIZE``
+    rows are validated, screened for pasted vacancy text like single cards and
+    inserted together, so memory stays bounded by one batch. Every row gets a
+    result, numbered from 1 in input order; a bad row never blocks the rest. If
+    the upload breaks off part way (malformed, or over the size or row limits)
+    the rows before that point are still imported and ``stopped`` says why.
+    """
+    user = await verify_supabase_user(authorization)
+    chunks = _decoded_chunks(request)
+    if request.headers.get("content-type", "").startswith("text/csv"):
+        rows: AsyncIterator[Any] = _csv_rows(chunks)
+    else:
+        rows = _json_rows(chunks)
+
+    batch_size = max(1, settings.EVIDENCE_IMPORT_BATCH_SIZE)
+    results: list[dict[str, Any]] = []
+    batch: list[tuple[int, Any]] = []
+    stopped: str | None = None
+    try:
+        async for row in rows:
+            if len(results) + len(batch) >= _MAX_IMPORT_ROWS:
+                raise _ImportStopped(413, f"Import at most {_MAX_IMPORT_ROWS} cards at a time")
+            batch.append((len(results) + len(batch) + 1, row))
+            if len(batch) >= batch_size:
+                results.extend(await run_in_threadpool(_import_batch, batch, user["id"]))
+                batch = []
+    except _ImportStopped as exc:
+        if not results and not batch:
+            raise HTTPException(status_code=exc.status_code, detail=exc.detail)
+        stopped = exc.detail
+    if batch:
+        results.extend(await run_in_threadpool(_import_batch, batch, user["id"]))
+    imported = sum(1 for result in results if result["ok"])
+    return {
+        "ok": True,
+        "total": len(results),
+        "imported": imported,
+        "failed": len(results) - imported,
+        "stopped": stopped,
+        "results": results,
+    }
+
+
 @router.patch("/{evidence_id}", response_model=EvidenceResponse)
 async def update_evidence(
     evidence_id: str,
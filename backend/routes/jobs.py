@@ -1,9 +1,11 @@
 """Job listing routes for JobSleuth AI backend."""
 
-from typing import Optional
+from typing import Any, Optional
 from fastapi import APIRouter, Query, HTTPException
 from pydantic import BaseModel
 
+from lib.vacancy_extraction import EXTRACTOR_VERSION, grouped_extraction
+
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
 
@@ -22,6 +24,7 @@ class JobResponse(BaseModel):
     ai_score: Optional[float] = None
     date_posted: Optional[str] = None
     description: Optional[str] = None
+    requirements: Optional[dict[str, Any]] = None
 
 
 class JobListResponse(BaseModel):
@@ -203,5 +206,10 @@ async def get_job(job_id: int) -> JobResponse:
     job = mock_jobs.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    
+
+    # Jobs stored before extraction at ingest, or by an older extractor, are
+    # extracted on read.
+    stale = not job.requirements or job.requirements.get("version") != EXTRACTOR_VERSION
+    if job.description and stale:
+        job = job.model_copy(update={"requirements": grouped_extraction(job.description)})
     return job
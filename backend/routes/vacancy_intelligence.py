@@ -2,21 +2,51 @@
 
 from __future__ import annotations
 
+import codecs
+import json
 import re
+from collections.abc import AsyncIterator, Iterator
 from typing import Any, Literal
 
-from fastapi import APIRouter, Header
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from lib.job_queue import get_job_queue, register_job_handler
+from lib.settings import settings
+from lib.vacancy_ai import EXTRACTOR_VERSION as SEMANTIC_EXTRACTOR_VERSION
 from lib.vacancy_ai import semantic_extract
-from lib.vacancy_extraction import deterministic_extract
+from lib.vacancy_bulk import SEMANTIC_JOB_KIND, job_entries, run_bulk
+from lib.vacancy_cache import load_extraction, load_extraction_by_id, normalised_lines, save_extraction
+from lib.vacancy_extraction import EXTRACTOR_VERSION as DETERMINISTIC_EXTRACTOR_VERSION
+from lib.vacancy_extraction import IncrementalExtractor, deterministic_extract
+from lib.vacancy_html import HtmlLineConverter
+from lib.vacancy_incremental import carried_items, changed_region
 from routes.saved_jobs import verify_supabase_user
 
 router = APIRouter(prefix="/vacancy-intelligence", tags=["vacancy_intelligence"])
 
 
+_MAX_VACANCY_CHARS = 30000
+_MAX_HTML_CHARS = 2_000_000
+# Bump when _reconcile_items changes so persisted extractions are redone.
+_RECONCILER_VERSION = "reconcile-v4"
+
+
 class VacancyIntelligenceRequest(BaseModel):
-    vacancy_text: str = Field(min_length=40, max_length=30000)
+    vacancy_text: str = Field(min_length=40, max_length=_MAX_VACANCY_CHARS)
+    previous_extraction_id: str | None = None
+
+
+class BulkVacancy(BaseModel):
+    id: str
+    vacancy_text: str
+
+
+class BulkExtractionRequest(BaseModel):
+    job_ids: list[str] = Field(default_factory=list, max_length=5000)
+    vacancies: list[BulkVacancy] = Field(default_factory=list, max_length=5000)
+    semantic_limit: int = Field(default=0, ge=0)
 
 
 class ExtractedItem(BaseModel):
@@ -35,20 +65,6 @@ def _normalise(value: str) -> str:
     return re.sub(r"\W+", " ", value.lower()).strip()
 
 
-def _same_text(left: dict[str, Any], right: dict[str, Any]) -> bool:
-    left_text = _normalise(str(left.get("text", "")))
-    right_text = _normalise(str(right.get("text", "")))
-    if not left_text or not right_text:
-        return False
-    return left_text == right_text or left_text in right_text or right_text in left_text
-
-
-def _same_requirement(left: dict[str, Any], right: dict[str, Any]) -> bool:
-    if left.get("category") != right.get("category"):
-        return False
-    return _same_text(left, right)
-
-
 def _is_non_requirement_heading(item: dict[str, Any]) -> bool:
     """Drop obvious advert navigation/section questions, not candidate criteria."""
     text = str(item.get("text", "")).strip()
@@ -60,13 +76,87 @@ def _is_non_requirement_heading(item: dict[str, Any]) -> bool:
     )
 
 
+class _ReconciliationIndex:
+    """Find texts equal to, contained in or containing a query among a growing set of normalised texts.
+
+    Exact matches come from a hash bucket. Containment in either direction goes
+    through q-gram postings: an existing text inside the query must start with
+    one of the query's q-grams, and a container of the query must hold the
+    query's rarest q-gram, so only those candidates are verified with ``in``.
+    Texts shorter than a q-gram fall back to a direct scan. Keys are list
+    positions, so the smallest matching key is the first match in list order.
+    """
+
+    _Q = 3
+
+    def __init__(self) -> None:
+        self._texts: dict[int, str] = {}
+        self._exact: dict[str, set[int]] = {}
+        self._starts: dict[str, set[int]] = {}
+        self._grams: dict[str, set[int]] = {}
+        self._short: set[int] = set()
+
+    def _qgrams(self, text: str) -> set[str]:
+        return {text[start : start + self._Q] for start in range(len(text) - self._Q + 1)}
+
+    def add(self, key: int, text: str) -> None:
+        if not text:
+            return
+        self._texts[key] = text
+        self._exact.setdefault(text, set()).add(key)
+        if len(text) < self._Q:
+            self._short.add(key)
+            return
+        self._starts.setdefault(text[: self._Q], set()).add(key)
+        for gram in self._qgrams(text):
+            self._grams.setdefault(gram, set()).add(key)
+
+    def remove(self, key: int) -> None:
+        text = self._texts.pop(key, None)
+        if text is None:
+            return
+        self._exact[text].discard(key)
+        self._short.discard(key)
+        if len(text) >= self._Q:
+            self._starts[text[: self._Q]].discard(key)
+            for gram in self._qgrams(text):
+                self._grams[gram].discard(key)
+
+    def first_match(self, text: str) -> int | None:
+        if not text:
+            return None
+        found = set(self._exact.get(text, ()))
+
+        # Existing texts contained in the query.
+        found.update(key for key in self._short if self._texts[key] in text)
+        checked: set[int] = set()
+        for gram in self._qgrams(text):
+            for key in self._starts.get(gram, ()):
+                if key not in checked:
+                    checked.add(key)
+                    if self._texts[key] in text:
+                        found.add(key)
+
+        # Existing texts containing the query.
+        if len(text) < self._Q:
+            containers: set[int] = set(self._texts)
+        else:
+            containers = min((self._grams.get(gram, set()) for gram in self._qgrams(text)), key=len)
+        found.update(key for key in containers if text in self._texts[key])
+        return min(found) if found else None
+
+
 def _dedupe_items(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
     deduped: list[dict[str, Any]] = []
+    indexes: dict[Any, _ReconciliationIndex] = {}
     for candidate in items:
         if _is_non_requirement_heading(candidate):
             continue
-        if any(_same_requirement(candidate, existing) for existing in deduped):
+        text = _normalise(str(candidate.get("text", "")))
+        index = indexes.setdefault(candidate.get("category"), _ReconciliationIndex())
+        if index.first_match(text) is not None:
             continue
+        index.add(len(deduped), text)
         deduped.append(candidate)
     return deduped
 
@@ -91,46 +181,55 @@ def _reconcile_items(
         return deterministic_items, "deterministic-v2"
 
     merged = _dedupe_items(semantic_items)
+    index = _ReconciliationIndex()
+    for position, existing in enumerate(merged):
+        index.add(position, _normalise(str(existing.get("text", ""))))
+
     supplemented = False
     for candidate in deterministic_items:
         if _is_non_requirement_heading(candidate):
             continue
 
-        same_text_index = next(
-            (index for index, existing in enumerate(merged) if _same_text(candidate, existing)),
-            None,
-        )
+        text = _normalise(str(candidate.get("text", "")))
+        same_text_index = index.first_match(text)
         if same_text_index is not None:
             existing = merged[same_text_index]
             if existing.get("category") != candidate.get("category"):
                 merged[same_text_index] = candidate
+                index.remove(same_text_index)
+                index.add(same_text_index, text)
                 supplemented = True
             continue
 
+        index.add(len(merged), text)
         merged.append(candidate)
         supplemented = True
 
     return _dedupe_items(merged)[:40], "hybrid-grounded-v4" if supplemented else "openai-grounded-v3"
 
 
-@router.post("")
-async def vacancy_intelligence(
-    request: VacancyIntelligenceRequest,
-    authorization: str | None = Header(None),
-) -> dict[str, Any]:
-    await verify_supabase_user(authorization)
+def _extractor_version() -> str:
+    """Identify every stage that shaped a stored extraction, including whether AI ran."""
+    semantic = SEMANTIC_EXTRACTOR_VERSION if settings.OPENAI_API_KEY else "none"
+    return f"{DETERMINISTIC_EXTRACTOR_VERSION}+{semantic}+{_RECONCILER_VERSION}"
 
-    semantic_items = semantic_extract(request.vacancy_text)
-    deterministic_items = deterministic_extract(request.vacancy_text)
-    items, provider = _reconcile_items(semantic_items, deterministic_items)
 
-    typed_items = [ExtractedItem(**item).model_dump() for item in items]
+def _extraction_response(
+    typed_items: list[dict[str, Any]],
+    provider: str,
+    extraction_id: str | None,
+    cached: bool,
+    incremental: dict[str, Any] | None = None,
+) -> dict[str, Any]:
     requirements = [item for item in typed_items if item["category"] in {"essential", "desirable", "trainable"}]
     low_confidence = sum(1 for item in typed_items if item["confidence"] < 0.65)
 
     return {
         "ok": True,
         "provider": provider,
+        "extraction_id": extraction_id,
+        "cached": cached,
+        "incremental": incremental,
         "eligibility": _group(typed_items, "eligibility"),
         "requirements": requirements,
         "practical": _group(typed_items, "practical"),
@@ -142,3 +241,223 @@ async def vacancy_intelligence(
             "low_confidence": low_confidence,
         },
     }
+
+
+def _semantic_result_storable(semantic_items: list[dict[str, Any]] | None) -> bool:
+    # A semantic failure is not stored, so a transient outage does not pin an
+    # advert to its deterministic-only result.
+    return semantic_items is not None or not settings.OPENAI_API_KEY
+
+
+def _reextract_changed(vacancy_text: str, previous_extraction_id: str, version: str) -> dict[str, Any] | None:
+    """Re-run extraction only for the sections an edit touched, reusing the rest.
+
+    Returns None when the previous extraction is unknown, was made by other
+    extractor versions or has no stored source lines; the caller then extracts
+    the whole advert.
+    """
+    previous = load_extraction_by_id(previous_extraction_id, version)
+    old_lines = list((previous or {}).get("source_lines") or [])
+    if previous is None or not old_lines:
+        return None
+    new_lines = normalised_lines(vacancy_text)
+    region = changed_region(old_lines, new_lines)
+    previous_items = list(previous.get("items") or [])
+    if region is None:
+        typed_items = [ExtractedItem(**item).model_dump() for item in previous_items]
+        return _extraction_response(typed_items, str(previous.get("provider", "")), previous.get("id"), cached=True)
+
+    start, end = region
+    changed_text = "\n".join(new_lines[start:end])
+    semantic_items = semantic_extract(changed_text) if changed_text else []
+    changed_items, provider = _reconcile_items(semantic_items, deterministic_extract(changed_text))
+    before = carried_items(previous_items, new_lines[:start])
+    after = carried_items(previous_items, new_lines[end:])
+    items = _dedupe_items(before + changed_items + after)[:40]
+
+    typed_items = [ExtractedItem(**item).model_dump() for item in items]
+    extraction_id = None
+    if _semantic_result_storable(semantic_items):
+        extraction_id = save_extraction(vacancy_text, version, provider, typed_items)
+    return _extraction_response(
+        typed_items,
+        provider,
+        extraction_id,
+        cached=False,
+        incremental={
+            "previous_extraction_id": previous_extraction_id,
+            "reused_items": len(before) + len(after),
+            "reextracted_lines": end - start,
+            "total_lines": len(new_lines),
+        },
+    )
+
+
+def _extract_vacancy(vacancy_text: str, previous_extraction_id: str | None = None) -> dict[str, Any]:
+    """Reuse the stored extraction for this advert, or extract, reconcile and store it.
+
+    With ``previous_extraction_id`` an edited advert is re-extracted only from
+    the sections that changed.
+    """
+    version = _extractor_version()
+    stored = load_extraction(vacancy_text, version)
+    if stored is not None:
+        typed_items = [ExtractedItem(**item).model_dump() for item in stored.get("items") or []]
+        return _extraction_response(typed_items, str(stored.get("provider", "")), stored.get("id"), cached=True)
+
+    if previous_extraction_id:
+        incremental = _reextract_changed(vacancy_text, previous_extraction_id, version)
+        if incremental is not None:
+            return incremental
+
+    semantic_items = semantic_extract(vacancy_text)
+    deterministic_items = deterministic_extract(vacancy_text)
+    items, provider = _reconcile_items(semantic_items, deterministic_items)
+
+    typed_items = [ExtractedItem(**item).model_dump() for item in items]
+    extraction_id = None
+    if _semantic_result_storable(semantic_items):
+        extraction_id = save_extraction(vacancy_text, version, provider, typed_items)
+    return _extraction_response(typed_items, provider, extraction_id, cached=False)
+
+
+@router.post("")
+async def vacancy_intelligence(
+    request: VacancyIntelligenceRequest,
+    authorization: str | None = Header(None),
+) -> dict[str, Any]:
+    await verify_supabase_user(authorization)
+    return _extract_vacancy(request.vacancy_text, request.previous_extraction_id)
+
+
+class _UploadStreamingResponse(StreamingResponse):
+    """Stream a response whose body generator is still reading the request body.
+
+    StreamingResponse normally listens for client disconnects on ``receive`` in a
+    parallel task, which would steal the upload's body messages. Here the
+    generator itself drains ``receive`` and sees any disconnect, so the listener is
+    skipped.
+    """
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        await self.stream_response(send)
+
+
+def _ndjson(data: dict[str, Any]) -> bytes:
+    return (json.dumps(data, ensure_ascii=False) + "\n").encode()
+
+
+async def _stream_extraction(chunks: AsyncIterator[bytes], html: bool = False) -> AsyncIterator[bytes]:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    converter = HtmlLineConverter() if html else None
+    extractor = IncrementalExtractor()
+    counts = {"eligibility": 0, "requirements": 0, "practical": 0}
+    received = 0
+    # Markup is not advert text, so HTML uploads get a larger allowance.
+    limit = _MAX_HTML_CHARS if html else _MAX_VACANCY_CHARS
+
+    def emit(items: list[dict[str, Any]]) -> list[bytes]:
+        lines = []
+        for item in items:
+            typed = ExtractedItem(**item).model_dump()
+            group = "requirements" if typed["category"] in {"essential", "desirable", "trainable"} else typed["category"]
+            counts[group] += 1
+            lines.append(_ndjson({"type": "item", "group": group, "item": typed}))
+        return lines
+
+    def lines(text: str, final: bool = False) -> str:
+        if converter is None:
+            return text
+        return "".join(converter.feed(text) + (converter.close() if final else []))
+
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        received += len(text)
+        if received > limit:
+            yield _ndjson({"type": "error", "detail": f"Vacancy text exceeds {limit} characters"})
+            return
+        for line in emit(extractor.feed(lines(text))):
+            yield line
+        if extractor.done:
+            break
+    for line in emit(extractor.feed(lines(decoder.decode(b"", final=True), final=True)) + extractor.close()):
+        yield line
+    yield _ndjson({
+        "type": "done",
+        "provider": "deterministic-v2",
+        "summary": {"items": sum(counts.values()), **counts},
+    })
+
+
+@router.post("/stream")
+async def stream_vacancy_intelligence(
+    request: Request,
+    authorization: str | None = Header(None),
+) -> _UploadStreamingResponse:
+    """Extract criteria from a raw-text upload, emitting NDJSON items as lines arrive.
+
+    The advert is read as it uploads and each grounded item is sent once its
+    source line has been classified, so eligibility and essential criteria can be
+    shown before the rest of a long advert is processed. This path is
+    deterministic only; post the full text to ``/vacancy-intelligence`` for the
+    semantic reconciliation. Uploads sent as ``text/html`` are converted to
+    heading and bullet lines as they stream.
+    """
+    await verify_supabase_user(authorization)
+    html = request.headers.get("content-type", "").startswith("text/html")
+    return _UploadStreamingResponse(_stream_extraction(request.stream(), html), media_type="application/x-ndjson")
+
+
+def _run_semantic_job(payload: dict[str, Any]) -> dict[str, Any]:
+    return {"id": payload.get("id"), **_extract_vacancy(str(payload.get("vacancy_text", "")))}
+
+
+register_job_handler(SEMANTIC_JOB_KIND, _run_semantic_job)
+
+
+def _bulk_lines(request: BulkExtractionRequest, owner: str) -> Iterator[bytes]:
+    # Runs in Starlette's threadpool, so the blocking job fetch stays off the event loop.
+    entries = job_entries(request.job_ids) if request.job_ids else []
+    entries.extend((vacancy.id, vacancy.vacancy_text) for vacancy in request.vacancies)
+    semantic_limit = min(request.semantic_limit, settings.BULK_SEMANTIC_LIMIT)
+    total = failures = 0
+    for result in run_bulk(entries, owner, semantic_limit, settings.BULK_EXTRACTION_WORKERS):
+        total += 1
+        failures += not result["ok"]
+        yield _ndjson({"type": "result", **result})
+    yield _ndjson({"type": "done", "total": total, "failed": failures})
+
+
+@router.post("/bulk")
+async def bulk_vacancy_intelligence(
+    request: BulkExtractionRequest,
+    authorization: str | None = Header(None),
+) -> StreamingResponse:
+    """Run deterministic extraction over many stored or supplied adverts, streaming NDJSON.
+
+    Each advert produces one ``result`` line in input order; failures are reported
+    per advert. Up to ``semantic_limit`` successful adverts are also queued for
+    semantic extraction, polled via ``GET /vacancy-intelligence/jobs/{job_id}``.
+    """
+    user = await verify_supabase_user(authorization)
+    return StreamingResponse(_bulk_lines(request, user["id"]), media_type="application/x-ndjson")
+
+
+@router.get("/jobs/{job_id}")
+async def vacancy_job_status(
+    job_id: str,
+    authorization: str | None = Header(None),
+) -> dict[str, Any]:
+    user = await verify_supabase_user(authorization)
+    job = get_job_queue().get(job_id, owner=user["id"])
+    if job is None or job["kind"] != SEMANTIC_JOB_KIND:
+        raise HTTPException(status_code=404, detail="Extraction job not found")
+    return {
+        "ok": True,
+        "job_id": job["id"],
+        "status": job["status"],
+        "result": job["result"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
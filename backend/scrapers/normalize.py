@@ -5,6 +5,8 @@ from datetime import datetime
 from typing import Any
 from uuid import uuid4
 
+from lib.vacancy_extraction import grouped_extraction
+
 
 def extract_salary_range(
     salary_text: str | None,
@@ -64,6 +66,8 @@ def normalize_job_data(raw_data: dict[str, Any], source: str) -> dict[str, Any]:
     salary_text = raw_data.get("salary") or raw_data.get("salary_range")
     salary_min, salary_max, salary_text = extract_salary_range(salary_text)
 
+    description = raw_data.get("description") or raw_data.get("job_description")
+
     # Job type
     job_type = raw_data.get("type") or raw_data.get("job_type") or raw_data.get("employment_type")
 
@@ -89,16 +93,28 @@ def normalize_job_data(raw_data: dict[str, Any], source: str) -> dict[str, Any]:
         "salary_text": salary_text,
         "type": job_type,
         "url": url,
+        "description": description,
         "posted_at": posted_at.isoformat() if posted_at else None,
         "raw": raw_data,
     }
 
 
+def with_requirements(job_data: dict[str, Any]) -> dict[str, Any]:
+    """Attach grouped deterministic requirements extracted from the job description."""
+    description = job_data.get("description")
+    if not description:
+        return {**job_data, "requirements": None}
+    return {**job_data, "requirements": grouped_extraction(str(description))}
+
+
 async def upsert_job(job_data: dict[str, Any], supabase_client) -> dict[str, Any]:
     """Upsert a job into the database.
 
     Uses url as primary unique key, with (source, external_id) as secondary.
+    Requirements are extracted from the description here so every stored job
+    carries them.
     """
+    job_data = with_requirements(job_data)
     try:
         # Try to upsert by url
         response = supabase_client.table("jobs").upsert(job_data, on_conflict="url").execute()
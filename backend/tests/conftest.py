@@ -4,3 +4,25 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from openai import OpenAI  # noqa: E402
+
+from devtools.openai_standin import StandinConfig, create_app  # noqa: E402
+from lib.settings import settings  # noqa: E402
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    """Route the real OpenAI SDK to an in-process stand-in app."""
+
+    def install(config: StandinConfig | None = None) -> None:
+        app = create_app(config or StandinConfig())
+        client = OpenAI(api_key="standin", base_url="http://testserver/v1", http_client=TestClient(app), max_retries=0)
+        monkeypatch.setattr(settings, "OPENAI_API_KEY", "standin")
+        for module in ("lib.vacancy_ai", "lib.application_ai", "lib.evidence_semantic_batch"):
+            monkeypatch.setattr(f"{module}.get_openai_client", lambda: client)
+
+    return install
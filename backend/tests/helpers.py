@@ -0,0 +1,149 @@
+"""Shared fixtures and sample data for the backend tests."""
+
+from backend.routes.application_builder import ApplicationEvidence
+
+
+class FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+def evidence_card() -> ApplicationEvidence:
+    return ApplicationEvidence(
+        id="ev-1",
+        title="Operational review",
+        task="I was responsible for assessing the available options and making a recommendation.",
+        actions=[
+            "I checked the available information and compared the operational risks.",
+            "I consulted colleagues affected by the proposed change before making my recommendation.",
+        ],
+        outcome="The recommendation was accepted and the work was completed safely.",
+        authority_context="I made the recommendation; final approval remained with the senior manager.",
+    )
+
+
+def evidence_with_duration() -> ApplicationEvidence:
+    return ApplicationEvidence(
+        id="ev-duration",
+        title="Operational examination",
+        task="I assessed the available options and made a recommendation.",
+        actions=["I compared the operational risks and consulted affected colleagues."],
+        outcome="Access was achieved and the extraction operation continued for approximately 18 hours.",
+        authority_context="I made a recommendation; final approval remained with the senior manager.",
+    )
+
+
+def two_evidence_cards():
+    """Two distinct cards: ``evidence_card()`` and a stakeholder example ``ev-2``."""
+    first = evidence_card()
+    second = evidence_card()
+    second.id = "ev-2"
+    second.actions = ["I briefed the affected teams and gathered their concerns before the change."]
+    return first, second
+
+
+def action_paragraph(card, index: int) -> dict:
+    """A grounded paragraph quoting the card's first action for requirement ``index``."""
+    return {
+        "text": card.actions[0],
+        "requirement_indices": [index],
+        "evidence_ids": [card.id],
+        "supporting_facts": [{"evidence_id": card.id, "field": "actions", "text": card.actions[0]}],
+        "grounding_status": "grounded",
+    }
+
+
+VACANCY = """
+Eligibility:
+- Applicants must have the right to work in the UK.
+
+Essential criteria:
+- Experience analysing complex information and making recommendations.
+- You must demonstrate effective stakeholder management.
+
+Desirable:
+- Fraud investigation experience is desirable.
+
+Training:
+- Successful candidates will receive training in the internal casework system.
+- Role-specific legislation and procedures will be taught during training.
+
+Working pattern:
+- The role requires a minimum of 30 hours per week across 4 days.
+"""
+
+MESSY_CIVIL_SERVICE_VACANCY = """
+Job summary
+We believe a positive, open and supportive culture is essential to help everyone deliver their best work.
+
+Responsibilities
+Leading collaboration discussions and campaign activity with partners.
+
+Working patterns
+Due to the business requirements of this role, it is only available on a full-time basis.
+
+Person specification
+Essential criteria
+You must be able to demonstrate experience of:
+Partnership management or stakeholder engagement, influencing internal and external stakeholders at all levels and building and managing productive relationships;
+Sourcing, analysing and prioritising relevant sources of data and insight to inform communications activity;
+Developing and delivering proposals and presentations;
+Leading the development, delivery and evaluation of partnership campaigns designed to drive behaviour change, including working collaboratively with internal and external communications teams; and
+Strong organisational and project management skills; able to manage multiple priorities and deadlines.
+
+Desirable criteria
+Familiarity with public communications in a large complex organisation.
+
+Behaviours
+Working Together
+Making Effective Decisions
+
+Technical skills
+Communications - Implementation
+Communications - Insight
+
+Benefits
+National pay locations: Cardiff, Salford, Sheffield £49,850 - £52,850
+
+Things you need to know
+Artificial intelligence
+Artificial intelligence can be a useful tool to support your application.
+
+Selection process details
+Application – by 30th August 2026.
+Your CV should consist of your career history, qualifications, and skills/experience, including any key achievements in each role.
+The Personal Statement should be aligned to and demonstrate how you meet the skills and experience set out in the essential criteria.
+Sift – from 2nd September 2026.
+Interview – from 23rd September 2026.
+Please note travel expenses incurred by attending an interview will not be reimbursed.
+If you experience problems accessing this advert, please contact recruitment@example.gov.uk.
+
+Breaking Tied Scores
+The behaviour, technical and experience skills have been ranked in order of importance to enable us to differentiate between candidates with tied interview scores.
+
+Additional Security Checks
+As well as successfully obtaining UK Security Vetting clearance, candidates will be subject to a range of additional checks.
+"""
+
+
+VACANCY_AS_EVIDENCE = {
+    "title": "Counter Fraud Investigation Officer Home Office Role summary",
+    "situation": """
+Role summary
+We are looking for an Investigation Officer who can analyse complex information.
+Eligibility
+Applicants must have the right to work in the UK.
+Essential criteria
+You must be able to make timely evidence-based decisions.
+Desirable criteria
+Previous investigation experience is desirable.
+Trainable requirements
+Successful candidates will receive training.
+Practical requirements
+The role requires regular office attendance.
+""",
+    "task": "",
+    "actions": [],
+    "outcome": "",
+    "reflection": "",
+}
@@ -4,26 +4,13 @@ from backend.lib.application_ai import _fact_catalog, _hydrate_supporting_facts,
 from backend.lib.application_draft import deterministic_draft
 from backend.lib.application_grounding import validate_ai_paragraph
 from backend.main import app
-from backend.routes.application_builder import ApplicationEvidence, ApplicationRequirement
+from backend.routes.application_builder import ApplicationRequirement
+from tests.helpers import evidence_card
 
 client = TestClient(app)
 HEADERS = {"Authorization": "Bearer valid_token"}
 
 
-def evidence_card() -> ApplicationEvidence:
-    return ApplicationEvidence(
-        id="ev-1",
-        title="Operational review",
-        task="I was responsible for assessing the available options and making a recommendation.",
-        actions=[
-            "I checked the available information and compared the operational risks.",
-            "I consulted colleagues affected by the proposed change before making my recommendation.",
-        ],
-        outcome="The recommendation was accepted and the work was completed safely.",
-        authority_context="I made the recommendation; final approval remained with the senior manager.",
-    )
-
-
 def test_word_target_uses_most_of_requested_budget_without_requiring_full_limit():
     assert _word_target(500) == (425, 475)
     assert _word_target(200) == (170, 190)
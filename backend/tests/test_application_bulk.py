@@ -0,0 +1,124 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from lib import application_bulk, job_queue
+from lib.application_bulk import bulk_draft
+from lib.application_draft import deterministic_draft
+from lib.job_queue import JobQueue
+from lib.settings import settings
+from tests.helpers import FakeResult, evidence_card
+
+client = TestClient(app)
+HEADERS = {"Authorization": "Bearer valid_token"}
+
+
+class FakeEvidence:
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = []
+        self.fetches = 0
+
+    def table(self, name):
+        assert name == "evidence_cards"
+        self.filters = []
+        return self
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def eq(self, field, value):
+        self.filters.append(lambda row: row.get(field) == value)
+        return self
+
+    def in_(self, field, values):
+        self.filters.append(lambda row: row.get(field) in values)
+        return self
+
+    def execute(self):
+        self.fetches += 1
+        return FakeResult([dict(row) for row in self.rows if all(check(row) for check in self.filters)])
+
+
+@pytest.fixture
+def queue(monkeypatch, tmp_path):
+    local = JobQueue(str(tmp_path / "jobs.sqlite3"), max_workers=1)
+    monkeypatch.setattr(job_queue, "_queue", local)
+    yield local
+    local.close()
+
+
+@pytest.fixture
+def evidence(monkeypatch):
+    mine = {**evidence_card().model_dump(), "user_id": "user_123"}
+    theirs = {**evidence_card().model_dump(), "id": "ev-foreign", "user_id": "someone-else"}
+    store = FakeEvidence([mine, theirs])
+    monkeypatch.setattr(application_bulk, "get_supabase_client", lambda: store)
+    monkeypatch.setattr(settings, "BULK_DRAFT_WORKERS", 1)
+    return store
+
+
+def _draft(key: str, evidence_id: str, word_limit: int = 300) -> dict:
+    return {
+        "id": key,
+        "job": {"title": f"Officer {key}"},
+        "word_limit": word_limit,
+        "requirements": [{"text": "Make evidence-based recommendations", "match_strength": "strong", "evidence_ids": [evidence_id]}],
+    }
+
+
+def test_process_pool_results_match_serial_drafting_in_order(monkeypatch):
+    monkeypatch.setattr(application_bulk, "_POOL_MIN_BATCH", 0)
+    card = evidence_card()
+    requirement = {"text": "Make evidence-based recommendations", "category": "essential", "match_strength": "strong", "evidence_ids": [card.id]}
+    entries = [(str(index), "Officer", 150 + index * 50, [requirement], {card.id: card.model_dump()}) for index in range(6)]
+
+    pooled = list(bulk_draft(entries, workers=2, chunksize=2))
+
+    assert [result["id"] for result in pooled] == [entry[0] for entry in entries]
+    for result, entry in zip(pooled, entries):
+        assert result["paragraphs"] == deterministic_draft([SimpleNamespace(**requirement)], {card.id: card}, "Officer", word_limit=entry[2])
+
+
+def test_bulk_endpoint_loads_cards_once_and_streams_ndjson(evidence, queue, monkeypatch):
+    monkeypatch.setattr("routes.application_builder.semantic_application_draft", lambda *args, **kwargs: (None, "no_api_key"))
+    payload = {"drafts": [_draft("a", "ev-1"), _draft("b", "ev-foreign"), _draft("c", "ev-1", 150)], "semantic_limit": 5}
+
+    response = client.post("/application-builder/bulk", headers=HEADERS, json=payload)
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert evidence.fetches == 1
+    assert [line.get("id") for line in lines] == ["a", "b", "c", None]
+    assert lines[-1] == {"type": "done", "total": 3, "failed": 0}
+    assert lines[0]["can_generate"] and lines[0]["coverage"][0]["status"] == "covered"
+    assert not lines[1]["can_generate"] and "semantic_job_id" not in lines[1]
+    assert lines[2]["word_count"] <= 150
+    status = client.get(f"/application-builder/jobs/{lines[0]['semantic_job_id']}", headers=HEADERS)
+    assert status.status_code == 200
+
+
+def test_bulk_endpoint_validates_batch_size(evidence):
+    assert client.post("/application-builder/bulk", headers=HEADERS, json={"drafts": []}).status_code == 422
+    duplicate = {"drafts": [_draft("a", "ev-1"), _draft("a", "ev-foreign")]}
+    response = client.post("/application-builder/bulk", headers=HEADERS, json=duplicate)
+    assert response.status_code == 422 and "duplicate draft id" in response.text
+    assert client.post("/application-builder/bulk", json={"drafts": [_draft("a", "ev-1")]}).status_code == 401
+
+
+def test_bulk_and_single_endpoints_produce_the_same_deterministic_draft(evidence, monkeypatch):
+    monkeypatch.setattr("routes.application_builder.semantic_application_draft", lambda *args, **kwargs: (None, "no_api_key"))
+    monkeypatch.setattr("routes.application_builder.save_draft", lambda *args, **kwargs: None)
+    draft = _draft("a", "ev-1", word_limit=400)
+
+    bulk = json.loads(client.post("/application-builder/bulk", headers=HEADERS, json={"drafts": [draft]}).text.splitlines()[0])
+    single = client.post(
+        "/application-builder",
+        headers=HEADERS,
+        json={**draft, "evidence_cards": [evidence_card().model_dump()]},
+    ).json()
+
+    for key in ("provider", "draft", "paragraphs", "word_count", "coverage", "warnings"):
+        assert bulk[key] == single[key], key
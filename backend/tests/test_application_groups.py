@@ -0,0 +1,69 @@
+import threading
+
+from lib import application_ai
+from lib.application_ai import grouped_semantic_application_draft
+from lib.application_draft import allocate_word_budgets, group_paragraph, requirement_groups
+from lib.settings import settings
+from routes.application_builder import ApplicationRequirement
+from tests.helpers import action_paragraph, two_evidence_cards
+
+
+def _requirements(first, second) -> list[ApplicationRequirement]:
+    return [
+        ApplicationRequirement(text="Make evidence-based recommendations", match_strength="strong", evidence_ids=[first.id]),
+        ApplicationRequirement(text="Manage risk", match_strength="partial", evidence_ids=[first.id]),
+        ApplicationRequirement(text="Engage stakeholders", category="desirable", match_strength="strong", evidence_ids=[second.id]),
+    ]
+
+
+def test_word_budgets_favour_essential_groups_and_sum_to_the_limit():
+    first, second = two_evidence_cards()
+    requirements = _requirements(first, second)
+    groups = requirement_groups(requirements, {first.id: first, second.id: second})
+
+    budgets = allocate_word_budgets(requirements, groups, 301)
+
+    assert [evidence_id for evidence_id, _ in groups] == [first.id, second.id]
+    assert budgets == [241, 60]
+    assert allocate_word_budgets(requirements, [], 300) == []
+
+
+def test_groups_are_drafted_concurrently_and_failures_fall_back_per_group(monkeypatch):
+    first, second = two_evidence_cards()
+    cards = {first.id: first, second.id: second}
+    requirements = _requirements(first, second)
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test-key")
+    barrier = threading.Barrier(2, timeout=5)
+    calls = []
+
+    def draft(requirements, cards_by_id, role_title, organisation, application_type, word_limit, only_indices=None):
+        calls.append((only_indices, word_limit))
+        barrier.wait()
+        if only_indices == {0, 1}:
+            return [{**action_paragraph(first, 0), "requirement_indices": [0, 1]}], "ok"
+        return None, "no_validated_paragraphs_unsupported_number"
+
+    monkeypatch.setattr(application_ai, "semantic_application_draft", draft)
+
+    paragraphs, status, fallbacks = grouped_semantic_application_draft(
+        requirements, cards, "Officer", "", "statement_of_suitability", 300
+    )
+
+    assert sorted(calls, key=lambda call: -call[1]) == [({0, 1}, 240), ({2}, 60)]
+    assert status == "ok" and fallbacks == 1
+    assert paragraphs[0]["text"] == first.actions[0]
+    assert paragraphs[1] == group_paragraph(second, second.id, [2], 60)
+
+
+def test_all_groups_failing_defers_to_the_whole_draft_fallback(monkeypatch):
+    first, second = two_evidence_cards()
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(application_ai, "semantic_application_draft", lambda *args, **kwargs: (None, "openai_APITimeoutError"))
+
+    paragraphs, status, fallbacks = grouped_semantic_application_draft(
+        _requirements(first, second), {first.id: first, second.id: second}, "Officer", "", "statement_of_suitability", 300
+    )
+
+    assert paragraphs is None
+    assert status == "openai_APITimeoutError"
+    assert fallbacks == 2
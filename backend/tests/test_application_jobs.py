@@ -0,0 +1,160 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from lib import job_queue
+from lib.job_queue import JobQueue, register_job_handler
+from lib.settings import settings
+from tests.helpers import evidence_card
+
+client = TestClient(app)
+HEADERS = {"Authorization": "Bearer valid_token"}
+
+
+@pytest.fixture
+def queue(monkeypatch, tmp_path):
+    local = JobQueue(str(tmp_path / "jobs.sqlite3"), max_workers=2)
+    monkeypatch.setattr(job_queue, "_queue", local)
+    yield local
+    local.close()
+
+
+def _wait(queue: JobQueue, job_id: str) -> dict:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job and job["status"] in {"succeeded", "failed"}:
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def _payload() -> dict:
+    card = evidence_card()
+    return {
+        "job": {"title": "Operations Officer"},
+        "word_limit": 500,
+        "requirements": [{"text": "Make evidence-based recommendations", "category": "essential", "match_strength": "strong", "evidence_ids": [card.id]}],
+        "evidence_cards": [card.model_dump()],
+    }
+
+
+def test_background_job_returns_202_and_result_is_polled(monkeypatch, queue):
+    monkeypatch.setattr("routes.application_builder.semantic_application_draft", lambda *args, **kwargs: (None, "no_api_key"))
+
+    submitted = client.post("/application-builder/jobs", headers=HEADERS, json=_payload())
+    assert submitted.status_code == 202
+    job_id = submitted.json()["job_id"]
+
+    _wait(queue, job_id)
+    status = client.get(f"/application-builder/jobs/{job_id}", headers=HEADERS).json()
+    assert status["status"] == "succeeded"
+    assert status["result"]["provider"] == "deterministic-grounded-v2"
+    assert status["result"]["fallback_reason"] == "no_api_key"
+
+
+def test_duplicate_submission_attaches_to_existing_job(monkeypatch, queue):
+    monkeypatch.setattr("routes.application_builder.semantic_application_draft", lambda *args, **kwargs: (None, "no_api_key"))
+
+    first = client.post("/application-builder/jobs", headers=HEADERS, json=_payload()).json()
+    second = client.post("/application-builder/jobs", headers=HEADERS, json=_payload()).json()
+
+    assert second["job_id"] == first["job_id"]
+    assert first["deduplicated"] is False
+    assert second["deduplicated"] is True
+
+
+def test_unknown_or_foreign_job_is_not_found(queue):
+    assert client.get("/application-builder/jobs/missing", headers=HEADERS).status_code == 404
+    assert client.get("/application-builder/jobs/missing").status_code == 401
+    job, _ = queue.submit("application_draft", "someone-else", _payload())
+    assert queue.get(job["id"], owner="user_123") is None
+
+
+def test_interrupted_jobs_resume_after_worker_restart(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    first = JobQueue(path, max_workers=1)
+    job, _ = first.submit("restart_drill", "user_123", {"value": 2})
+    first._execute("update jobs set status = 'running' where id = ?", (job["id"],))
+    first.close()
+
+    register_job_handler("restart_drill", lambda payload: {"doubled": payload["value"] * 2})
+    restarted = JobQueue(path, max_workers=1)
+    try:
+        finished = _wait(restarted, job["id"])
+        assert finished["status"] == "succeeded"
+        assert finished["result"] == {"doubled": 4}
+    finally:
+        restarted.close()
+        job_queue._handlers.pop("restart_drill", None)
+
+
+def _claim(queue: JobQueue, job_id: str, claimed_by: str, updated_at: str | None = None) -> None:
+    queue._execute(
+        "update jobs set status = 'running', claimed_by = ?, updated_at = coalesce(?, updated_at) where id = ?",
+        (claimed_by, updated_at, job_id),
+    )
+
+
+def test_restart_requeues_only_jobs_whose_claimant_has_stopped(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    host = socket.gethostname()
+    sleeper = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    finished = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    first = JobQueue(path, max_workers=1)
+    jobs = {name: first.submit("shared_drill", "user_123", {"name": name})[0]["id"] for name in ("live", "dead", "remote", "stale")}
+    _claim(first, jobs["live"], f"{host}:{sleeper.pid}:boot")
+    _claim(first, jobs["dead"], f"{host}:{int(finished.stdout)}:boot")
+    _claim(first, jobs["remote"], "other-host:1:boot")
+    _claim(first, jobs["stale"], "other-host:1:boot", "2020-01-01T00:00:00+00:00")
+    first.close()
+
+    second = JobQueue(path, max_workers=1)
+    try:
+        statuses = {name: second.get(job_id)["status"] for name, job_id in jobs.items()}
+        assert statuses == {"live": "running", "dead": "queued", "remote": "running", "stale": "queued"}
+    finally:
+        second.close()
+        sleeper.kill()
+        sleeper.wait()
+
+
+def test_restart_with_the_same_host_and_pid_requeues_the_previous_boots_jobs(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    first = JobQueue(path, max_workers=1)
+    mine, _ = first.submit("shared_drill", "user_123", {"value": 1})
+    previous_boot, _ = first.submit("shared_drill", "user_123", {"value": 2})
+    _claim(first, mine["id"], job_queue._claim_id())
+    # A container restart: same hostname and pid, but a new boot token.
+    _claim(first, previous_boot["id"], f"{socket.gethostname()}:{os.getpid()}:previous-boot")
+    first.close()
+
+    second = JobQueue(path, max_workers=1)
+    try:
+        assert second.get(mine["id"])["status"] == "running"
+        assert second.get(previous_boot["id"])["status"] == "queued"
+    finally:
+        second.close()
+
+
+def test_running_jobs_renew_their_lease(monkeypatch, queue):
+    monkeypatch.setattr(settings, "JOB_LEASE_SECONDS", 0.3)
+    started = threading.Event()
+    register_job_handler("slow_drill", lambda payload: started.set() or time.sleep(0.5) or {"done": True})
+    try:
+        job, _ = queue.submit("slow_drill", "user_123", {"value": 1})
+        started.wait(2)
+        claimed_at = queue.get(job["id"])["updated_at"]
+        time.sleep(0.3)
+        running = queue.get(job["id"])
+        assert running["status"] == "running" and running["updated_at"] > claimed_at
+        assert _wait(queue, job["id"])["status"] == "succeeded"
+    finally:
+        job_queue._handlers.pop("slow_drill", None)
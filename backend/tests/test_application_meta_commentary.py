@@ -1,4 +1,4 @@
-from routes.application_builder import _clean_meta_commentary, _normalise_paragraphs
+from lib.application_draft import clean_meta_commentary, normalise_paragraphs
 
 
 def test_removes_parenthetical_assessor_commentary():
@@ -6,7 +6,7 @@ def test_removes_parenthetical_assessor_commentary():
         "I compared the available options and assessed the operational risks. "
         "(This paragraph underpins my ability to make evidence-based decisions.)"
     )
-    cleaned = _clean_meta_commentary(text)
+    cleaned = clean_meta_commentary(text)
     assert cleaned == "I compared the available options and assessed the operational risks."
 
 
@@ -16,7 +16,7 @@ def test_removes_standalone_meta_sentence_but_keeps_evidence():
         "This evidence demonstrates effective stakeholder management. "
         "The Senior Officer retained final decision-making authority."
     )
-    cleaned = _clean_meta_commentary(text)
+    cleaned = clean_meta_commentary(text)
     assert "This evidence demonstrates" not in cleaned
     assert "I briefed colleagues" in cleaned
     assert "Senior Officer retained final decision-making authority" in cleaned
@@ -30,7 +30,7 @@ def test_normalise_preserves_grounding_metadata():
         "supporting_facts": [{"field": "actions", "text": "I reassessed the risks."}],
         "grounding_status": "grounded",
     }
-    result = _normalise_paragraphs([paragraph])
+    result = normalise_paragraphs([paragraph])
     assert result[0]["text"] == "I reassessed the risks."
     assert result[0]["requirement_indices"] == [1, 2]
     assert result[0]["evidence_ids"] == ["card-1"]
@@ -39,4 +39,4 @@ def test_normalise_preserves_grounding_metadata():
 
 def test_does_not_strip_normal_candidate_language():
     text = "This example involved coordinating with three operational teams before I made my recommendation."
-    assert _clean_meta_commentary(text) == text
+    assert clean_meta_commentary(text) == text
@@ -0,0 +1,61 @@
+import itertools
+import random
+
+from lib.application_draft import _knapsack, deterministic_draft, word_count
+from lib.application_grounding import validate_ai_paragraph
+from routes.application_builder import ApplicationRequirement
+from tests.helpers import two_evidence_cards
+
+
+def _brute_force(items, capacity):
+    best = 0
+    for size in range(len(items) + 1):
+        for combo in itertools.combinations(items, size):
+            if sum(words for words, _ in combo) <= capacity:
+                best = max(best, sum(value for _, value in combo))
+    return best
+
+
+def _value(items, mask):
+    return sum(value for position, (_, value) in enumerate(items) if mask >> position & 1)
+
+
+def test_knapsack_is_optimal_for_small_budgets():
+    rng = random.Random(48)
+    for _ in range(200):
+        items = [(rng.randint(1, 40), rng.randint(1, 200)) for _ in range(rng.randint(1, 9))]
+        capacity = rng.randint(1, 120)
+        mask = _knapsack(items, capacity)
+
+        assert sum(words for position, (words, _) in enumerate(items) if mask >> position & 1) <= capacity
+        assert _value(items, mask) == _brute_force(items, capacity)
+
+
+def test_knapsack_never_overruns_large_budgets():
+    rng = random.Random(7)
+    for _ in range(50):
+        items = [(rng.randint(5, 60), rng.randint(1, 500)) for _ in range(40)]
+        capacity = rng.randint(300, 1500)
+        mask = _knapsack(items, capacity)
+
+        used = sum(words for position, (words, _) in enumerate(items) if mask >> position & 1)
+        assert used <= capacity
+        assert used == sum(words for words, _ in items) or used > capacity - 60
+
+
+def test_draft_fills_the_limit_with_grounded_sentences():
+    first, second = two_evidence_cards()
+    first.actions = [f"I completed step {name} of the review, recording each decision and the evidence behind it for colleagues." for name in "ABCDEF"]
+    requirements = [
+        ApplicationRequirement(text="Make evidence-based recommendations", match_strength="strong", evidence_ids=[first.id]),
+        ApplicationRequirement(text="Engage stakeholders", category="desirable", match_strength="strong", evidence_ids=[second.id]),
+    ]
+    cards = {first.id: first, second.id: second}
+
+    paragraphs = deterministic_draft(requirements, cards, "Officer", word_limit=150)
+
+    assert 140 <= word_count(paragraphs) <= 150
+    assert [paragraph["evidence_ids"] for paragraph in paragraphs] == [[first.id], [second.id]]
+    for paragraph in paragraphs:
+        assert validate_ai_paragraph(paragraph, cards, len(requirements)) is not None
+        assert all(fact["text"].rstrip(".") in paragraph["text"] for fact in paragraph["supporting_facts"])
@@ -0,0 +1,167 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from lib import application_draft_store
+from tests.helpers import FakeResult, action_paragraph, two_evidence_cards
+
+client = TestClient(app)
+HEADERS = {"Authorization": "Bearer valid_token"}
+
+
+class FakeDrafts:
+    def __init__(self):
+        self.rows = []
+        self.filters = []
+        self.payload = None
+
+    def table(self, name):
+        assert name == "application_drafts"
+        return self
+
+    def select(self, *args, **kwargs):
+        self.payload = None
+        self.filters = []
+        return self
+
+    def eq(self, field, value):
+        self.filters.append((field, value))
+        return self
+
+    def insert(self, payload):
+        self.payload = payload
+        return self
+
+    def execute(self):
+        if self.payload is None:
+            return FakeResult([dict(row) for row in self.rows if all(row.get(f) == v for f, v in self.filters)])
+        row = {"id": str(uuid.uuid4()), **self.payload}
+        self.rows.append(row)
+        return FakeResult([row])
+
+
+@pytest.fixture
+def drafts(monkeypatch):
+    store = FakeDrafts()
+    monkeypatch.setattr(application_draft_store, "get_supabase_client", lambda: store)
+    return store
+
+
+def _payload(first, second, word_limit=300, previous_draft_id=None) -> dict:
+    return {
+        "job": {"title": "Operations Officer"},
+        "word_limit": word_limit,
+        "requirements": [
+            {"text": "Make evidence-based recommendations", "match_strength": "strong", "evidence_ids": [first.id]},
+            {"text": "Engage stakeholders", "match_strength": "strong", "evidence_ids": [second.id]},
+        ],
+        "evidence_cards": [first.model_dump(), second.model_dump()],
+        "previous_draft_id": previous_draft_id,
+    }
+
+
+def _fake_semantic(monkeypatch, calls):
+    def draft(requirements, cards_by_id, *args, only_indices=None):
+        calls.append((only_indices, args[-1]))
+        indices = sorted(only_indices) if only_indices is not None else range(len(requirements))
+        return [action_paragraph(cards_by_id[requirements[index].evidence_ids[0]], index) for index in indices], "ok"
+
+    monkeypatch.setattr("routes.application_builder.semantic_application_draft", draft)
+
+
+def test_editing_one_card_redrafts_only_its_requirement(monkeypatch, drafts):
+    calls = []
+    _fake_semantic(monkeypatch, calls)
+    first, second = two_evidence_cards()
+    original = client.post("/application-builder", headers=HEADERS, json=_payload(first, second)).json()
+
+    second.actions = ["I ran two workshops with the affected teams before the change."]
+    redraft = client.post(
+        "/application-builder", headers=HEADERS, json=_payload(first, second, previous_draft_id=original["draft_id"])
+    ).json()
+
+    assert original["incremental"] is None
+    assert redraft["incremental"] == {"reused": 1, "redrafted": 1}
+    assert calls[1] == ({1}, 300 - len(first.actions[0].split()))
+    assert [paragraph["text"] for paragraph in redraft["paragraphs"]] == [first.actions[0], second.actions[0]]
+    assert [item["status"] for item in redraft["coverage"]] == [item["status"] for item in original["coverage"]]
+    assert redraft["draft_id"] != original["draft_id"]
+
+
+def test_small_remaining_budget_redrafts_the_whole_statement(monkeypatch, drafts):
+    calls = []
+    _fake_semantic(monkeypatch, calls)
+    first, second = two_evidence_cards()
+    first.actions = ["I compared the available options and assessed the operational risks " * 10 + "before recommending a route."]
+    original = client.post("/application-builder", headers=HEADERS, json=_payload(first, second, word_limit=150)).json()
+
+    second.actions = ["I ran two workshops with the affected teams before the change."]
+    redraft = client.post(
+        "/application-builder",
+        headers=HEADERS,
+        json=_payload(first, second, word_limit=150, previous_draft_id=original["draft_id"]),
+    ).json()
+
+    assert original["provider"] == "openai-grounded-v1"
+    assert redraft["incremental"] is None
+    assert calls[1] == (None, 150)
+
+
+def test_unchanged_inputs_reuse_every_paragraph_without_a_model_call(monkeypatch, drafts):
+    calls = []
+    _fake_semantic(monkeypatch, calls)
+    first, second = two_evidence_cards()
+    original = client.post("/application-builder", headers=HEADERS, json=_payload(first, second)).json()
+
+    redraft = client.post(
+        "/application-builder", headers=HEADERS, json=_payload(first, second, previous_draft_id=original["draft_id"])
+    ).json()
+
+    assert len(calls) == 1
+    assert redraft["incremental"] == {"reused": 2, "redrafted": 0}
+    assert redraft["draft"] == original["draft"]
+
+
+def test_changed_requirement_mapping_or_unknown_draft_regenerates(monkeypatch, drafts):
+    calls = []
+    _fake_semantic(monkeypatch, calls)
+    first, second = two_evidence_cards()
+    original = client.post("/application-builder", headers=HEADERS, json=_payload(first, second)).json()
+
+    remapped = _payload(first, second, previous_draft_id=original["draft_id"])
+    remapped["requirements"][0]["evidence_ids"] = [second.id]
+    partial = client.post("/application-builder", headers=HEADERS, json=remapped).json()
+    unknown = client.post("/application-builder", headers=HEADERS, json=_payload(first, second, previous_draft_id="missing")).json()
+
+    assert partial["incremental"] == {"reused": 1, "redrafted": 1}
+    assert calls[1][0] == {0}
+    assert unknown["incremental"] is None
+    assert calls[2][0] is None
+
+
+def test_drafts_from_the_deterministic_fallback_are_not_reused(monkeypatch, drafts):
+    monkeypatch.setattr("routes.application_builder.semantic_application_draft", lambda *args, **kwargs: (None, "no_api_key"))
+    first, second = two_evidence_cards()
+    original = client.post("/application-builder", headers=HEADERS, json=_payload(first, second)).json()
+
+    redraft = client.post(
+        "/application-builder", headers=HEADERS, json=_payload(first, second, previous_draft_id=original["draft_id"])
+    ).json()
+
+    assert original["draft_id"] is not None
+    assert redraft["incremental"] is None
+    assert redraft["provider"] == "deterministic-grounded-v2"
+
+
+def test_word_limit_variants_are_stored_with_the_draft(monkeypatch, drafts):
+    _fake_semantic(monkeypatch, [])
+    first, second = two_evidence_cards()
+    payload = {**_payload(first, second), "word_limits": [150, 300]}
+
+    data = client.post("/application-builder", headers=HEADERS, json=payload).json()
+
+    assert len(drafts.rows) == 1
+    assert drafts.rows[0]["id"] == data["draft_id"]
+    assert [variant["word_limit"] for variant in drafts.rows[0]["variants"]] == [150, 300]
@@ -0,0 +1,94 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from devtools.openai_standin import response_stream_events
+from lib.application_ai import _StreamedParagraphs, stream_semantic_application_draft
+from routes.application_builder import ApplicationRequirement
+from tests.helpers import evidence_card
+
+client = TestClient(app)
+HEADERS = {"Authorization": "Bearer valid_token"}
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def _payload(word_limit: int = 500) -> dict:
+    card = evidence_card()
+    return {
+        "job": {"title": "Operations Officer"},
+        "word_limit": word_limit,
+        "requirements": [{"text": "Make evidence-based recommendations", "category": "essential", "match_strength": "strong", "evidence_ids": [card.id]}],
+        "evidence_cards": [card.model_dump()],
+    }
+
+
+def test_parser_yields_paragraphs_split_across_arbitrary_deltas():
+    output = json.dumps({"paragraphs": [
+        {"text": 'Quoted "braces" { inside } text.', "requirement_indices": [0], "evidence_ids": ["a"], "supporting_fact_ids": ["a:task:0"]},
+        {"text": "Second.", "requirement_indices": [1], "evidence_ids": ["b"], "supporting_fact_ids": ["b:task:0"]},
+    ]})
+    parser = _StreamedParagraphs()
+    found = []
+    for start in range(0, len(output), 7):
+        found.extend(parser.feed(output[start : start + 7]))
+
+    assert [paragraph["text"] for paragraph in found] == ['Quoted "braces" { inside } text.', "Second."]
+
+
+def test_stream_yields_grounded_paragraphs_then_status(standin):
+    standin()
+    card = evidence_card()
+    requirements = [ApplicationRequirement(text="Make evidence-based recommendations", match_strength="strong", evidence_ids=[card.id])]
+
+    events = list(stream_semantic_application_draft(requirements, {card.id: card}, "Officer", "", "statement_of_suitability", 300))
+
+    assert [kind for kind, _ in events] == ["paragraph", "status"]
+    assert events[0][1]["grounding_status"] == "grounded"
+    assert events[-1] == ("status", "ok")
+
+
+def test_standin_streams_deltas_that_reassemble_the_full_output():
+    body = {"input": json.dumps({"word_limit": 300, "requirements": [], "evidence_cards": []})}
+    events = response_stream_events(body)
+
+    assert events[0]["type"] == "response.created"
+    assert events[-1]["type"] == "response.completed"
+    text = "".join(event["delta"] for event in events if event["type"] == "response.output_text.delta")
+    assert text == events[-1]["response"]["output"][0]["content"][0]["text"]
+
+
+def test_stream_endpoint_emits_paragraphs_and_summary(standin):
+    standin()
+
+    response = client.post("/application-builder/stream", headers=HEADERS, json=_payload())
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    assert [name for name, _ in events][-1] == "done"
+    assert events[0][0] == "paragraph" and events[0][1]["index"] == 0
+    done = events[-1][1]
+    assert done["provider"] == "openai-grounded-v1"
+    assert done["fallback_reason"] is None
+    assert done["word_count"] == sum(len(data["text"].split()) for name, data in events if name == "paragraph")
+
+
+def test_stream_endpoint_falls_back_to_deterministic_paragraphs(monkeypatch):
+    monkeypatch.setattr(
+        "routes.application_builder.stream_semantic_application_draft",
+        lambda *args, **kwargs: iter([("status", "no_api_key")]),
+    )
+
+    events = _events(client.post("/application-builder/stream", headers=HEADERS, json=_payload()).text)
+
+    assert events[0][0] == "paragraph"
+    assert events[-1][1]["provider"] == "deterministic-grounded-v2"
+    assert events[-1][1]["fallback_reason"] == "no_api_key"
+    assert client.post("/application-builder/stream", json=_payload()).status_code == 401
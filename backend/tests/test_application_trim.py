@@ -0,0 +1,119 @@
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from lib.application_trim import trim_to_word_limit
+from routes.application_builder import ApplicationRequirement
+from tests.helpers import evidence_card
+
+client = TestClient(app)
+HEADERS = {"Authorization": "Bearer valid_token"}
+
+FILLER = "Colleagues across several teams later described the wider programme in generally positive terms overall."
+
+
+def _paragraph(card, index: int, text: str) -> dict:
+    return {
+        "text": text,
+        "requirement_indices": [index],
+        "evidence_ids": [card.id],
+        "supporting_facts": [{"evidence_id": card.id, "field": "actions", "text": card.actions[0]}],
+        "grounding_status": "grounded",
+    }
+
+
+def _requirements(card) -> list[ApplicationRequirement]:
+    return [
+        ApplicationRequirement(text="Make evidence-based recommendations", category="essential", match_strength="strong", evidence_ids=[card.id]),
+        ApplicationRequirement(text="Experience of consultation", category="desirable", match_strength="partial", evidence_ids=[card.id]),
+    ]
+
+
+def test_trim_removes_desirable_filler_before_essential_sentences():
+    card = evidence_card()
+    essential = _paragraph(card, 0, f"{card.actions[0]} {FILLER}")
+    desirable = _paragraph(card, 1, f"{card.actions[0]} {FILLER}")
+    limit = len(essential["text"].split()) + len(card.actions[0].split())
+
+    trimmed = trim_to_word_limit([essential, desirable], _requirements(card), {card.id: card}, limit)
+
+    assert trimmed is not None
+    assert trimmed[0]["text"] == essential["text"]
+    assert trimmed[1]["text"] == card.actions[0]
+    assert trimmed[1]["supporting_facts"] == [{"evidence_id": card.id, "field": "actions", "text": card.actions[0]}]
+    assert trimmed[1]["grounding_status"] == "grounded"
+
+
+def test_trim_returns_none_when_no_grounded_trim_fits():
+    card = evidence_card()
+    paragraph = _paragraph(card, 0, f"{card.actions[0]} {FILLER}")
+
+    assert trim_to_word_limit([paragraph], _requirements(card), {card.id: card}, 5) is None
+
+
+def test_over_limit_semantic_draft_is_trimmed_instead_of_discarded(monkeypatch):
+    card = evidence_card()
+    sentences = " ".join([card.actions[0]] + [FILLER] * 40)
+    monkeypatch.setattr(
+        "routes.application_builder.semantic_application_draft",
+        lambda *args, **kwargs: ([_paragraph(card, 0, sentences)], "ok"),
+    )
+    payload = {
+        "job": {"title": "Operations Officer"},
+        "word_limit": 300,
+        "requirements": [{"text": "Make evidence-based recommendations", "category": "essential", "match_strength": "strong", "evidence_ids": [card.id]}],
+        "evidence_cards": [card.model_dump()],
+    }
+
+    data = client.post("/application-builder", headers=HEADERS, json=payload).json()
+
+    assert data["provider"] == "openai-grounded-v1"
+    assert data["fallback_reason"] is None
+    assert data["word_count"] <= 300
+    assert data["draft"].startswith(card.actions[0])
+
+
+def test_word_limit_variants_come_from_one_generation(monkeypatch):
+    card = evidence_card()
+    calls = []
+
+    def draft(*args, **kwargs):
+        calls.append(args[5])
+        return [_paragraph(card, 0, " ".join([card.actions[0]] + [FILLER] * 20))], "ok"
+
+    monkeypatch.setattr("routes.application_builder.semantic_application_draft", draft)
+    payload = {
+        "job": {"title": "Operations Officer"},
+        "word_limits": [500, 150, 250],
+        "requirements": [{"text": "Make evidence-based recommendations", "category": "essential", "match_strength": "strong", "evidence_ids": [card.id]}],
+        "evidence_cards": [card.model_dump()],
+    }
+
+    data = client.post("/application-builder", headers=HEADERS, json=payload).json()
+
+    assert calls == [500]
+    assert data["word_limit"] == 500
+    assert [variant["word_limit"] for variant in data["variants"]] == [150, 250, 500]
+    assert all(variant["provider"] == "openai-grounded-v1" for variant in data["variants"])
+    assert all(variant["word_count"] <= variant["word_limit"] for variant in data["variants"])
+    assert data["variants"][0]["word_count"] < data["variants"][1]["word_count"] < data["variants"][2]["word_count"]
+    assert data["variants"][2]["draft"] == data["draft"]
+    assert all(variant["coverage"][0]["status"] == "covered" for variant in data["variants"])
+
+
+def test_word_limit_variants_fall_back_to_deterministic_drafts(monkeypatch):
+    card = evidence_card()
+    monkeypatch.setattr("routes.application_builder.semantic_application_draft", lambda *args, **kwargs: (None, "no_api_key"))
+    payload = {
+        "job": {"title": "Operations Officer"},
+        "word_limits": [150, 300],
+        "requirements": [{"text": "Make evidence-based recommendations", "category": "essential", "match_strength": "strong", "evidence_ids": [card.id]}],
+        "evidence_cards": [card.model_dump()],
+    }
+
+    data = client.post("/application-builder", headers=HEADERS, json=payload).json()
+
+    assert [(variant["provider"], variant["fallback_reason"]) for variant in data["variants"]] == [
+        ("deterministic-grounded-v2", "no_api_key"),
+        ("deterministic-grounded-v2", "no_api_key"),
+    ]
+    assert client.post("/application-builder", headers=HEADERS, json={**payload, "word_limits": [100]}).status_code == 422
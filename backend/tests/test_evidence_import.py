@@ -0,0 +1,215 @@
+"""Tests for bulk Evidence Bank import."""
+
+from __future__ import annotations
+
+import json
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from lib.settings import settings
+from routes import evidence_bank
+from tests.helpers import VACANCY_AS_EVIDENCE
+
+client = TestClient(app)
+HEADERS = {"Authorization": "Bearer valid_token"}
+
+
+class FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeCards:
+    def __init__(self):
+        self.rows = []
+        self.executes = 0
+        self.payload = []
+
+    def table(self, name):
+        assert name == "evidence_cards"
+        return self
+
+    def insert(self, payload):
+        self.payload = payload
+        return self
+
+    def execute(self):
+        self.executes += 1
+        inserted = [{"id": f"ev-{len(self.rows) + offset}", **row} for offset, row in enumerate(self.payload, start=1)]
+        self.rows.extend(inserted)
+        return FakeResult(inserted)
+
+
+def _card(number: int, **overrides):
+    return {
+        "title": f"Card {number}",
+        "task": "Keep casework moving during a backlog",
+        "actions": ["Triaged the queue", "Set up a daily stand-up"],
+        "outcome": "Cleared the backlog in six weeks",
+        "tags": ["casework"],
+        **overrides,
+    }
+
+
+def test_import_requires_authentication():
+    response = client.post("/evidence/import", json=[_card(1)])
+
+    assert response.status_code == 401
+
+
+def test_import_inserts_500_cards_in_few_round_trips(monkeypatch):
+    fake = FakeCards()
+    monkeypatch.setattr(evidence_bank, "get_supabase_client", lambda: fake)
+    monkeypatch.setattr(settings, "EVIDENCE_IMPORT_BATCH_SIZE", 200)
+
+    response = client.post("/evidence/import", json=[_card(number) for number in range(500)], headers=HEADERS)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["imported"] == 500 and body["failed"] == 0
+    assert fake.executes == 3
+    assert [result["row"] for result in body["results"]] == list(range(1, 501))
+    assert body["results"][0] == {"row": 1, "ok": True, "id": "ev-1"}
+    assert all(row["user_id"] == "user_123" for row in fake.rows)
+
+
+def test_import_reports_bad_and_contaminated_rows_without_blocking_others(monkeypatch):
+    fake = FakeCards()
+    monkeypatch.setattr(evidence_bank, "get_supabase_client", lambda: fake)
+    rows = [
+        _card(1),
+        _card(2, title=""),
+        "not a card",
+        {**VACANCY_AS_EVIDENCE, "actions": ["Pasted the advert"]},
+        _card(5, confidence=150),
+        _card(6),
+    ]
+
+    body = client.post("/evidence/import", json=rows, headers=HEADERS).json()
+
+    assert [result["ok"] for result in body["results"]] == [True, False, False, False, False, True]
+    assert body["results"][1]["error"].startswith("invalid title")
+    assert body["results"][2]["error"] == "invalid row: expected an object"
+    assert body["results"][3]["error"] == "looks_like_vacancy_advert"
+    assert body["results"][4]["error"].startswith("invalid confidence")
+    assert [row["title"] for row in fake.rows] == ["Card 1", "Card 6"]
+    assert fake.executes == 1
+
+
+def test_import_accepts_csv_with_list_cells(monkeypatch):
+    fake = FakeCards()
+    monkeypatch.setattr(evidence_bank, "get_supabase_client", lambda: fake)
+    csv_body = (
+        "Title,Task,Actions,Tags,Confidence\n"
+        'Backlog,Clear casework,"Triaged the queue|Set up a stand-up",casework,80\n'
+        '"Stakeholders",Align partners,"Ran workshops\nAgreed a plan",,\n'
+    )
+
+    response = client.post(
+        "/evidence/import",
+        content=csv_body.encode(),
+        headers={**HEADERS, "Content-Type": "text/csv"},
+    )
+
+    body = response.json()
+    assert body["imported"] == 2
+    assert fake.rows[0]["actions"] == ["Triaged the queue", "Set up a stand-up"]
+    assert fake.rows[0]["tags"] == ["casework"] and fake.rows[0]["confidence"] == 80
+    assert fake.rows[1]["actions"] == ["Ran workshops", "Agreed a plan"]
+
+
+def test_import_reports_insert_failure_per_row(monkeypatch, caplog):
+    class FailingCards(FakeCards):
+        def execute(self):
+            raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(evidence_bank, "get_supabase_client", lambda: FailingCards())
+
+    body = client.post("/evidence/import", json=[_card(1), _card(2, title="")], headers=HEADERS).json()
+
+    assert body["results"][0] == {"row": 1, "ok": False, "error": "insert_failed"}
+    assert body["results"][1]["error"].startswith("invalid title")
+    assert "Evidence import insert of 1 cards failed" in caplog.text
+
+
+def test_import_rejects_non_array_json(monkeypatch):
+    monkeypatch.setattr(evidence_bank, "get_supabase_client", lambda: FakeCards())
+
+    response = client.post("/evidence/import", content=json.dumps({"title": "x"}), headers=HEADERS)
+
+    assert response.status_code == 400
+
+
+def test_import_refuses_oversized_uploads(monkeypatch):
+    fake = FakeCards()
+    monkeypatch.setattr(evidence_bank, "get_supabase_client", lambda: fake)
+    monkeypatch.setattr(evidence_bank, "_MAX_IMPORT_BYTES", 1000)
+    declared = client.post(
+        "/evidence/import",
+        content=json.dumps([_card(number) for number in range(20)]),
+        headers=HEADERS,
+    )
+    streamed = client.post(
+        "/evidence/import",
+        content=iter([b"[", b" " * 600, b" " * 600, b"]"]),
+        headers=HEADERS,
+    )
+
+    assert declared.status_code == 413 and streamed.status_code == 413
+    assert fake.executes == 0
+
+
+def test_a_row_the_database_rejects_does_not_fail_its_batch(monkeypatch):
+    class RejectingCards(FakeCards):
+        def execute(self):
+            if any(row["title"] == "Card 3" for row in self.payload):
+                self.executes += 1
+                raise RuntimeError("violates check constraint")
+            return super().execute()
+
+    fake = RejectingCards()
+    monkeypatch.setattr(evidence_bank, "get_supabase_client", lambda: fake)
+
+    body = client.post("/evidence/import", json=[_card(number) for number in range(1, 9)], headers=HEADERS).json()
+
+    assert [result["ok"] for result in body["results"]] == [True, True, False, True, True, True, True, True]
+    assert body["results"][2] == {"row": 3, "ok": False, "error": "insert_failed"}
+    assert sorted(row["title"] for row in fake.rows) == [f"Card {number}" for number in (1, 2, 4, 5, 6, 7, 8)]
+
+
+def _chunked(data: bytes, size: int):
+    return iter([data[start : start + size] for start in range(0, len(data), size)])
+
+
+def test_uploads_are_parsed_and_inserted_batch_by_batch_as_they_arrive(monkeypatch):
+    fake = FakeCards()
+    monkeypatch.setattr(evidence_bank, "get_supabase_client", lambda: fake)
+    monkeypatch.setattr(settings, "EVIDENCE_IMPORT_BATCH_SIZE", 2)
+    cards = [_card(number, task=f"Task {number} with a number 12{number}") for number in range(5)]
+    csv_body = "title,task,actions\n" + "".join(
+        f'Card {number},"Said ""yes""\nthen acted","First|Second"\r\n' for number in range(5)
+    )
+
+    from_json = client.post("/evidence/import", content=_chunked(json.dumps(cards).encode(), 7), headers=HEADERS).json()
+    from_csv = client.post(
+        "/evidence/import",
+        content=_chunked(csv_body.encode(), 5),
+        headers={**HEADERS, "Content-Type": "text/csv"},
+    ).json()
+
+    assert from_json["imported"] == 5 and from_csv["imported"] == 5
+    assert [row["task"] for row in fake.rows[:5]] == [card["task"] for card in cards]
+    assert fake.rows[5]["task"] == 'Said "yes"\nthen acted' and fake.rows[5]["actions"] == ["First", "Second"]
+    assert fake.executes == 6
+
+
+def test_an_upload_that_breaks_off_keeps_the_rows_before_it(monkeypatch):
+    fake = FakeCards()
+    monkeypatch.setattr(evidence_bank, "get_supabase_client", lambda: fake)
+    body = json.dumps([_card(1), _card(2)])[:-1] + ', {"title": '
+
+    data = client.post("/evidence/import", content=body, headers=HEADERS).json()
+
+    assert data["imported"] == 2
+    assert data["stopped"] == "Import must be a JSON array or CSV with a header row"
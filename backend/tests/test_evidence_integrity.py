@@ -1,7 +1,15 @@
+import random
+
 import pytest
 from fastapi import HTTPException
 
-from routes.evidence_bank import _looks_like_vacancy_text, _reject_vacancy_contamination
+from routes.evidence_bank import (
+    _combined_evidence_text,
+    _looks_like_vacancy_text,
+    _reject_vacancy_contamination,
+    _vacancy_flags,
+)
+from tests.helpers import VACANCY_AS_EVIDENCE
 
 
 GOOD_EVIDENCE = {
@@ -16,28 +24,6 @@ GOOD_EVIDENCE = {
     "reflection": "I learned to verify assumptions using independent information.",
 }
 
-VACANCY_AS_EVIDENCE = {
-    "title": "Counter Fraud Investigation Officer Home Office Role summary",
-    "situation": """
-Role summary
-We are looking for an Investigation Officer who can analyse complex information.
-Eligibility
-Applicants must have the right to work in the UK.
-Essential criteria
-You must be able to make timely evidence-based decisions.
-Desirable criteria
-Previous investigation experience is desirable.
-Trainable requirements
-Successful candidates will receive training.
-Practical requirements
-The role requires regular office attendance.
-""",
-    "task": "",
-    "actions": [],
-    "outcome": "",
-    "reflection": "",
-}
-
 
 def test_genuine_personal_evidence_is_allowed():
     assert _looks_like_vacancy_text(GOOD_EVIDENCE) is False
@@ -58,4 +44,71 @@ def test_single_candidate_phrase_does_not_false_positive():
     evidence = dict(GOOD_EVIDENCE)
     evidence["reflection"] = "I wanted the successful candidate experience to be clear when presenting my evidence."
 
-    assert _looks_like_vacancy_text(evidence) is False
\ No newline at end of file
+    assert _looks_like_vacancy_text(evidence) is False
+
+
+# The marker sets as they stood before being hoisted, so a dropped or moved
+# marker in the route module fails the comparison below.
+REFERENCE_SECTION_MARKERS = {
+    "role summary",
+    "job summary",
+    "essential criteria",
+    "essential requirements",
+    "desirable criteria",
+    "trainable requirements",
+    "practical requirements",
+    "eligibility",
+}
+REFERENCE_CANDIDATE_MARKERS = {
+    "successful candidate",
+    "successful applicant",
+    "applicants must",
+    "we are looking for",
+}
+REFERENCE_VACANCY_MARKERS = REFERENCE_SECTION_MARKERS | REFERENCE_CANDIDATE_MARKERS | {
+    "application closing date",
+    "salary minimum",
+    "salary maximum",
+}
+
+
+def _per_marker_scan(payload: dict) -> bool:
+    text = _combined_evidence_text(payload)
+    matches = {marker for marker in REFERENCE_VACANCY_MARKERS if marker in text}
+    return len(matches) >= 3 or (
+        len(matches & REFERENCE_SECTION_MARKERS) >= 2 and bool(matches & REFERENCE_CANDIDATE_MARKERS)
+    )
+
+
+def _random_payloads() -> list[dict]:
+    rng = random.Random(49)
+    words = sorted(REFERENCE_VACANCY_MARKERS) + ["I led the review", "Eligibility", "and", "SALARY MINIMUM", "role", "summary", "\n"]
+    return [GOOD_EVIDENCE, VACANCY_AS_EVIDENCE] + [
+        {"title": "Example", "situation": " ".join(rng.choice(words) for _ in range(rng.randint(0, 8))), "actions": [rng.choice(words)]}
+        for _ in range(300)
+    ]
+
+
+def test_batch_flags_match_a_per_marker_scan():
+    payloads = _random_payloads()
+
+    flags = _vacancy_flags(payloads)
+
+    assert flags == [_per_marker_scan(payload) for payload in payloads]
+    assert any(flags[2:]) and not all(flags[2:])
+
+
+def test_batch_and_single_card_checks_agree():
+    payloads = _random_payloads()
+
+    assert _vacancy_flags(payloads) == [_looks_like_vacancy_text(payload) for payload in payloads]
+
+
+def test_markers_in_neighbouring_cards_are_not_combined():
+    cards = [
+        {"title": "Role summary", "situation": "Essential criteria"},
+        {"title": "We are looking for", "situation": "Desirable criteria"},
+    ]
+
+    assert _vacancy_flags(cards) == [False, False]
+    assert _vacancy_flags([]) == []
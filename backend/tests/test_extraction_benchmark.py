@@ -0,0 +1,32 @@
+from devtools.extraction_benchmark import BASELINE_PATH, SIZES, compare, generate_corpus, run_benchmarks
+
+
+def test_corpus_is_reproducible_and_sized():
+    corpus = generate_corpus(seed=3, adverts_per_size=2)
+
+    assert corpus == generate_corpus(seed=3, adverts_per_size=2)
+    for size, adverts in corpus.items():
+        assert all(SIZES[size] * 0.9 <= len(advert) <= SIZES[size] for advert in adverts)
+
+
+def test_benchmarks_report_every_metric():
+    corpus = {"small": generate_corpus(adverts_per_size=1)["small"]}
+
+    results = run_benchmarks(corpus, repeats=1)
+
+    assert set(results) == {"deterministic_extract/small", "reconcile_items/small", "is_non_requirement_text/small"}
+    assert all(set(metrics) == {"lines_per_sec", "p50_ms", "p99_ms", "peak_alloc_kib"} for metrics in results.values())
+
+
+def test_regressions_are_judged_on_calibrated_throughput():
+    baseline = {"calibration_ops_per_sec": 100.0, "results": {"deterministic_extract/large": {"lines_per_sec": 1000.0}}}
+
+    # Half-speed machine, half the throughput: not a regression.
+    assert compare({"deterministic_extract/large": {"lines_per_sec": 500.0}}, 50.0, baseline, 0.25) == []
+    assert compare({"deterministic_extract/large": {"lines_per_sec": 600.0}}, 100.0, baseline, 0.25) == [
+        "deterministic_extract/large: 60% of baseline throughput"
+    ]
+
+
+def test_baselines_are_committed():
+    assert BASELINE_PATH.exists()
@@ -0,0 +1,63 @@
+import random
+import re
+
+from lib import application_grounding
+from lib.application_grounding import GroundingIndex, _numeric_keys, _numeric_mentions, validate_ai_paragraph_detailed
+from tests.helpers import evidence_with_duration
+
+FACT_TEXTS = [
+    "The operation continued for approximately 18 hours.",
+    "Reduced backlog by 35% across 4 teams in 2.5 weeks.",
+    "Handled 120 cases, 18-hour shifts and a £3,000 budget.",
+    "No numbers here at all.",
+]
+PARAGRAPH = "Over 18 hours I led 4 teams, cut the backlog by 35% and closed 120 cases in 2.5 weeks with 18 arrests."
+
+
+def _supports_per_number(text: str, number: str, unit: str) -> bool:
+    """The original per-call check: compile a pattern for ``number`` and scan ``text``."""
+    if number not in set(re.findall(r"(?<![A-Za-z])\d+(?:[.,]\d+)?%?", text)):
+        return False
+    if not unit or number.endswith("%"):
+        return True
+    pattern = re.compile(rf"(?<![A-Za-z]){re.escape(number)}\s*[-–]?\s*([A-Za-z]+)")
+    return any(match.group(1).rstrip("s") == unit for match in pattern.finditer(text.lower()))
+
+
+def test_numeric_keys_agree_with_per_number_check():
+    rng = random.Random(42)
+    pieces = ["18", "2.5", "35%", "4", "120", "3,000", "x", " ", "-", "–", "hours", "hour", "Weeks", "teams", "A", "."]
+    texts = FACT_TEXTS + ["".join(rng.choice(pieces) for _ in range(12)) for _ in range(300)]
+    for text in texts:
+        keys = _numeric_keys(text)
+        for number, unit in _numeric_mentions(PARAGRAPH + " " + text):
+            assert ((number, unit) in keys) == _supports_per_number(text, number, unit), (text, number, unit)
+
+
+def test_substring_check_does_not_span_separate_values():
+    card = evidence_with_duration()
+    card.actions = ["I compared the operational risks", "consulted affected colleagues"]
+    grounding = GroundingIndex({card.id: card}).card(card.id)
+
+    assert grounding.contains("actions", "compared the  OPERATIONAL risks")
+    assert not grounding.contains("actions", "risks consulted affected")
+    assert not grounding.contains("reflection", "compared")
+
+
+def test_shared_index_builds_each_card_once(monkeypatch):
+    card = evidence_with_duration()
+    calls = []
+    original = application_grounding.card_facts
+    monkeypatch.setattr(application_grounding, "card_facts", lambda value: calls.append(value) or original(value))
+    raw = {
+        "text": "I compared the operational risks, and the operation continued for approximately 18 hours.",
+        "requirement_indices": [0],
+        "evidence_ids": [card.id],
+        "supporting_facts": [{"evidence_id": card.id, "field": "actions", "text": card.actions[0]}],
+    }
+    grounding = GroundingIndex({card.id: card})
+
+    results = [validate_ai_paragraph_detailed(raw, {card.id: card}, 1, grounding) for _ in range(8)]
+
+    assert all(reason == "ok" for _, reason in results)
+    assert len(calls) == 1
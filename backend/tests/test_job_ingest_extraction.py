@@ -0,0 +1,60 @@
+"""Tests for requirement extraction at job ingest."""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from lib.vacancy_extraction import EXTRACTOR_VERSION
+from scrapers.normalize import normalize_job_data, upsert_job
+
+client = TestClient(app)
+
+DESCRIPTION = "Essential criteria:\n- Experience leading a small team\nYou must hold security clearance.\nHybrid working is available.\n"
+
+
+class FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeJobs:
+    def __init__(self):
+        self.payload = None
+
+    def table(self, name):
+        return self
+
+    def upsert(self, payload, on_conflict=None):
+        self.payload = payload
+        return self
+
+    def execute(self):
+        return FakeResult([{"id": 7, **self.payload}])
+
+
+def test_upsert_job_stores_grouped_requirements():
+    store = FakeJobs()
+    job = normalize_job_data({"title": "Team Leader", "description": DESCRIPTION}, "manual")
+
+    stored = asyncio.run(upsert_job(job, store))
+
+    requirements = store.payload["requirements"]
+    assert requirements["version"] == EXTRACTOR_VERSION
+    assert [item["text"] for item in requirements["requirements"]] == ["Experience leading a small team"]
+    assert [item["explicit_blocker"] for item in requirements["eligibility"]] == [True]
+    assert [item["category"] for item in requirements["practical"]] == ["practical"]
+    assert stored["requirements"] == requirements
+
+
+def test_job_without_description_stores_no_requirements():
+    store = FakeJobs()
+    asyncio.run(upsert_job(normalize_job_data({"title": "Team Leader"}, "manual"), store))
+
+    assert store.payload["requirements"] is None
+
+
+def test_job_detail_exposes_requirements():
+    data = client.get("/jobs/1").json()
+
+    assert set(data["requirements"]) == {"version", "eligibility", "requirements", "practical"}
@@ -1,16 +1,5 @@
 from backend.lib.application_grounding import validate_ai_paragraph
-from backend.routes.application_builder import ApplicationEvidence
-
-
-def evidence_with_duration() -> ApplicationEvidence:
-    return ApplicationEvidence(
-        id="ev-duration",
-        title="Operational examination",
-        task="I assessed the available options and made a recommendation.",
-        actions=["I compared the operational risks and consulted affected colleagues."],
-        outcome="Access was achieved and the extraction operation continued for approximately 18 hours.",
-        authority_context="I made a recommendation; final approval remained with the senior manager.",
-    )
+from tests.helpers import evidence_with_duration
 
 
 def test_validator_repairs_omitted_numeric_fact_from_same_evidence_card():
@@ -0,0 +1,95 @@
+from fastapi.testclient import TestClient
+
+from devtools.openai_standin import StandinConfig, create_app
+from lib.application_ai import grouped_semantic_application_draft, semantic_application_draft
+from lib.evidence_semantic_batch import semantic_assess_batch
+from lib.vacancy_ai import semantic_extract
+from routes.application_builder import ApplicationEvidence, ApplicationRequirement
+from tests.helpers import VACANCY
+
+
+def evidence_card() -> ApplicationEvidence:
+    return ApplicationEvidence(
+        id="ev-1",
+        title="Operational review",
+        task="I was responsible for assessing the available options and making a recommendation.",
+        actions=["I checked the available information and compared the operational risks."],
+        outcome="The recommendation was accepted and the work was completed safely.",
+        authority_context="I made the recommendation; final approval remained with the senior manager.",
+    )
+
+
+def test_vacancy_extraction_round_trips_through_standin(standin):
+    standin()
+    items = semantic_extract(VACANCY)
+
+    assert items
+    assert all(item["source_text"] in VACANCY for item in items)
+
+
+def test_application_draft_round_trips_through_standin(standin):
+    standin()
+    card = evidence_card()
+    requirements = [ApplicationRequirement(text="Make evidence-based recommendations", match_strength="strong", evidence_ids=[card.id])]
+
+    paragraphs, status = semantic_application_draft(requirements, {card.id: card}, "Officer", "", "statement_of_suitability", 300)
+
+    assert status == "ok"
+    assert paragraphs and paragraphs[0]["grounding_status"] == "grounded"
+
+
+def test_batch_assessment_round_trips_through_standin(standin):
+    standin()
+    card = evidence_card()
+
+    result = semantic_assess_batch([(0, "Make evidence-based recommendations", [card])])
+
+    assert result is not None
+    assert result[0][card.id]["strength"] == "partial"
+
+
+def test_injected_errors_surface_as_semantic_fallbacks(standin):
+    standin(StandinConfig(error_rate=1.0, error_status=429))
+    card = evidence_card()
+    requirements = [ApplicationRequirement(text="Make evidence-based recommendations", match_strength="strong", evidence_ids=[card.id])]
+
+    assert semantic_extract(VACANCY) is None
+    _, status = semantic_application_draft(requirements, {card.id: card}, "Officer", "", "statement_of_suitability", 300)
+    assert status == "openai_RateLimitError"
+
+
+def test_latency_distributions_are_reproducible_with_seed():
+    first = StandinConfig(latency="lognormal:200,0.6", seed=7)
+    second = StandinConfig(latency="lognormal:200,0.6", seed=7)
+    samples = [first.sample_latency() for _ in range(5)]
+
+    assert samples == [second.sample_latency() for _ in range(5)]
+    assert StandinConfig(latency="fixed:250").sample_latency() == 0.25
+    assert all(0.1 <= StandinConfig(latency="uniform:100,300", seed=seed).sample_latency() <= 0.3 for seed in range(5))
+
+
+def test_config_can_be_changed_while_running():
+    client = TestClient(create_app(StandinConfig()))
+    updated = client.post("/_standin/config", json={"error_rate": 1.0, "unknown": True}).json()
+
+    assert updated["error_rate"] == 1.0
+    assert "unknown" not in updated
+    assert client.post("/v1/chat/completions", json={"messages": []}).status_code == 500
+
+
+def test_grouped_drafting_round_trips_through_standin(standin):
+    standin()
+    card = evidence_card()
+    other = evidence_card()
+    other.id = "ev-2"
+    requirements = [
+        ApplicationRequirement(text="Make evidence-based recommendations", match_strength="strong", evidence_ids=[card.id]),
+        ApplicationRequirement(text="Assess operational risk", match_strength="strong", evidence_ids=[other.id]),
+    ]
+
+    paragraphs, status, fallbacks = grouped_semantic_application_draft(
+        requirements, {card.id: card, other.id: other}, "Officer", "", "statement_of_suitability", 300
+    )
+
+    assert (status, fallbacks) == ("ok", 0)
+    assert sorted(index for paragraph in paragraphs for index in paragraph["requirement_indices"]) == [0, 1]
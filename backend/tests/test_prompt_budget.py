@@ -0,0 +1,97 @@
+from lib.application_ai import _fact_catalog
+from lib.prompt_budget import (
+    combine_reports,
+    compact_evidence_cards,
+    compact_fact_cards,
+    compact_vacancy_text,
+    estimate_tokens,
+)
+from lib.vacancy_extraction import deterministic_extract
+from routes.application_builder import ApplicationEvidence
+from tests.helpers import MESSY_CIVIL_SERVICE_VACANCY
+
+
+def evidence_card() -> ApplicationEvidence:
+    return ApplicationEvidence(
+        id="ev-1",
+        title="Operational review",
+        situation="A long-running operational review covering several regional teams and suppliers. " * 6,
+        task="I was responsible for assessing the available options and making a recommendation.",
+        actions=["I checked the available information and compared the operational risks."],
+        outcome="The review finished 3 weeks early.",
+        reflection="I learned to brief stakeholders before the formal meeting. " * 4,
+        tags=["review", "operations", "suppliers", "regional", "governance", "assurance"],
+        skills=["risk analysis", "stakeholder engagement"],
+    )
+
+
+def test_estimate_tokens_counts_text_and_payloads():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd" * 10) == 10
+    assert estimate_tokens({"a": "b"}) == estimate_tokens('{"a": "b"}')
+
+
+def test_fact_catalog_under_budget_is_returned_unchanged():
+    card = evidence_card()
+    cards, _ = _fact_catalog({card.id: card}, {card.id})
+    compacted, report = compact_fact_cards(cards, {card.id: "Assess operational risk"}, 100000)
+    assert compacted is cards
+    assert report["tokens_saved"] == 0
+
+
+def test_fact_catalog_compaction_keeps_citable_facts_and_stable_ids():
+    card = evidence_card()
+    cards, lookup = _fact_catalog({card.id: card}, {card.id})
+    compacted, report = compact_fact_cards(cards, {card.id: "Assess operational risk"}, 300)
+
+    kept = {fact["fact_id"]: fact for fact in compacted[0]["facts"]}
+    assert report["tokens_saved"] > 0
+    assert report["tokens_after"] < report["tokens_before"]
+    assert all(fact_id in lookup for fact_id in kept)
+    assert {fact["field"] for fact in kept.values()} >= {"task", "actions", "outcome"}
+    assert "ev-1:skills:0" in kept
+    assert not any(fact["field"] == "tags" for fact in kept.values())
+
+
+def test_fact_catalog_is_reused_until_the_card_changes():
+    first, _ = _fact_catalog({"ev-1": evidence_card()}, {"ev-1"})
+    again, _ = _fact_catalog({"ev-1": evidence_card()}, {"ev-1"})
+    edited_card = evidence_card()
+    edited_card.outcome = "The review finished 4 weeks early."
+    edited, lookup = _fact_catalog({"ev-1": edited_card}, {"ev-1"})
+
+    assert again[0] is first[0]
+    assert edited[0] is not first[0]
+    assert lookup["ev-1:outcome:0"]["text"] == edited_card.outcome
+    assert [fact["fact_id"] for fact in edited[0]["facts"]] == [fact["fact_id"] for fact in first[0]["facts"]]
+
+
+def test_evidence_card_compaction_drops_whole_low_relevance_fields():
+    card = evidence_card().model_dump()
+    compacted, report = compact_evidence_cards([card], "Assess operational risk", 120)
+
+    assert report["dropped"] >= 1
+    assert compacted[0]["actions"] == card["actions"]
+    assert compacted[0]["task"] == card["task"]
+    assert all(compacted[0][key] == card[key] for key in compacted[0])
+
+
+def test_vacancy_compaction_drops_admin_sections_but_keeps_criteria():
+    text, report = compact_vacancy_text(MESSY_CIVIL_SERVICE_VACANCY, 500)
+
+    assert report["tokens_saved"] > 0
+    assert "Selection process details" not in text
+    for item in deterministic_extract(MESSY_CIVIL_SERVICE_VACANCY):
+        assert item["source_text"] in text
+
+
+def test_reports_for_one_request_add_up():
+    card = evidence_card().model_dump()
+    _, first = compact_evidence_cards([card], "Assess operational risk", 120)
+    _, second = compact_vacancy_text(MESSY_CIVIL_SERVICE_VACANCY, 500)
+
+    total = combine_reports([first, second])
+
+    assert total["tokens_saved"] == first["tokens_saved"] + second["tokens_saved"]
+    assert total["tokens_before"] == first["tokens_before"] + second["tokens_before"]
+    assert total["dropped"] == first["dropped"] + second["dropped"]
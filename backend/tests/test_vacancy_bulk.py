@@ -0,0 +1,66 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from lib import job_queue, vacancy_bulk
+from lib.job_queue import JobQueue
+from lib.settings import settings
+from lib.vacancy_bulk import bulk_extract, main
+from lib.vacancy_extraction import deterministic_extract
+from tests.helpers import VACANCY
+
+client = TestClient(app)
+HEADERS = {"Authorization": "Bearer valid_token"}
+
+
+@pytest.fixture
+def queue(monkeypatch, tmp_path):
+    local = JobQueue(str(tmp_path / "jobs.sqlite3"), max_workers=1)
+    monkeypatch.setattr(job_queue, "_queue", local)
+    yield local
+    local.close()
+
+
+def test_process_pool_results_match_serial_extraction_in_order(monkeypatch):
+    monkeypatch.setattr(vacancy_bulk, "_POOL_MIN_BATCH", 0)
+    entries = [(str(index), VACANCY if index % 2 else "Essential criteria:\n- Lead a team\n") for index in range(12)]
+
+    pooled = list(bulk_extract(entries, workers=2, chunksize=3))
+
+    assert [result["id"] for result in pooled] == [key for key, _ in entries]
+    assert [result["items"] for result in pooled] == [deterministic_extract(text) for _, text in entries]
+
+
+def test_failed_adverts_do_not_abort_the_batch():
+    results = list(bulk_extract([("a", ""), ("b", VACANCY), ("c", "x" * 30001)], workers=1))
+
+    assert [(result["id"], result["ok"]) for result in results] == [("a", False), ("b", True), ("c", False)]
+    assert results[2]["error"] == "vacancy_text_too_long"
+
+
+def test_bulk_endpoint_streams_ndjson_and_queues_semantic_subset(monkeypatch, queue):
+    monkeypatch.setattr(settings, "BULK_EXTRACTION_WORKERS", 1)
+    monkeypatch.setattr("routes.vacancy_intelligence.semantic_extract", lambda text: None)
+    payload = {"vacancies": [{"id": "a", "vacancy_text": VACANCY}, {"id": "b", "vacancy_text": ""}, {"id": "c", "vacancy_text": VACANCY + "\n"}], "semantic_limit": 1}
+
+    response = client.post("/vacancy-intelligence/bulk", headers=HEADERS, json=payload)
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line.get("id") for line in lines] == ["a", "b", "c", None]
+    assert lines[-1] == {"type": "done", "total": 3, "failed": 1}
+    assert "semantic_job_id" in lines[0] and "semantic_job_id" not in lines[2]
+    status = client.get(f"/vacancy-intelligence/jobs/{lines[0]['semantic_job_id']}", headers=HEADERS)
+    assert status.status_code == 200
+    assert client.get("/vacancy-intelligence/jobs/missing", headers=HEADERS).status_code == 404
+
+
+def test_cli_reads_ndjson_and_writes_results(tmp_path, capsys):
+    source = tmp_path / "adverts.ndjson"
+    source.write_text(json.dumps({"id": "a", "vacancy_text": VACANCY}) + "\nnot json\n")
+
+    assert main(["--input", str(source), "--workers", "1"]) == 0
+
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(result["id"], result["ok"]) for result in results] == [("a", True), ("line-2", False)]
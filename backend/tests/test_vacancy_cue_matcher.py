@@ -0,0 +1,34 @@
+import random
+
+from lib.vacancy_extraction import _CUES_BY_KIND, _CUE_KINDS, _cue_kinds, deterministic_extract
+
+
+def _naive_kinds(lowered: str) -> set[str]:
+    return {kind for kind, cues in _CUES_BY_KIND.items() if any(cue in lowered for cue in cues)}
+
+
+def test_single_pass_matcher_agrees_with_per_cue_scans():
+    rng = random.Random(31)
+    vocabulary = list(_CUE_KINDS) + "the you must uk only open work right security training will be per".split()
+    for _ in range(5000):
+        line = rng.choice([" ", ""]).join(rng.choice(vocabulary) for _ in range(rng.randint(0, 8)))
+        assert _cue_kinds(line) == _naive_kinds(line), line
+
+
+def test_overlapping_cues_report_every_kind():
+    assert _cue_kinds("you must have the right to work in the uk") == {"eligibility", "blocker"}
+    assert _cue_kinds("full training provided; uk security vetting applies") == {"trainable", "eligibility", "blocker"}
+
+
+def test_cue_precedence_is_unchanged():
+    items = deterministic_extract(
+        "Security clearance training will be provided.\n"
+        "You must hold security clearance.\n"
+        "Hybrid working with office attendance twice a week.\n"
+    )
+
+    assert [(item["category"], item["explicit_blocker"]) for item in items] == [
+        ("trainable", False),
+        ("eligibility", True),
+        ("practical", False),
+    ]
@@ -0,0 +1,157 @@
+"""Tests for the shared vacancy extraction store."""
+
+from __future__ import annotations
+
+import uuid
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from lib import vacancy_cache
+from lib.settings import settings
+from lib.vacancy_incremental import changed_region
+from tests.helpers import VACANCY
+
+client = TestClient(app)
+HEADERS = {"Authorization": "Bearer valid_token"}
+
+
+class FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeExtractions:
+    def __init__(self):
+        self.rows = []
+        self.filters = []
+        self.payload = None
+
+    def table(self, name):
+        assert name == "vacancy_extractions"
+        return self
+
+    def select(self, *args, **kwargs):
+        self.payload = None
+        self.filters = []
+        return self
+
+    def eq(self, field, value):
+        self.filters.append((field, value))
+        return self
+
+    def upsert(self, payload, on_conflict=""):
+        self.payload = payload
+        return self
+
+    def execute(self):
+        if self.payload is None:
+            return FakeResult([dict(row) for row in self.rows if all(row.get(f) == v for f, v in self.filters)])
+        row = {"id": str(uuid.uuid4()), **self.payload}
+        self.rows.append(row)
+        return FakeResult([row])
+
+
+def _install(monkeypatch) -> FakeExtractions:
+    store = FakeExtractions()
+    monkeypatch.setattr(vacancy_cache, "get_supabase_client", lambda: store)
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", None)
+    return store
+
+
+def test_repeat_advert_is_served_from_the_store(monkeypatch):
+    store = _install(monkeypatch)
+    calls = []
+    monkeypatch.setattr("routes.vacancy_intelligence.deterministic_extract", lambda text: calls.append(text) or [])
+
+    first = client.post("/vacancy-intelligence", headers=HEADERS, json={"vacancy_text": VACANCY}).json()
+    second = client.post("/vacancy-intelligence", headers=HEADERS, json={"vacancy_text": "\r\n" + VACANCY.replace("\n", "  \r\n")}).json()
+
+    assert len(calls) == 1
+    assert len(store.rows) == 1
+    assert first["cached"] is False and second["cached"] is True
+    assert second["extraction_id"] == first["extraction_id"]
+    assert second["requirements"] == first["requirements"]
+
+
+def test_extractor_version_is_part_of_the_key(monkeypatch):
+    store = _install(monkeypatch)
+    client.post("/vacancy-intelligence", headers=HEADERS, json={"vacancy_text": VACANCY})
+    monkeypatch.setattr("routes.vacancy_intelligence._RECONCILER_VERSION", "reconcile-next")
+
+    data = client.post("/vacancy-intelligence", headers=HEADERS, json={"vacancy_text": VACANCY}).json()
+
+    assert data["cached"] is False
+    assert len({row["extractor_version"] for row in store.rows}) == 2
+
+
+def test_failed_semantic_extraction_is_not_stored(monkeypatch):
+    store = _install(monkeypatch)
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr("routes.vacancy_intelligence.semantic_extract", lambda text: None)
+
+    data = client.post("/vacancy-intelligence", headers=HEADERS, json={"vacancy_text": VACANCY}).json()
+
+    assert data["provider"] == "deterministic-v2"
+    assert data["extraction_id"] is None
+    assert store.rows == []
+
+
+ADVERT_LINES = [
+    "Job summary",
+    "We are hiring an operations officer.",
+    "Essential criteria:",
+    "- Experience leading a small team",
+    "- Managing budgets",
+    "Desirable criteria:",
+    "- Experience of procurement",
+    "Working pattern:",
+    "Hybrid working with office attendance twice a week.",
+]
+
+
+def test_edited_advert_is_reextracted_from_the_changed_section_only(monkeypatch):
+    _install(monkeypatch)
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test-key")
+    semantic_calls = []
+    monkeypatch.setattr("routes.vacancy_intelligence.semantic_extract", lambda text: semantic_calls.append(text) or [])
+    first = client.post("/vacancy-intelligence", headers=HEADERS, json={"vacancy_text": "\n".join(ADVERT_LINES)}).json()
+
+    edited = list(ADVERT_LINES)
+    edited[6] = "- Experience of public procurement"
+    second = client.post(
+        "/vacancy-intelligence",
+        headers=HEADERS,
+        json={"vacancy_text": "\n".join(edited), "previous_extraction_id": first["extraction_id"]},
+    ).json()
+
+    assert semantic_calls[-1] == "Desirable criteria:\n- Experience of public procurement"
+    assert second["incremental"]["reextracted_lines"] == 2
+    assert second["incremental"]["reused_items"] == 3
+    full = client.post("/vacancy-intelligence", headers=HEADERS, json={"vacancy_text": "\n".join(edited) + "\n\n"}).json()
+    assert full["cached"] is True
+    assert [item["text"] for item in second["requirements"]] == [
+        "Experience leading a small team",
+        "Managing budgets",
+        "Experience of public procurement",
+    ]
+
+
+def test_removed_heading_reextracts_the_merged_section():
+    edited = ADVERT_LINES[:5] + ADVERT_LINES[6:]
+
+    assert changed_region(ADVERT_LINES, edited) == (2, 6)
+    assert changed_region(ADVERT_LINES, ADVERT_LINES) is None
+
+
+def test_unknown_previous_extraction_falls_back_to_full_extraction(monkeypatch):
+    _install(monkeypatch)
+
+    data = client.post(
+        "/vacancy-intelligence",
+        headers=HEADERS,
+        json={"vacancy_text": "\n".join(ADVERT_LINES), "previous_extraction_id": "missing"},
+    ).json()
+
+    assert data["incremental"] is None
+    assert len(data["requirements"]) == 3
@@ -0,0 +1,69 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from lib.vacancy_extraction import deterministic_extract, iter_extract
+from lib.vacancy_html import HtmlLineConverter, as_vacancy_text, html_to_lines
+
+client = TestClient(app)
+HEADERS = {"Authorization": "Bearer valid_token"}
+
+ADVERT = """
+<html><head><title>Advert</title><style>li { color: red }</style></head><body>
+<h2>Job summary</h2><p>We are looking for a &amp; capable officer.</p>
+<script>document.write("<li>Not a criterion</li>")</script>
+<h3>Essential criteria</h3>
+<ul><li>Experience <strong>leading</strong> a small team</li><li>Managing budgets</li></ul>
+<h3>Things you need to know</h3><p>Apply before 1 May.</p>
+</body></html>
+"""
+
+
+def test_headings_and_bullets_become_extractor_lines():
+    lines = list(html_to_lines([ADVERT]))
+
+    assert "Essential criteria:\n" in lines
+    assert "- Experience leading a small team\n" in lines
+    assert "We are looking for a & capable officer.\n" in lines
+    assert not any("Not a criterion" in line or "color" in line for line in lines)
+
+
+def test_paragraphs_inside_list_items_keep_their_bullet():
+    lines = list(html_to_lines(["<ul><li><p>Experience leading a team</p></li><li></li></ul><p>Apply now</p>"]))
+
+    assert lines == ["- Experience leading a team\n", "Apply now\n"]
+
+
+def test_converted_html_feeds_the_extractor_in_chunks():
+    chunks = [ADVERT[start : start + 7] for start in range(0, len(ADVERT), 7)]
+
+    items = list(iter_extract(html_to_lines(chunks)))
+
+    assert [(item["category"], item["text"]) for item in items] == [
+        ("essential", "Experience leading a small team"),
+        ("essential", "Managing budgets"),
+    ]
+    assert items == deterministic_extract(as_vacancy_text(ADVERT))
+
+
+def test_pending_text_stays_bounded_without_markup():
+    converter = HtmlLineConverter()
+    emitted = [line for _ in range(500) for line in converter.feed("word " * 100)]
+
+    assert emitted and max(len(line) for line in emitted) <= 2000 + 500
+    assert as_vacancy_text("Plain text advert\n- Lead a team\n") == "Plain text advert\n- Lead a team\n"
+
+
+def test_stream_endpoint_accepts_html_uploads():
+    response = client.post(
+        "/vacancy-intelligence/stream",
+        headers={**HEADERS, "Content-Type": "text/html"},
+        content=ADVERT.encode(),
+    )
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["item"]["text"] for event in events if event["type"] == "item"] == [
+        "Experience leading a small team",
+        "Managing budgets",
+    ]
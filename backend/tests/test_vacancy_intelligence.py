@@ -4,82 +4,11 @@ from backend.main import app
 from lib.vacancy_ai import _validate_item
 from lib.vacancy_extraction import deterministic_extract
 from routes.vacancy_intelligence import _reconcile_items
+from tests.helpers import MESSY_CIVIL_SERVICE_VACANCY, VACANCY
 
 client = TestClient(app)
 HEADERS = {"Authorization": "Bearer valid_token"}
 
-VACANCY = """
-Eligibility:
-- Applicants must have the right to work in the UK.
-
-Essential criteria:
-- Experience analysing complex information and making recommendations.
-- You must demonstrate effective stakeholder management.
-
-Desirable:
-- Fraud investigation experience is desirable.
-
-Training:
-- Successful candidates will receive training in the internal casework system.
-- Role-specific legislation and procedures will be taught during training.
-
-Working pattern:
-- The role requires a minimum of 30 hours per week across 4 days.
-"""
-
-MESSY_CIVIL_SERVICE_VACANCY = """
-Job summary
-We believe a positive, open and supportive culture is essential to help everyone deliver their best work.
-
-Responsibilities
-Leading collaboration discussions and campaign activity with partners.
-
-Working patterns
-Due to the business requirements of this role, it is only available on a full-time basis.
-
-Person specification
-Essential criteria
-You must be able to demonstrate experience of:
-Partnership management or stakeholder engagement, influencing internal and external stakeholders at all levels and building and managing productive relationships;
-Sourcing, analysing and prioritising relevant sources of data and insight to inform communications activity;
-Developing and delivering proposals and presentations;
-Leading the development, delivery and evaluation of partnership campaigns designed to drive behaviour change, including working collaboratively with internal and external communications teams; and
-Strong organisational and project management skills; able to manage multiple priorities and deadlines.
-
-Desirable criteria
-Familiarity with public communications in a large complex organisation.
-
-Behaviours
-Working Together
-Making Effective Decisions
-
-Technical skills
-Communications - Implementation
-Communications - Insight
-
-Benefits
-National pay locations: Cardiff, Salford, Sheffield £49,850 - £52,850
-
-Things you need to know
-Artificial intelligence
-Artificial intelligence can be a useful tool to support your application.
-
-Selection process details
-Application – by 30th August 2026.
-Your CV should consist of your career history, qualifications, and skills/experience, including any key achievements in each role.
-The Personal Statement should be aligned to and demonstrate how you meet the skills and experience set out in the essential criteria.
-Sift – from 2nd September 2026.
-Interview – from 23rd September 2026.
-Please note travel expenses incurred by attending an interview will not be reimbursed.
-If you experience problems accessing this advert, please contact recruitment@example.gov.uk.
-
-Breaking Tied Scores
-The behaviour, technical and experience skills have been ranked in order of importance to enable us to differentiate between candidates with tied interview scores.
-
-Additional Security Checks
-As well as successfully obtaining UK Security Vetting clearance, candidates will be subject to a range of additional checks.
-"""
-
 
 def test_deterministic_extraction_groups_grounded_requirements():
     items = deterministic_extract(VACANCY)
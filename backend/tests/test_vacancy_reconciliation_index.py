@@ -0,0 +1,66 @@
+import random
+
+from routes.vacancy_intelligence import _dedupe_items, _is_non_requirement_heading, _normalise, _reconcile_items
+
+WORDS = ["lead", "a", "team", "of", "staff", "security", "clearance", "ab", "x", "manage", "budgets", "!", "essential"]
+CATEGORIES = ["essential", "desirable", "eligibility"]
+
+
+# The pairwise comparison the reconciliation index replaced, kept as the reference.
+def _same_text(left, right):
+    left_text = _normalise(str(left.get("text", "")))
+    right_text = _normalise(str(right.get("text", "")))
+    if not left_text or not right_text:
+        return False
+    return left_text == right_text or left_text in right_text or right_text in left_text
+
+
+def _same_requirement(left, right):
+    if left.get("category") != right.get("category"):
+        return False
+    return _same_text(left, right)
+
+
+def _naive_dedupe(items):
+    deduped = []
+    for candidate in items:
+        if _is_non_requirement_heading(candidate):
+            continue
+        if any(_same_requirement(candidate, existing) for existing in deduped):
+            continue
+        deduped.append(candidate)
+    return deduped
+
+
+def _naive_reconcile(semantic_items, deterministic_items):
+    deterministic_items = _naive_dedupe(deterministic_items)
+    if not semantic_items:
+        return deterministic_items, "deterministic-v2"
+    merged = _naive_dedupe(semantic_items)
+    supplemented = False
+    for candidate in deterministic_items:
+        index = next((i for i, existing in enumerate(merged) if _same_text(candidate, existing)), None)
+        if index is not None:
+            if merged[index].get("category") != candidate.get("category"):
+                merged[index] = candidate
+                supplemented = True
+            continue
+        merged.append(candidate)
+        supplemented = True
+    return _naive_dedupe(merged)[:40], "hybrid-grounded-v4" if supplemented else "openai-grounded-v3"
+
+
+def _items(rng, count):
+    return [
+        {"text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 5))), "category": rng.choice(CATEGORIES), "source": index}
+        for index in range(count)
+    ]
+
+
+def test_indexed_reconciliation_matches_pairwise_reference():
+    rng = random.Random(35)
+    for _ in range(400):
+        semantic = _items(rng, rng.randint(0, 25))
+        deterministic = _items(rng, rng.randint(0, 25))
+        assert _dedupe_items(semantic) == _naive_dedupe(semantic)
+        assert _reconcile_items(semantic, deterministic) == _naive_reconcile(semantic, deterministic)
@@ -0,0 +1,110 @@
+import json
+import logging
+import threading
+import time
+from types import SimpleNamespace
+
+from lib.settings import settings
+from lib.vacancy_ai import _chunk_texts, semantic_extract
+
+SECTIONS = [
+    ("Essential criteria:", ["- Experience leading a small team", "- Managing budgets"]),
+    ("Desirable criteria:", ["- Experience of procurement"]),
+    ("Eligibility:", ["You must hold security clearance."]),
+]
+
+
+def _advert(padding: int) -> str:
+    filler = "\n".join(f"Context sentence {number} about the team and its wider work." for number in range(padding))
+    return "\n".join(f"{heading}\n" + "\n".join(lines) + f"\n{filler}" for heading, lines in SECTIONS)
+
+
+class FakeCompletions:
+    def __init__(self, fail_on: str | None = None, delay: float = 0.0):
+        self.prompts: list[str] = []
+        self.fail_on = fail_on
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def create(self, **kwargs):
+        prompt = kwargs["messages"][-1]["content"]
+        with self.lock:
+            self.prompts.append(prompt)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if self.fail_on and self.fail_on in prompt:
+            raise TimeoutError
+        category = "desirable" if "Desirable" in prompt else "eligibility" if "Eligibility" in prompt else "essential"
+        items = [
+            {"text": line[2:] if line.startswith("- ") else line, "category": category, "source_text": line, "confidence": 0.9}
+            for line in prompt.splitlines()
+            if line.startswith("- ") or "must hold" in line
+        ]
+        items.append({"text": "Invented requirement", "category": "essential", "source_text": "not in the advert", "confidence": 0.9})
+        content = json.dumps({"items": items})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _install(monkeypatch, completions: FakeCompletions) -> None:
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "VACANCY_CHUNK_TOKENS", 400)
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setattr("lib.vacancy_ai.get_openai_client", lambda: client)
+
+
+def test_chunks_follow_section_boundaries():
+    chunks = _chunk_texts(_advert(20), 400)
+
+    assert len(chunks) == 3
+    assert [chunk.splitlines()[0] for chunk in chunks] == [heading for heading, _ in SECTIONS]
+
+
+def test_long_advert_is_extracted_in_parallel_chunks(monkeypatch):
+    completions = FakeCompletions(delay=0.05)
+    _install(monkeypatch, completions)
+
+    items = semantic_extract(_advert(20))
+
+    assert len(completions.prompts) == 3
+    assert completions.peak > 1
+    assert [(item["category"], item["text"]) for item in items] == [
+        ("essential", "Experience leading a small team"),
+        ("essential", "Managing budgets"),
+        ("desirable", "Experience of procurement"),
+        ("eligibility", "You must hold security clearance."),
+    ]
+
+
+def test_failed_chunk_keeps_the_other_chunks(monkeypatch):
+    _install(monkeypatch, FakeCompletions(fail_on="Desirable"))
+
+    items = semantic_extract(_advert(20))
+
+    assert "Experience of procurement" not in [item["text"] for item in items]
+    assert "Managing budgets" in [item["text"] for item in items]
+
+
+def test_short_advert_uses_a_single_call(monkeypatch):
+    completions = FakeCompletions()
+    _install(monkeypatch, completions)
+
+    semantic_extract(_advert(0))
+
+    assert len(completions.prompts) == 1
+
+
+def test_extraction_logs_one_usage_line_for_all_chunks(monkeypatch, caplog):
+    _install(monkeypatch, FakeCompletions())
+
+    with caplog.at_level(logging.INFO, logger="lib.prompt_budget"):
+        semantic_extract(_advert(20))
+
+    usage = [record.getMessage() for record in caplog.records if record.name == "lib.prompt_budget"]
+    assert len(usage) == 1
+    assert usage[0].startswith("Vacancy extraction in 3 chunks: ~")
+    assert " ms" in usage[0]
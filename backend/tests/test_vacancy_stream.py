@@ -0,0 +1,61 @@
+import json
+import random
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from lib.vacancy_extraction import deterministic_extract, iter_extract
+from tests.helpers import VACANCY
+
+client = TestClient(app)
+HEADERS = {"Authorization": "Bearer valid_token"}
+
+
+def _random_chunks(text: str, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    chunks, position = [], 0
+    while position < len(text):
+        size = rng.randint(1, 40)
+        chunks.append(text[position : position + size])
+        position += size
+    return chunks
+
+
+def test_chunked_extraction_matches_whole_text_extraction():
+    for text in (VACANCY, VACANCY.replace("\n", "\r\n")):
+        expected = deterministic_extract(text)
+        for seed in range(25):
+            assert list(iter_extract(_random_chunks(text, seed))) == expected
+
+
+def test_section_state_survives_a_split_heading_line():
+    chunks = ["Essential crit", "eria:\r", "\n- Build trusted relationships with partners", "\n"]
+
+    items = list(iter_extract(chunks))
+
+    assert [(item["category"], item["text"]) for item in items] == [("essential", "Build trusted relationships with partners")]
+
+
+def test_items_are_yielded_before_the_input_is_exhausted():
+    def chunks():
+        yield "Essential criteria:\n- Lead a small team\n"
+        raise AssertionError("extractor read past the first finished item")
+
+    assert next(iter_extract(chunks()))["text"] == "Lead a small team"
+
+
+def test_stream_endpoint_emits_ndjson_items_then_summary():
+    response = client.post("/vacancy-intelligence/stream", headers=HEADERS, content=VACANCY.encode())
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["item"] for event in events[:-1]] == deterministic_extract(VACANCY)
+    assert events[-1]["type"] == "done"
+    assert events[-1]["summary"]["items"] == len(events) - 1
+    assert client.post("/vacancy-intelligence/stream", content=VACANCY.encode()).status_code == 401
+
+
+def test_stream_endpoint_rejects_oversized_uploads():
+    response = client.post("/vacancy-intelligence/stream", headers=HEADERS, content=("x" * 30001).encode())
+
+    assert json.loads(response.text.splitlines()[-1])["type"] == "error"
@@ -0,0 +1,17 @@
+create table if not exists public.vacancy_extractions (
+  id uuid primary key default gen_random_uuid(),
+  text_hash text not null,
+  extractor_version text not null,
+  provider text not null,
+  items jsonb not null default '[]'::jsonb,
+  created_at timestamptz not null default now(),
+  unique (text_hash, extractor_version)
+);
+
+create index if not exists vacancy_extractions_created_at_idx on public.vacancy_extractions (created_at desc);
+
+alter table public.vacancy_extractions enable row level security;
+
+-- Shared across users and only reached through the API, so no per-user policies.
+create policy "Service role can manage vacancy extractions" on public.vacancy_extractions
+  for all using (auth.role() = 'service_role') with check (auth.role() = 'service_role');
@@ -0,0 +1,3 @@
+-- Grouped deterministic requirements extracted from the description at ingest:
+-- {"version", "eligibility": [...], "requirements": [...], "practical": [...]}
+alter table public.jobs add column if not exists requirements jsonb;
@@ -0,0 +1,3 @@
+-- Normalised advert lines an extraction was built from, so an edited advert can
+-- be re-extracted from the first changed section only.
+alter table public.vacancy_extractions add column if not exists source_lines jsonb not null default '[]'::jsonb;
@@ -0,0 +1,20 @@
+-- Generated drafts and the inputs they were built from, so a redraft after a
+-- small edit can keep the paragraphs the edit did not touch.
+create table if not exists public.application_drafts (
+  id uuid primary key default gen_random_uuid(),
+  user_id uuid not null references auth.users(id) on delete cascade,
+  provider text not null,
+  snapshot jsonb not null,
+  paragraphs jsonb not null default '[]'::jsonb,
+  created_at timestamptz not null default now()
+);
+
+create index if not exists application_drafts_user_id_idx on public.application_drafts (user_id);
+
+alter table public.application_drafts enable row level security;
+
+create policy "Users can read own application drafts" on public.application_drafts
+  for select using (auth.uid() = user_id);
+
+create policy "Service role can manage application drafts" on public.application_drafts
+  for all using (auth.role() = 'service_role') with check (auth.role() = 'service_role');
@@ -0,0 +1,2 @@
+-- Drafts requested at several word limits are stored together with the longest one.
+alter table public.application_drafts add column if not exists variants jsonb not null default '[]'::jsonb;
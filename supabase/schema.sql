@@ -12,6 +12,7 @@ create table if not exists public.jobs (
   source text,
   url text,
   description text,
+  requirements jsonb,
   created_at timestamptz not null default now()
 );
 